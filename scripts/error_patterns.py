@@ -1,11 +1,15 @@
+import hashlib
 import re
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from errors import ErrorType, ErrorDiagnosis
 
+# 'keywords': lowercase literals; any text the pattern matches contains at least one
+# of them. Used by ErrorClassifier to skip regexes that cannot match.
 ERROR_PATTERNS = [
     # Permission errors
     {
         'pattern': r'(permission denied|EACCES|not permitted)',
+        'keywords': ['permission denied', 'eacces', 'not permitted'],
         'type': ErrorType.PERMISSION_DENIED,
         'extract_file': r'permission denied[:\s]+["\']?([^"\'\n]+)["\']?',
         'reason_template': "Permission denied accessing {file}",
@@ -19,6 +23,7 @@ ERROR_PATTERNS = [
     # File not found
     {
         'pattern': r'(no such file|cannot find|ENOENT|FileNotFoundError)',
+        'keywords': ['no such file', 'cannot find', 'enoent', 'filenotfounderror'],
         'type': ErrorType.FILE_NOT_FOUND,
         'extract_file': r"['\"]([^'\"]+)['\"]",
         'reason_template': "File not found: {file}",
@@ -32,6 +37,7 @@ ERROR_PATTERNS = [
     # Module import errors
     {
         'pattern': r'(ModuleNotFoundError|ImportError|No module named)',
+        'keywords': ['modulenotfounderror', 'importerror', 'no module named'],
         'type': ErrorType.IMPORT_ERROR,
         'extract_file': r"No module named ['\"]([^'\"]+)['\"]",
         'reason_template': "Missing Python module: {file}",
@@ -45,6 +51,7 @@ ERROR_PATTERNS = [
     # Test failures
     {
         'pattern': r'(\d+) failed.*tests?',
+        'keywords': ['failed'],
         'type': ErrorType.TEST_FAILED,
         'extract_file': r'(test_\w+\.py)',
         'reason_template': "Tests failing in {file}",
@@ -58,6 +65,7 @@ ERROR_PATTERNS = [
     # MCP tool unavailable (background mode)
     {
         'pattern': r'(MCP.*not available|tool not found.*background)',
+        'keywords': ['mcp', 'tool not found'],
         'type': ErrorType.MCP_TOOL_UNAVAILABLE,
         'extract_file': None,
         'reason_template': "MCP tools unavailable in background mode",
@@ -71,6 +79,7 @@ ERROR_PATTERNS = [
     # Timeout
     {
         'pattern': r'(timeout|timed out|TimeoutError)',
+        'keywords': ['timeout', 'timed out'],
         'type': ErrorType.TIMEOUT,
         'extract_file': None,
         'reason_template': "Task exceeded time limit",
@@ -80,44 +89,196 @@ ERROR_PATTERNS = [
             "Retry with --foreground (no timeout)",
         ]
     },
+
+    # Syntax errors
+    {
+        'pattern': r'(SyntaxError|IndentationError|TabError|unexpected token|parse error|invalid syntax)',
+        'keywords': ['syntaxerror', 'indentationerror', 'taberror', 'unexpected token', 'parse error', 'invalid syntax'],
+        'type': ErrorType.SYNTAX_ERROR,
+        'extract_file': r'File ["\']([^"\']+)["\'], line \d+',
+        'reason_template': "Syntax error in {file}",
+        'fixes': [
+            "Open {file} at the reported line and fix the syntax",
+            "Run a linter/compiler check before retrying (python -m py_compile {file})",
+            "Check for merge markers or partially written edits",
+        ]
+    },
+
+    # Type errors (runtime or static checkers)
+    {
+        'pattern': r'(TypeError|incompatible types?|is not assignable to|error TS\d+|mypy.*error)',
+        'keywords': ['typeerror', 'incompatible type', 'is not assignable to', 'error ts', 'mypy'],
+        'type': ErrorType.TYPE_ERROR,
+        'extract_file': r'([\w./-]+\.(?:py|pyi|ts|tsx|js)):\d+',
+        'reason_template': "Type error in {file}",
+        'fixes': [
+            "Review the types at the reported location in {file}",
+            "Run the type checker locally (mypy / tsc --noEmit)",
+            "Check callers for changed signatures from dependency tasks",
+        ]
+    },
+
+    # Network errors
+    {
+        'pattern': r'(ConnectionError|connection (?:refused|reset|aborted)|ECONNREFUSED|ECONNRESET|ENOTFOUND|EAI_AGAIN|getaddrinfo|network is unreachable|name or service not known|SSLError|HTTP Error [45]\d\d|rate limit)',
+        'keywords': ['connectionerror', 'connection refused', 'connection reset', 'connection aborted', 'econnrefused',
+                     'econnreset', 'enotfound', 'eai_again', 'getaddrinfo', 'network is unreachable',
+                     'name or service not known', 'sslerror', 'http error', 'rate limit'],
+        'type': ErrorType.NETWORK_ERROR,
+        'extract_file': r'(https?://[^\s"\'<>]+)',
+        'reason_template': "Network request failed ({file})",
+        'fixes': [
+            "Retry later — network failures are often transient",
+            "Check connectivity / proxy settings for {file}",
+            "Mock the remote service in tests instead of calling it",
+        ]
+    },
+
+    # Missing tools / packages (non-Python-import)
+    {
+        'pattern': r'(command not found|executable file not found|could not find a version that satisfies|is not installed|missing dependenc|npm ERR! missing|cannot find package)',
+        'keywords': ['command not found', 'executable file not found', 'could not find a version that satisfies',
+                     'is not installed', 'missing dependenc', 'npm err! missing', 'cannot find package'],
+        'type': ErrorType.DEPENDENCY_MISSING,
+        'extract_file': r'(?:([\w.@/-]+): command not found|requirement ([\w.\[\]-]+)|package ["\']?([\w.@/-]+))',
+        'reason_template': "Missing dependency: {file}",
+        'fixes': [
+            "Install the missing tool/package: {file}",
+            "Add it to the project's dependency manifest",
+            "Mark task as foreground if installation needs approval",
+        ]
+    },
+]
+
+
+class _CompiledPattern:
+    """Pre-compiled form of one ERROR_PATTERNS entry."""
+    __slots__ = ('definition', 'error_type', 'regex', 'extract_file', 'retry_suffix')
+
+    def __init__(self, definition: dict):
+        self.definition = definition
+        self.error_type = definition['type']
+        self.regex = re.compile(definition['pattern'], re.IGNORECASE)
+        self.extract_file = (
+            re.compile(definition['extract_file'], re.IGNORECASE)
+            if definition['extract_file'] else None
+        )
+        self.retry_suffix = (
+            " --foreground"
+            if definition['type'] in [ErrorType.MCP_TOOL_UNAVAILABLE, ErrorType.PERMISSION_DENIED]
+            else ""
+        )
+
+
+class ErrorClassifier:
+    """
+    All ERROR_PATTERNS compiled once, with a literal-keyword prefilter.
+
+    Each pattern lists `keywords`: lowercase literals, at least one of which occurs
+    in any text the pattern can match. The text is lowercased once; a pattern's
+    regex only runs when one of its keywords is present, and patterns are tried in
+    ERROR_PATTERNS order, so the result is identical to searching every pattern in
+    turn. Patterns without keywords are always tried.
+    """
+
+    def __init__(self, patterns: List[dict]):
+        self.patterns = [_CompiledPattern(p) for p in patterns]
+        self.keywords = [tuple(p.get('keywords') or ()) for p in patterns]
+
+    def classify(self, error_text: str) -> Tuple[int, Optional[str], str]:
+        """Return (ERROR_PATTERNS index or -1, extracted file, signature line).
+
+        The signature is the line the pattern matched on (the whole text for
+        unknown errors); it is what fingerprint_error() normalizes.
+        """
+        # re.IGNORECASE also equates U+017F (long s) with 's'; lower() does not
+        lowered = error_text.lower().replace('\u017f', 's')
+        for index, compiled in enumerate(self.patterns):
+            keywords = self.keywords[index]
+            if keywords and not any(k in lowered for k in keywords):
+                continue
+            match = compiled.regex.search(error_text)
+            if match:
+                line_start = error_text.rfind('\n', 0, match.start()) + 1
+                line_end = error_text.find('\n', match.end())
+                signature = error_text[line_start:line_end if line_end >= 0 else None]
+                return index, self._extract_file(compiled, error_text), signature
+        return -1, None, error_text
+
+    @staticmethod
+    def _extract_file(compiled: _CompiledPattern, error_text: str) -> Optional[str]:
+        if not compiled.extract_file:
+            return None
+        file_match = compiled.extract_file.search(error_text)
+        if not file_match:
+            return None
+        # Patterns with alternatives capture the file in whichever group matched
+        return next((g for g in file_match.groups() if g), None)
+
+
+CLASSIFIER = ErrorClassifier(ERROR_PATTERNS)
+
+
+# Volatile parts of an error line, replaced before hashing (order matters:
+# timestamps before bare numbers, paths reduced to their basename).
+_FINGERPRINT_RULES = [
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'), '<ts>'),
+    (re.compile(r'\b\d{2}:\d{2}:\d{2}(?:[.,]\d+)?\b'), '<ts>'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.IGNORECASE), '<hex>'),
+    (re.compile(r'(?:[A-Za-z]:)?(?:[\w.~-]*[/\\])+([\w.-]+)'), r'\1'),
+    (re.compile(r'\b\d+\b'), '<n>'),
+    (re.compile(r'\s+'), ' '),
 ]
 
+
+def normalize_error_text(text: str) -> str:
+    """Strip per-run detail (paths, line numbers, addresses, timestamps) from error text."""
+    for rule, replacement in _FINGERPRINT_RULES:
+        text = rule.sub(replacement, text)
+    return text.strip().lower()
+
+
+def fingerprint_error(error_type: ErrorType, signature: str) -> str:
+    """Short stable key for a failure's root cause: same type + same normalized line."""
+    key = f"{error_type.value}\0{normalize_error_text(signature)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:10]
+
+
 def diagnose_error(error_text: str, task_id: str) -> Optional[ErrorDiagnosis]:
     """Match error text against patterns and return diagnosis"""
-    for pattern_def in ERROR_PATTERNS:
-        match = re.search(pattern_def['pattern'], error_text, re.IGNORECASE)
-        if match:
-            # Extract file if pattern exists
-            file = None
-            if pattern_def['extract_file']:
-                file_match = re.search(pattern_def['extract_file'], error_text, re.IGNORECASE)
-                if file_match:
-                    file = file_match.group(1)
-
-            # Format reason
-            reason = pattern_def['reason_template'].format(
-                file=file or "(unknown)"
-            )
-
-            # Format fixes
-            fixes = [
-                fix.format(file=file or "(unknown)")
-                for fix in pattern_def['fixes']
-            ]
-
-            # Generate retry command
-            retry_cmd = f"/swarm-iosm retry {task_id}"
-            if pattern_def['type'] in [ErrorType.MCP_TOOL_UNAVAILABLE, ErrorType.PERMISSION_DENIED]:
-                retry_cmd += " --foreground"
-
-            return ErrorDiagnosis(
-                error_type=pattern_def['type'],
-                file=file,
-                reason=reason,
-                suggested_fixes=fixes,
-                retry_command=retry_cmd,
-                severity='high' if 'critical' in error_text.lower() else 'medium'
-            )
+    return _build_diagnosis(error_text, task_id, *CLASSIFIER.classify(error_text))
+
+
+def _build_diagnosis(error_text: str, task_id: str, index: int, file: Optional[str],
+                     signature: str) -> ErrorDiagnosis:
+    if index >= 0:
+        compiled = CLASSIFIER.patterns[index]
+        pattern_def = compiled.definition
+
+        # Format reason
+        reason = pattern_def['reason_template'].format(
+            file=file or "(unknown)"
+        )
+
+        # Format fixes
+        fixes = [
+            fix.format(file=file or "(unknown)")
+            for fix in pattern_def['fixes']
+        ]
+
+        # Generate retry command
+        retry_cmd = f"/swarm-iosm retry {task_id}{compiled.retry_suffix}"
+
+        return ErrorDiagnosis(
+            error_type=compiled.error_type,
+            file=file,
+            reason=reason,
+            suggested_fixes=fixes,
+            retry_command=retry_cmd,
+            severity='high' if 'critical' in error_text.lower() else 'medium',
+            fingerprint=fingerprint_error(compiled.error_type, signature),
+        )
 
     # Unknown error
     return ErrorDiagnosis(
@@ -130,5 +291,21 @@ def diagnose_error(error_text: str, task_id: str) -> Optional[ErrorDiagnosis]:
             "Retry with --foreground for interactive debugging",
         ],
         retry_command=f"/swarm-iosm retry {task_id} --foreground",
-        severity='medium'
+        severity='medium',
+        fingerprint=fingerprint_error(ErrorType.UNKNOWN, signature),
     )
+
+
+def diagnose_many(errors: Iterable[Tuple[str, str]]) -> List[ErrorDiagnosis]:
+    """Diagnose many (error_text, task_id) pairs.
+
+    The same failure tends to repeat across tasks and retries, so each distinct
+    error text is classified once per call.
+    """
+    seen: Dict[str, Tuple[int, Optional[str], str]] = {}
+    diagnoses = []
+    for error_text, task_id in errors:
+        if error_text not in seen:
+            seen[error_text] = CLASSIFIER.classify(error_text)
+        diagnoses.append(_build_diagnosis(error_text, task_id, *seen[error_text]))
+    return diagnoses
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 from enum import Enum
 
@@ -25,6 +25,7 @@ class ErrorDiagnosis:
     suggested_fixes: List[str]
     retry_command: str
     severity: str = "medium"  # low, medium, high, critical
+    fingerprint: str = ""  # root-cause key shared by equivalent failures across tasks
 
     def to_markdown(self, task_id: str) -> str:
         """Render as markdown report"""
@@ -61,3 +62,17 @@ class ErrorDiagnosis:
         ])
 
         return '\n'.join(lines)
+
+@dataclass
+class ErrorCluster:
+    """Diagnoses from one or more tasks that share a root-cause fingerprint"""
+    fingerprint: str
+    diagnosis: ErrorDiagnosis  # representative (first seen)
+    tasks: List[str] = field(default_factory=list)
+    occurrences: int = 0
+
+    @property
+    def retry_command(self) -> str:
+        if len(self.tasks) == 1:
+            return self.diagnosis.retry_command
+        return f"/swarm-iosm retry --cluster {self.fingerprint}"
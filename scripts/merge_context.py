@@ -3,18 +3,267 @@
 Shared Context Manager (v2.0 Feature #5).
 
 Merges updates from subagent reports into shared_context.md.
+
+v2.2: merged entries live in a sidecar index (shared_context.json) keyed by
+kind and name, with source task and content hash. A ledger of processed
+report digests means only new or changed reports are parsed, and the merged
+parts of shared_context.md are re-rendered atomically from the index.
+
+Each entry is also indexed by the paths it relates to (paths it mentions plus
+the reporting task's touches), so a brief can carry only the slice relevant to
+its task (--slice) instead of the whole, ever-growing file.
 """
 
+import hashlib
+import json
 import re
 import sys
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from .orchestration_planner import OrchestrationPlanner, Task, checkpoint_lock, write_if_changed
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from orchestration_planner import OrchestrationPlanner, Task, checkpoint_lock, write_if_changed
+
+INDEX_FILE = 'shared_context.json'
+INDEX_VERSION = 1
+
+# Context slices for briefs
+SLICE_TOKEN_BUDGET = 1500
+CHARS_PER_TOKEN = 4  # rough estimate for English/markdown
+
+# kind -> (heading keyword in shared_context.md, heading used when the section is missing)
+SECTIONS = {
+    'pattern': ('Discovered Patterns', '## Discovered Patterns'),
+    'decision': ('Shared Decisions', '## Shared Decisions (Agreements)'),
+    'question': ('Open Questions', '## Open Questions (Collaborative)'),
+}
+
+_UPDATES_RE = re.compile(r'^## Shared Context Updates.*?\n(.*?)(?=^## |\Z)', re.MULTILINE | re.DOTALL)
+# "- [Name]: text" and "- **[Name]:** text"
+_ENTRY_RE = re.compile(r'^\s*[-*]\s+(?:\*\*)?\[(.+?)\](?::(?:\*\*)?|\*\*:)\s*(.+)$')
+_QUESTION_RE = re.compile(r'^\s*[-*]\s+(?:\*\*)?Q:(?:\*\*)?\s*(.+)$')
+# `backend/core/cache.py`, core/metrics.py, api/ ...
+_PATH_RE = re.compile(r'(?<![\w/.-])((?:[\w.-]+/)+[\w.-]*|[\w-]+\.(?:py|js|ts|tsx|go|rs|java|rb|sql|yaml|yml|json|toml|md))(?![\w/-])')
+# Entries appended by the pre-index merge_context.py
+_LEGACY_RE = re.compile(r'\n\n### (.+)\n- \*\*Description:\*\* (.*)\n- \*\*Discovered by:\*\* (T[\w-]+)(?=\n|\Z)')
+
+
+def entry_key(kind: str, name: str) -> str:
+    """Index key: kind plus case/whitespace-insensitive name."""
+    return f"{kind}:{' '.join(name.casefold().split())}"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()[:12]
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def mentioned_paths(text: str) -> Set[str]:
+    """File and directory paths mentioned in an entry's text."""
+    return {path for path in _PATH_RE.findall(text) if not path.startswith(('http', 'www.'))}
+
+
+def path_relatedness(a: str, b: str) -> int:
+    """3 = same file, 2 = same directory / one inside the other, 1 = same module name, 0 = unrelated."""
+    a, b = a.strip('/'), b.strip('/')
+    if a == b or a.endswith('/' + b) or b.endswith('/' + a):
+        return 3
+    pa, pb = PurePosixPath(a), PurePosixPath(b)
+    if b.startswith(a + '/') or a.startswith(b + '/') or (pa.parent == pb.parent and str(pa.parent) != '.'):
+        return 2
+    return 1 if pa.stem == pb.stem else 0
+
+
+def _is_placeholder(text: str) -> bool:
+    return text.startswith('[') and text.endswith(']')
+
+
+def parse_context_updates(content: str) -> List[Tuple[str, str, str]]:
+    """(kind, name, description) entries from a report's Shared Context Updates section."""
+    match = _UPDATES_RE.search(content)
+    if not match:
+        return []
+
+    entries = []
+    kind = 'pattern'
+    for line in match.group(1).splitlines():
+        if line.startswith('###'):
+            heading = line.lower()
+            kind = ('decision' if 'decision' in heading else
+                    'question' if 'question' in heading else 'pattern')
+            continue
+        question = _QUESTION_RE.match(line)
+        if question:
+            text = question.group(1).strip()
+            if not _is_placeholder(text):
+                entries.append(('question', text, text))
+            continue
+        entry = _ENTRY_RE.match(line)
+        if entry:
+            name, desc = entry.group(1).strip(), entry.group(2).strip()
+            if name and desc and not _is_placeholder(desc):
+                entries.append((kind, name, desc))
+    return entries
+
+
+class ContextIndex:
+    """Sidecar index of merged context entries plus the processed-report ledger."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, any]] = {}
+        self.ledger: Dict[str, Dict[str, any]] = {}
+        self.loaded = False
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.entries = data.get('entries', {})
+            self.ledger = data.get('ledger', {})
+            self.loaded = True
+
+    def save(self) -> bool:
+        data = {'version': INDEX_VERSION, 'entries': self.entries, 'ledger': self.ledger}
+        return write_if_changed(self.path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+
+    def report_changed(self, task_id: str, report: Path) -> Optional[str]:
+        """Digest of the report if it is new or changed since it was processed, else None."""
+        st = report.stat()
+        seen = self.ledger.get(task_id)
+        if seen and seen['mtime_ns'] == st.st_mtime_ns and seen['size'] == st.st_size:
+            return None
+        digest = hashlib.sha256(report.read_bytes()).hexdigest()
+        if seen and seen['digest'] == digest:
+            seen.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            return None
+        return digest
+
+    def record_report(self, task_id: str, report: Path, digest: str):
+        st = report.stat()
+        self.ledger[task_id] = {'digest': digest, 'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+    def forget_source(self, task_id: str):
+        """Drop a task's contributions before its changed report is re-merged."""
+        for key in list(self.entries):
+            entry = self.entries[key]
+            entry['also'] = [tid for tid in entry.get('also', []) if tid != task_id]
+            entry['variants'] = [v for v in entry.get('variants', []) if v['source'] != task_id]
+            if entry['source'] != task_id:
+                continue
+            if entry['also']:
+                entry['source'] = entry['also'].pop(0)
+            elif entry['variants']:
+                variant = entry['variants'].pop(0)
+                entry.update(source=variant['source'], description=variant['description'],
+                             hash=variant['hash'])
+            else:
+                del self.entries[key]
+
+    def add(self, kind: str, name: str, description: str, source: str,
+            scope: Iterable[str] = ()) -> str:
+        """
+        Merge one entry. Returns 'new', 'duplicate' (same content) or 'variant'.
+
+        `scope` (paths the entry relates to) accumulates across reporters.
+        """
+        key = entry_key(kind, name)
+        digest = content_hash(description)
+        entry = self.entries.get(key)
+        scope = set(scope) | mentioned_paths(description)
+        if entry is None:
+            self.entries[key] = {'kind': kind, 'name': name, 'description': description,
+                                 'source': source, 'hash': digest, 'also': [], 'variants': [],
+                                 'scope': sorted(scope)}
+            return 'new'
+        entry['scope'] = sorted(set(entry.get('scope', [])) | scope)
+        if entry['hash'] == digest or any(v['hash'] == digest for v in entry['variants']):
+            if source != entry['source'] and source not in entry['also']:
+                entry['also'].append(source)
+            return 'duplicate'
+        entry['variants'].append({'source': source, 'description': description, 'hash': digest})
+        return 'variant'
 
-def merge_context_updates(track_path: Path):
-    """Scan reports and update shared_context.md."""
+
+def render_entry(entry: Dict[str, any], level: int = 3) -> List[str]:
+    by = entry['source'] + (f" (also: {', '.join(entry['also'])})" if entry['also'] else '')
+    heading = '#' * level
+    if entry['kind'] == 'question':
+        lines = [f"{heading} Q: {entry['name']}", f"- **Asked by:** {by}"]
+    elif entry['kind'] == 'decision':
+        lines = [f"{heading} {entry['name']}", f"- **Decision:** {entry['description']}", f"- **Made by:** {by}"]
+    else:
+        lines = [f"{heading} {entry['name']}", f"- **Description:** {entry['description']}",
+                 f"- **Discovered by:** {by}"]
+    for variant in entry['variants']:
+        lines.append(f"- **Variant ({variant['source']}):** {variant['description']}")
+    return lines
+
+
+def render_context(context: str, index: ContextIndex) -> str:
+    """Replace each section's merged block with entries rendered from the index."""
+    for kind, (keyword, title) in SECTIONS.items():
+        begin, end = f"<!-- merge_context:{kind} -->", f"<!-- /merge_context:{kind} -->"
+        body = []
+        for entry in index.entries.values():
+            if entry['kind'] == kind:
+                body.extend(render_entry(entry) + [''])
+        block = '\n'.join([begin, ''] + body + [end])
+
+        existing = re.search(re.escape(begin) + r'.*?' + re.escape(end), context, re.DOTALL)
+        if existing:
+            context = context[:existing.start()] + block + context[existing.end():]
+            continue
+        heading = re.search(rf'^## .*{re.escape(keyword)}.*$', context, re.MULTILINE)
+        if not heading:
+            context = context.rstrip('\n') + f"\n\n---\n\n{title}\n\n{block}\n"
+            continue
+        # Insert at the end of the section: before its closing '---' or the next heading
+        section_end = re.compile(r'^(---|## )', re.MULTILINE).search(context, heading.end())
+        at = section_end.start() if section_end else len(context)
+        context = context[:at].rstrip('\n') + f"\n\n{block}\n\n" + context[at:]
+    return context
+
+
+def _migrate_legacy(context: str, index: ContextIndex, tasks: Dict[str, Task]) -> str:
+    """Move entries appended by the old substring-checked merge into the index."""
+    for name, desc, task_id in _LEGACY_RE.findall(context):
+        index.add('pattern', name.strip(), desc.strip(), task_id, _touches(tasks, task_id))
+    return _LEGACY_RE.sub('', context)
+
+
+def load_tasks(track_path: Path) -> Dict[str, Task]:
+    """Tasks of the track's plan (including auto-spawned ones), or {} without a plan."""
+    plan_path = track_path / 'plan.md'
+    if not plan_path.exists():
+        return {}
+    planner = OrchestrationPlanner(str(plan_path))
+    planner.parse_plan()
+    planner.build_dependency_graph()
+    planner.load_latest_checkpoint()  # adopts spawned tasks
+    return planner.tasks
+
+
+def _touches(tasks: Dict[str, Task], task_id: str) -> List[str]:
+    return tasks[task_id].touches if task_id in tasks else []
+
+
+def merge_context_updates(track_path: Path, rebuild: bool = False):
+    """Merge new or changed reports into the index and re-render shared_context.md."""
     reports_dir = track_path / 'reports'
     context_path = track_path / 'shared_context.md'
-    
+
     if not reports_dir.exists():
         print("No reports directory found.")
         return
@@ -28,44 +277,127 @@ def merge_context_updates(track_path: Path):
             print("Template not found, skipping context creation.")
             return
 
-    current_context = context_path.read_text(encoding='utf-8')
-    
-    # Track what we've already merged to avoid duplicates (naive check)
-    # Ideally we'd use a more structured format, but appending is safe for now
-    
-    updates_found = False
-    
-    for report in reports_dir.glob('T*.md'):
-        content = report.read_text(encoding='utf-8')
-        task_id = report.stem
-        
-        # Extract Shared Context Updates section
-        match = re.search(r'## Shared Context Updates.*?\n(.*?)(?=\n## |\Z)', content, re.DOTALL)
-        if not match:
-            continue
-            
-        updates = match.group(1).strip()
-        if not updates or "None" in updates or "No updates" in updates:
-            continue
-            
-        # Parse patterns
-        patterns = re.findall(r'- \[(.*?)\]: (.*)', updates)
-        for name, desc in patterns:
-            if name not in current_context:
-                current_context += f"\n\n### {name}\n- **Description:** {desc}\n- **Discovered by:** {task_id}"
-                updates_found = True
-                print(f"в• Merged pattern '{name}' from {task_id}")
-
-    if updates_found:
-        current_context = re.sub(r'\*\*Last Updated:\*\* .*', f'**Last Updated:** {datetime.now().strftime("%Y-%m-%d %H:%M")}', current_context)
-        context_path.write_text(current_context, encoding='utf-8')
+    index = ContextIndex(track_path / INDEX_FILE)
+    with checkpoint_lock(index.path):
+        context = context_path.read_text(encoding='utf-8')
+        if not rebuild:
+            index.load()
+        tasks = load_tasks(track_path)
+        if not index.loaded:
+            context = _migrate_legacy(context, index, tasks)
+
+        for report in sorted(reports_dir.glob('T*.md')):
+            task_id = report.stem
+            digest = index.report_changed(task_id, report)
+            if digest is None:
+                continue
+            if task_id in index.ledger:
+                index.forget_source(task_id)
+            for kind, name, desc in parse_context_updates(report.read_text(encoding='utf-8')):
+                outcome = index.add(kind, name, desc, task_id, _touches(tasks, task_id))
+                if outcome == 'new':
+                    print(f"в• Merged {kind} '{name}' from {task_id}")
+                elif outcome == 'variant':
+                    print(f"⚠️  {task_id} reports a different '{name}' ({kind}); kept as a variant")
+            index.record_report(task_id, report, digest)
+
+        context = render_context(context, index)
+        context = re.sub(r'\*\*Last Updated:\*\* .*',
+                         f'**Last Updated:** {datetime.now().strftime("%Y-%m-%d %H:%M")}', context)
+        written = write_if_changed(context_path, context)
+        index.save()
+
+    if written:
         print(f"вњ… Updated shared_context.md")
     else:
         print("No new context updates found.")
 
+
+def full_context_tokens(track_path: Path, index: ContextIndex) -> int:
+    """Tokens a brief would carry with the whole shared_context.md."""
+    context_path = track_path / 'shared_context.md'
+    if context_path.exists():
+        return estimate_tokens(context_path.read_text(encoding='utf-8'))
+    return sum(estimate_tokens('\n'.join(render_entry(e))) for e in index.entries.values())
+
+
+def slice_shared_context(
+    track_path: Path,
+    task_id: str,
+    budget_tokens: int = SLICE_TOKEN_BUDGET,
+    tasks: Optional[Dict[str, Task]] = None,
+    index: Optional[ContextIndex] = None,
+    full_tokens: Optional[int] = None,
+    heading_level: int = 2,
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Shared-context entries relevant to one task, within a token budget.
+
+    Relevance: how closely an entry's scope matches the task's touches (same
+    file > same directory > same module name), +2 if it was reported by one of
+    the task's dependencies, +1 for decisions. Entries are taken best-first
+    while they fit the budget. `tasks`, `index` and `full_tokens` can be passed
+    in when slicing for many tasks at once.
+
+    Returns: (markdown slice, {'entries', 'relevant', 'total', 'tokens', 'full_tokens', 'saved_tokens'})
+    """
+    if tasks is None:
+        tasks = load_tasks(track_path)
+    if index is None:
+        index = ContextIndex(track_path / INDEX_FILE)
+        index.load()
+    task = tasks.get(task_id)
+    paths = set(task.touches) if task else set()
+    deps = set(task.depends_on) if task else set()
+
+    scored = []
+    for entry in index.entries.values():
+        scope = entry.get('scope') or sorted(mentioned_paths(entry['description']) |
+                                             set(_touches(tasks, entry['source'])))
+        score = max((path_relatedness(a, b) for a in scope for b in paths), default=0)
+        if entry['source'] in deps or deps.intersection(entry['also']):
+            score += 2
+        if score and entry['kind'] == 'decision':
+            score += 1
+        if score:
+            scored.append((score, entry))
+    scored.sort(key=lambda item: -item[0])
+
+    blocks, used = [], 0
+    for _, entry in scored:
+        block = '\n'.join(render_entry(entry, heading_level + 1)) + '\n'
+        cost = estimate_tokens(block)
+        if used + cost <= budget_tokens:
+            blocks.append(block)
+            used += cost
+
+    full = full_tokens if full_tokens is not None else full_context_tokens(track_path, index)
+    stats = {'entries': len(blocks), 'relevant': len(scored), 'total': len(index.entries),
+             'tokens': used, 'full_tokens': full, 'saved_tokens': max(0, full - used)}
+
+    lines = [f"{'#' * heading_level} Shared Context (relevant to {task_id})", ""]
+    lines.extend(blocks or ["_No shared-context entries relate to this task's files or dependencies._\n"])
+    lines.append(f"_{stats['entries']} of {stats['total']} entries, ~{used} tokens "
+                 f"(~{stats['saved_tokens']} saved vs. the full `shared_context.md`)._")
+    return '\n'.join(lines) + '\n', stats
+
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
-        print("Usage: python merge_context.py <track_dir>")
+        print("Usage: python merge_context.py <track_dir> [--rebuild]")
+        print("       python merge_context.py <track_dir> --slice T## [--budget TOKENS]")
+        print("  --rebuild : Ignore the index and ledger; re-merge every report")
+        print("  --slice   : Print the shared-context slice for a task's brief")
+        print(f"  --budget  : Token budget for the slice (default {SLICE_TOKEN_BUDGET})")
         sys.exit(1)
-    
-    merge_context_updates(Path(sys.argv[1]))
+
+    track_dir = Path(sys.argv[1])
+    if '--slice' in sys.argv:
+        slice_task = sys.argv[sys.argv.index('--slice') + 1]
+        budget = int(sys.argv[sys.argv.index('--budget') + 1]) if '--budget' in sys.argv else SLICE_TOKEN_BUDGET
+        text, stats = slice_shared_context(track_dir, slice_task, budget)
+        print(text)
+        print(f"📉 {stats['entries']}/{stats['relevant']} relevant entries in ~{stats['tokens']} tokens; "
+              f"saved ~{stats['saved_tokens']} of ~{stats['full_tokens']} tokens", file=sys.stderr)
+    else:
+        merge_context_updates(track_dir, rebuild='--rebuild' in sys.argv[2:])
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Multi-Track Scheduler for Swarm-IOSM (v2.2)
+
+Runs several tracks against one shared resource pool (the model quota):
+- Global background/foreground/total slot limits and a token-per-hour budget
+- Weighted fair share: free slots go to the track using the least of its share
+- Per-track limits (constraints, adaptive concurrency, locks) still apply
+- Combined simulation and a combined state view (multi_track_state.md)
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .orchestration_planner import (
+        OrchestrationPlanner, ResourceConstraints, Task,
+        effort_to_minutes, estimate_task_cost, estimate_task_tokens,
+        get_task_mode, select_batch, select_model, simulate_track,
+    )
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from orchestration_planner import (
+        OrchestrationPlanner, ResourceConstraints, Task,
+        effort_to_minutes, estimate_task_cost, estimate_task_tokens,
+        get_task_mode, select_batch, select_model, simulate_track,
+    )
+
+
+STATE_FILE = 'multi_track_state.md'
+SIMULATION_FILE = 'multi_track_simulation.md'
+
+
+def task_token_rate(task: Task) -> float:
+    """Expected tokens per hour while the task runs."""
+    return estimate_task_tokens(task) * 60 / max(1, effort_to_minutes(task.effort))
+
+
+def fair_share_select(
+    candidates: Dict[str, List[Task]],
+    running: Dict[str, Dict[str, str]],
+    weights: Dict[str, float],
+    pool: ResourceConstraints,
+    tokens_in_use: float = 0.0
+) -> List[Tuple[str, Task]]:
+    """Pick tasks from several tracks for the shared pool.
+
+    Args:
+        candidates: track -> tasks the track could launch, highest priority first
+            (already within the track's own limits, e.g. from select_batch)
+        running: track -> {task_id: mode} currently running
+        weights: track -> fair-share weight (default 1.0)
+        pool: global slot limits and token_budget_per_hour
+        tokens_in_use: token rate (per hour) of everything already running
+
+    Returns:
+        List of (track, task). Each free slot goes to the track with the lowest
+        running/weight ratio, so under contention tracks converge on their
+        weighted share; idle share is used by whoever has work.
+    """
+    modes = [mode for tasks in running.values() for mode in tasks.values()]
+    bg_used = sum(1 for mode in modes if mode == 'background')
+    fg_used = sum(1 for mode in modes if mode == 'foreground')
+    total_used = len(modes)
+
+    usage = {name: len(running.get(name, {})) for name in candidates}
+    queues = {name: list(tasks) for name, tasks in candidates.items() if tasks}
+    selected = []
+
+    while queues and total_used < pool.max_total_parallel:
+        name = min(queues, key=lambda n: ((usage[n] + 1) / weights.get(n, 1.0), n))
+        task = queues[name].pop(0)
+        if not queues[name]:
+            del queues[name]
+
+        mode = get_task_mode(task)
+        if mode == 'background' and bg_used >= pool.max_parallel_background:
+            continue
+        if mode == 'foreground' and fg_used >= pool.max_parallel_foreground:
+            continue
+        rate = task_token_rate(task)
+        # A task bigger than the whole budget may still run alone
+        if tokens_in_use and tokens_in_use + rate > pool.token_budget_per_hour:
+            continue
+
+        selected.append((name, task))
+        usage[name] += 1
+        total_used += 1
+        tokens_in_use += rate
+        if mode == 'background':
+            bg_used += 1
+        else:
+            fg_used += 1
+
+    return selected
+
+
+def peak_parallel(intervals: List[Tuple[int, int]]) -> int:
+    """Maximum number of overlapping [start, end) intervals."""
+    points = sorted([(start, 1) for start, end in intervals if end > start] +
+                    [(end, -1) for start, end in intervals if end > start])
+    peak = current = 0
+    for _, delta in points:
+        current += delta
+        peak = max(peak, current)
+    return peak
+
+
+def simulate_tracks(
+    tracks: Dict[str, Dict[str, Task]],
+    pool: ResourceConstraints,
+    weights: Optional[Dict[str, float]] = None,
+    track_constraints: Optional[ResourceConstraints] = None,
+    max_iterations: int = 1000
+) -> Dict[str, any]:
+    """
+    Simulate several tracks sharing one pool with virtual time.
+
+    Each track is limited by track_constraints (default: ResourceConstraints())
+    and all of them together by `pool`, with fair_share_select between tracks.
+
+    Returns: Dict with overall makespan, peak parallelism and per-track stats
+    (makespan, ready-queue wait, slot-minutes used).
+    """
+    weights = weights or {}
+    track_constraints = track_constraints or ResourceConstraints()
+    completed: Dict[str, set] = {name: set() for name in tracks}
+    # track -> task_id -> (start_time, end_time, mode)
+    running: Dict[str, Dict[str, Tuple[int, int, str]]] = {name: {} for name in tracks}
+    ready_since: Dict[str, Dict[str, int]] = {name: {} for name in tracks}
+    waits: Dict[str, Dict[str, int]] = {name: {tid: 0 for tid in tasks} for name, tasks in tracks.items()}
+    finished_at: Dict[str, int] = {name: 0 for name in tracks}
+    intervals: List[Tuple[int, int]] = []
+    slot_minutes: Dict[str, int] = {name: 0 for name in tracks}
+    current_time = 0
+    iteration = 0
+
+    def modes(name: str) -> Dict[str, str]:
+        return {tid: mode for tid, (_, _, mode) in running[name].items()}
+
+    while (any(len(completed[n]) < len(t) for n, t in tracks.items())
+           and iteration < max_iterations):
+        iteration += 1
+
+        # 1. Complete tasks that finished by now
+        for name in tracks:
+            for tid in [tid for tid, (_, end, _) in running[name].items() if end <= current_time]:
+                completed[name].add(tid)
+                finished_at[name] = max(finished_at[name], running[name][tid][1])
+                del running[name][tid]
+
+        # 2. Per-track candidates within each track's own limits
+        candidates: Dict[str, List[Task]] = {}
+        any_ready = False
+        for name, tasks in tracks.items():
+            ready = [
+                t for tid, t in tasks.items()
+                if tid not in completed[name] and tid not in running[name] and
+                all(d in completed[name] or d not in tasks for d in t.depends_on)
+            ]
+            any_ready = any_ready or bool(ready)
+            for t in ready:
+                ready_since[name].setdefault(t.id, current_time)
+            waited = {t.id: current_time - ready_since[name][t.id] for t in ready}
+            candidates[name] = select_batch(ready, track_constraints, modes(name), iteration, waited)
+
+        # 3. Share the pool between tracks
+        tokens_in_use = sum(task_token_rate(tracks[name][tid])
+                            for name in tracks for tid in running[name])
+        batch = fair_share_select(candidates, {name: modes(name) for name in tracks},
+                                  weights, pool, tokens_in_use)
+
+        # 4. Start selected tasks
+        for name, t in batch:
+            duration = effort_to_minutes(t.effort)
+            running[name][t.id] = (current_time, current_time + duration, get_task_mode(t))
+            waits[name][t.id] += current_time - ready_since[name].pop(t.id, current_time)
+            intervals.append((current_time, current_time + duration))
+            slot_minutes[name] += duration
+
+        # 5. Advance time to the next completion
+        ends = [end for name in tracks for (_, end, _) in running[name].values()]
+        if ends:
+            current_time = min(ends)
+        elif any_ready and not batch:
+            current_time += 30
+        else:
+            break
+
+    total_slot_minutes = sum(slot_minutes.values()) or 1
+    return {
+        'total_time': current_time,
+        'peak_parallel': peak_parallel(intervals),
+        'tracks': {
+            name: {
+                'makespan': finished_at[name],
+                'completed': len(completed[name]),
+                'total': len(tracks[name]),
+                'max_wait': max(waits[name].values(), default=0),
+                'avg_wait': round(sum(waits[name].values()) / len(waits[name]), 1) if waits[name] else 0.0,
+                'slot_share': round(slot_minutes[name] / total_slot_minutes, 3),
+            }
+            for name in tracks
+        },
+    }
+
+
+def simulate_independent(
+    tracks: Dict[str, Dict[str, Task]],
+    track_constraints: Optional[ResourceConstraints] = None
+) -> Dict[str, any]:
+    """Today's behaviour: every track schedules alone, all starting at once."""
+    track_constraints = track_constraints or ResourceConstraints()
+    intervals = []
+    makespans = {}
+    for name, tasks in tracks.items():
+        result = simulate_track(tasks, track_constraints)
+        makespans[name] = result['total_time']
+        intervals.extend((s['start'], s['end']) for s in result['task_stats'].values())
+    return {
+        'total_time': max(makespans.values(), default=0),
+        'peak_parallel': peak_parallel(intervals),
+        'makespans': makespans,
+    }
+
+
+class MultiTrackScheduler:
+    """Loads several tracks and dispatches them from one shared pool."""
+
+    def __init__(self, plan_paths: List[str], weights: Optional[Dict[str, float]] = None,
+                 pool: Optional[ResourceConstraints] = None):
+        self.pool = pool or ResourceConstraints()
+        self.planners: Dict[str, OrchestrationPlanner] = {}
+        self.weights: Dict[str, float] = {}
+        weights = weights or {}
+        for plan_path in plan_paths:
+            base = name = Path(plan_path).resolve().parent.name
+            suffix = 2
+            while name in self.planners:
+                name = f"{base}-{suffix}"
+                suffix += 1
+            self.planners[name] = OrchestrationPlanner(plan_path)
+            # Weights may be keyed by the plan path as given or by track name
+            self.weights[name] = float(weights.get(plan_path, weights.get(name, 1.0)))
+
+    def load(self):
+        for planner in self.planners.values():
+            planner.parse_plan()
+            planner.build_dependency_graph()
+            planner.find_critical_path()
+
+    def _checkpoints(self):
+        return {name: planner._load_or_init_checkpoint() for name, planner in self.planners.items()}
+
+    def next_batch(self, now: float = None) -> List[Dict[str, any]]:
+        """Tasks to launch now across all tracks, within global and per-track limits."""
+        checkpoints = self._checkpoints()
+        candidates = {}
+        tokens_in_use = 0.0
+        for name, planner in self.planners.items():
+            cp = checkpoints[name]
+            ready = planner.prioritized_ready(cp, now)
+            tasks = [planner.tasks[tid] for tid, _ in ready]
+            waited = dict(ready)
+            candidates[name] = select_batch(tasks, planner.effective_constraints(cp),
+                                            cp.running_tasks, cp.iteration, waited)
+            tokens_in_use += sum(task_token_rate(planner.tasks[tid])
+                                 for tid in cp.running_tasks if tid in planner.tasks)
+
+        running = {name: cp.running_tasks for name, cp in checkpoints.items()}
+        batch = fair_share_select(candidates, running, self.weights, self.pool, tokens_in_use)
+        return [{'track': name, 'task': task.id, 'title': task.title,
+                 'mode': get_task_mode(task), 'model': select_model(task),
+                 'plan': str(self.planners[name].plan_path)}
+                for name, task in batch]
+
+    def render_state(self) -> str:
+        """Combined state view: pool usage, one row per track, next global batch."""
+        checkpoints = self._checkpoints()
+        running_total = sum(len(cp.running_tasks) for cp in checkpoints.values())
+        bg = sum(1 for cp in checkpoints.values() for m in cp.running_tasks.values() if m == 'background')
+        fg = running_total - bg
+        tokens = sum(task_token_rate(self.planners[name].tasks[tid])
+                     for name, cp in checkpoints.items()
+                     for tid in cp.running_tasks if tid in self.planners[name].tasks)
+
+        ready_counts = {name: len(planner.ready_from_checkpoint(checkpoints[name]))
+                        for name, planner in self.planners.items()}
+        active = [name for name in self.planners
+                  if checkpoints[name].running_tasks or ready_counts[name]]
+        active_weight = sum(self.weights[name] for name in active) or 1.0
+
+        lines = [
+            "# Multi-Track State",
+            "",
+            f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            f"**Pool:** background {bg}/{self.pool.max_parallel_background}, "
+            f"foreground {fg}/{self.pool.max_parallel_foreground}, "
+            f"total {running_total}/{self.pool.max_total_parallel}, "
+            f"tokens ~{tokens / 1000:.0f}k/{self.pool.token_budget_per_hour / 1000:.0f}k per hour",
+            "",
+            "| Track | Weight | Progress | Running (BG/FG) | Ready | Retries | Share (actual/target) | Spent |",
+            "|-------|--------|----------|-----------------|-------|---------|-----------------------|-------|",
+        ]
+        for name, planner in self.planners.items():
+            cp = checkpoints[name]
+            done = len(set(cp.completed_tasks) & set(planner.tasks))
+            total = len(planner.tasks)
+            track_bg = sum(1 for m in cp.running_tasks.values() if m == 'background')
+            track_fg = len(cp.running_tasks) - track_bg
+            actual = len(cp.running_tasks) / running_total if running_total else 0.0
+            target = self.weights[name] / active_weight if name in active else 0.0
+            spent = sum(estimate_task_cost(planner.tasks[tid])
+                        for tid in cp.completed_tasks if tid in planner.tasks)
+            lines.append(
+                f"| {name} | {self.weights[name]:g} | {done}/{total} | {track_bg}/{track_fg} "
+                f"| {ready_counts[name]} | {len(cp.retry_queue)} | {actual:.0%}/{target:.0%} "
+                f"| ${spent:.2f}/${planner.constraints.cost_limit_per_track:.2f} |"
+            )
+
+        lines.extend(["", "## Next Global Batch", ""])
+        batch = self.next_batch()
+        for item in batch:
+            lines.append(f"- {item['track']}/{item['task']}: {item['title']} ({item['mode']}, {item['model']})")
+        if not batch:
+            lines.append("*(Pool full or nothing ready)*")
+        lines.extend(["", "**Note:** This file is auto-generated. Do not edit manually."])
+        return "\n".join(lines)
+
+    def state_path(self) -> Path:
+        """multi_track_state.md in the directory containing all tracks."""
+        common = os.path.commonpath([str(p.plan_path.resolve().parent.parent)
+                                     for p in self.planners.values()])
+        return Path(common) / STATE_FILE
+
+    def write_state(self, path: Path = None) -> Path:
+        path = Path(path) if path else self.state_path()
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render_state(), encoding='utf-8')
+        os.replace(tmp_path, path)
+        return path
+
+    def generate_simulation_report(self) -> str:
+        tracks = {name: planner.tasks for name, planner in self.planners.items()}
+        track_constraints = ResourceConstraints()
+        shared = simulate_tracks(tracks, self.pool, self.weights, track_constraints)
+        alone = simulate_independent(tracks, track_constraints)
+        total_weight = sum(self.weights.values()) or 1.0
+
+        def fmt(minutes):
+            return f"{int(minutes) // 60}h {int(minutes) % 60:02d}m"
+
+        lines = [
+            "# Multi-Track Simulation Report",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            "",
+            "## Pool",
+            f"- Max BG: {self.pool.max_parallel_background}",
+            f"- Max FG: {self.pool.max_parallel_foreground}",
+            f"- Max Total: {self.pool.max_total_parallel}",
+            f"- Token budget: {self.pool.token_budget_per_hour:,}/hour",
+            "",
+            "## Shared Pool vs Independent Tracks",
+            "",
+            "| Scheduling | Makespan | Peak parallel tasks |",
+            "|------------|----------|---------------------|",
+            f"| Independent (per-track limits only) | {fmt(alone['total_time'])} | {alone['peak_parallel']} |",
+            f"| Shared pool, fair share | {fmt(shared['total_time'])} | {shared['peak_parallel']} |",
+            "",
+        ]
+        if alone['peak_parallel'] > self.pool.max_total_parallel:
+            lines.append(f"Independent scheduling oversubscribes the pool "
+                         f"({alone['peak_parallel']} > {self.pool.max_total_parallel} slots).")
+            lines.append("")
+
+        lines.extend([
+            "## Per Track",
+            "",
+            "| Track | Weight | Makespan (alone) | Makespan (shared) | Max wait | Avg wait | Slot share (target) |",
+            "|-------|--------|------------------|-------------------|----------|----------|---------------------|",
+        ])
+        for name, stats in shared['tracks'].items():
+            lines.append(
+                f"| {name} | {self.weights[name]:g} | {fmt(alone['makespans'][name])} "
+                f"| {fmt(stats['makespan'])} | {stats['max_wait']}m | {stats['avg_wait']}m "
+                f"| {stats['slot_share']:.0%} ({self.weights[name] / total_weight:.0%}) |"
+            )
+        return "\n".join(lines)
+
+
+def parse_track_args(args: List[str]) -> Tuple[List[str], Dict[str, float]]:
+    """'path/plan.md' or 'path/plan.md:2' (weight) -> plan paths and weights."""
+    plans, weights = [], {}
+    for arg in args:
+        path, sep, weight = arg.rpartition(':')
+        if sep and path:
+            try:
+                weights[path] = float(weight)
+                plans.append(path)
+                continue
+            except ValueError:
+                pass
+        plans.append(arg)
+    return plans, weights
+
+
+if __name__ == '__main__':
+    flags_with_values = {'--out', '--max-bg', '--max-fg', '--max-total', '--tokens-per-hour'}
+    track_args = []
+    skip = False
+    for arg in sys.argv[1:]:
+        if skip:
+            skip = False
+            continue
+        if arg in flags_with_values:
+            skip = True
+        elif not arg.startswith('--'):
+            track_args.append(arg)
+
+    if not track_args:
+        print("Usage: python multi_track.py <plan.md[:weight]> ... [--next [--json]|--simulate] "
+              "[--max-bg N] [--max-fg N] [--max-total N] [--tokens-per-hour N] [--out FILE]")
+        sys.exit(1)
+
+    def flag_value(flag, default):
+        return type(default)(sys.argv[sys.argv.index(flag) + 1]) if flag in sys.argv else default
+
+    defaults = ResourceConstraints()
+    pool = ResourceConstraints(
+        max_parallel_background=flag_value('--max-bg', defaults.max_parallel_background),
+        max_parallel_foreground=flag_value('--max-fg', defaults.max_parallel_foreground),
+        max_total_parallel=flag_value('--max-total', defaults.max_total_parallel),
+        token_budget_per_hour=flag_value('--tokens-per-hour', defaults.token_budget_per_hour),
+    )
+    plans, weights = parse_track_args(track_args)
+    for plan in plans:
+        if not Path(plan).exists():
+            print(f"❌ Plan not found: {plan}")
+            sys.exit(1)
+
+    scheduler = MultiTrackScheduler(plans, weights, pool)
+    scheduler.load()
+
+    if '--next' in sys.argv:
+        batch = scheduler.next_batch()
+        if '--json' in sys.argv:
+            print(json.dumps(batch, indent=2))
+        else:
+            for item in batch:
+                print(f"- {item['track']}/{item['task']}: {item['title']} ({item['mode']}, {item['model']})")
+            if not batch:
+                print("Nothing to launch (pool full or nothing ready).")
+
+    elif '--simulate' in sys.argv:
+        report = scheduler.generate_simulation_report()
+        out = Path(flag_value('--out', str(scheduler.state_path().with_name(SIMULATION_FILE))))
+        out.write_text(report, encoding='utf-8')
+        print(f"✅ Generated multi-track simulation report: {out}")
+
+    else:
+        out = scheduler.write_state(flag_value('--out', '') or None)
+        print(f"✅ Updated combined state: {out}")
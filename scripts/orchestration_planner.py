@@ -11,14 +11,29 @@ Analyzes plan.md and generates orchestration_plan.md with:
 - Time estimates (serial vs parallel)
 """
 
+import bisect
+import contextlib
+import copy
+import functools
 import json
+import math
+import os
+import random
 import re
 import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import asdict, dataclass, field, fields, replace
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks; run one writer per track
+    fcntl = None
+
 
 # Resource Constraints (v1.2)
 
@@ -32,6 +47,20 @@ class ResourceConstraints:
     cost_limit_per_track: float = 10.00  # $10 USD
 
 
+@contextlib.contextmanager
+def checkpoint_lock(path: Path):
+    """Exclusive advisory lock (fcntl) guarding writes to a checkpoint file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + '.lock'), 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 @dataclass
 class Checkpoint:
     """Snapshot of orchestration state (v1.3)"""
@@ -43,16 +72,60 @@ class Checkpoint:
     spawn_budget_remaining: int
     seen_dedup_keys: List[str]
     retry_counts: Dict[str, int]
+    # v2.2: bumped on every write to latest.json (validates in-memory copies)
+    version: int = 0
+    # v2.2: delayed retries, sorted by 'due' (epoch seconds); see schedule_retry()
+    retry_queue: List[Dict[str, any]] = field(default_factory=list)
+    # v2.2: tid -> epoch seconds the task entered RUNNING (completion latency)
+    started_at: Dict[str, float] = field(default_factory=dict)
+    # v2.2: ConcurrencyController state (limit, outcome window, decision log)
+    concurrency: Dict[str, any] = field(default_factory=dict)
+    # v2.2: tid -> lease expiry (epoch seconds) for running tasks; renewed by heartbeats
+    leases: Dict[str, float] = field(default_factory=dict)
+    # v2.2: tid -> epoch seconds a speculative duplicate was launched
+    speculative: Dict[str, float] = field(default_factory=dict)
+    # v2.2: tid -> epoch seconds the task entered the ready queue (priority aging)
+    ready_since: Dict[str, float] = field(default_factory=dict)
+    # v2.2: tid -> epoch seconds the task last yielded its slot (never preempted twice)
+    preempted: Dict[str, float] = field(default_factory=dict)
+    # v2.2: auto-spawn state: per-gate budget use, ingested reports, deferred
+    # candidates and the spawned tasks themselves (tid -> Task fields)
+    spawn: Dict[str, any] = field(default_factory=dict)
+    # v2.2: tid -> input manifest (task/file/upstream hashes + cache key), recorded on
+    # completion; cacheable read-only tasks keep the one recorded when they started
+    task_inputs: Dict[str, Dict[str, any]] = field(default_factory=dict)
+    # v2.2: tid -> reason, for completed tasks invalidated by the last --rebuild
+    rebuild: Dict[str, str] = field(default_factory=dict)
+    # v2.2: worktree isolation: per-task worktrees (tid -> path, base), tasks sent
+    # back to serial execution by a merge conflict, merge/conflict counters
+    isolation: Dict[str, any] = field(default_factory=dict)
+    # v2.2: tid -> error type, for failed tasks that used up their retries; never
+    # ready again until a manual `--retry <TID> --reset` (or a DONE update)
+    blocked: Dict[str, str] = field(default_factory=dict)
     
     def save(self, path: Path):
-        with open(path, 'w', encoding='utf-8') as f:
+        """Write atomically (temp file + rename), so readers never see partial JSON."""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(self.__dict__, f, indent=2)
+        os.replace(tmp_path, path)
             
     @classmethod
     def load(cls, path: Path) -> 'Checkpoint':
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            return cls(**data)
+        # Ignore unknown keys, let older checkpoints fall back to field defaults
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @staticmethod
+    def read_version(path: Path) -> int:
+        """Version stamp currently on disk (0 if the file does not exist)."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return int(json.load(f).get('version', 0))
+        except FileNotFoundError:
+            return 0
 
 
 @dataclass
@@ -78,6 +151,11 @@ class Task:
     is_on_critical_path: bool = False
 
 
+def task_sort_key(task_id: str) -> tuple:
+    """Natural order of task IDs: T2 < T10, and spawned IDs (T-AUTO-01) sort without errors."""
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r'(\d+)', task_id))
+
+
 # Model Selection & Cost Tracking (v1.2)
 
 COST_TABLE = {
@@ -134,6 +212,13 @@ def select_model(task: Task) -> str:
     # Default for interactive tasks → sonnet
     return 'sonnet'
 
+def estimate_task_tokens(task: Task) -> int:
+    """Total tokens a task is expected to use, from its effort."""
+    effort_key = task.effort.upper()[0] if task.effort else 'M'
+    if 'XL' in task.effort.upper():
+        effort_key = 'XL'
+    return EFFORT_TO_TOKENS.get(effort_key, 20000)
+
 def estimate_task_cost(task: Task, model: str = None) -> float:
     """
     Estimate cost for a task in USD.
@@ -146,12 +231,7 @@ def estimate_task_cost(task: Task, model: str = None) -> float:
     if model is None:
         model = select_model(task)
 
-    # Get token estimate
-    effort_key = task.effort.upper()[0] if task.effort else 'M'
-    if 'XL' in task.effort.upper():
-        effort_key = 'XL'
-
-    total_tokens = EFFORT_TO_TOKENS.get(effort_key, 20000)
+    total_tokens = estimate_task_tokens(task)
     input_tokens = int(total_tokens * 0.7)
     output_tokens = int(total_tokens * 0.3)
 
@@ -183,12 +263,196 @@ def estimate_track_cost(tasks: Dict[str, Task]) -> Dict[str, any]:
     }
 
 
+# Status Transitions (v2.1)
+
+DONE_STATUSES = ['DONE', 'COMPLETE', 'SUCCESS']
+RUNNING_STATUSES = ['RUNNING', 'IN_PROGRESS']
+FAILED_STATUSES = ['FAILED', 'BLOCKED']
+ALL_STATUSES = DONE_STATUSES + RUNNING_STATUSES + FAILED_STATUSES
+
+
+# Retry Scheduling (v2.2)
+
+@dataclass
+class RetryPolicy:
+    """How failures of one ErrorType are retried (v2.2)"""
+    max_attempts: int = 3
+    base_delay: float = 0.0   # seconds before the first retry (0 = immediately)
+    backoff: float = 2.0      # delay multiplier for each further attempt
+    max_delay: float = 900.0
+    jitter: float = 0.2       # +/- fraction of the delay, spreads out retry bursts
+    foreground: bool = False  # rerun in foreground
+    upgrade_model: bool = False  # rerun on the next model tier
+
+    def delay_for(self, attempt: int) -> float:
+        """Delay in seconds before retry number `attempt` (1-based)."""
+        if self.base_delay <= 0:
+            return 0.0
+        delay = min(self.max_delay, self.base_delay * self.backoff ** (attempt - 1))
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return round(delay, 1)
+
+
+# Keyed by ErrorType value (errors.py). Transient failures back off instead of
+# retrying straight into the same wall; failures that need a human go foreground;
+# code failures move up a model tier from the second retry on.
+RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    'timeout': RetryPolicy(max_attempts=3, base_delay=60),
+    'network_error': RetryPolicy(max_attempts=5, base_delay=30, max_delay=600),
+    'permission_denied': RetryPolicy(max_attempts=3, foreground=True),
+    'mcp_tool_unavailable': RetryPolicy(max_attempts=1, foreground=True),
+    'test_failed': RetryPolicy(max_attempts=3, foreground=True, upgrade_model=True),
+    'syntax_error': RetryPolicy(max_attempts=3, upgrade_model=True),
+    'type_error': RetryPolicy(max_attempts=3, upgrade_model=True),
+    'import_error': RetryPolicy(max_attempts=3),
+    'dependency_missing': RetryPolicy(max_attempts=2),
+    'file_not_found': RetryPolicy(max_attempts=3, foreground=True),
+    'unknown': RetryPolicy(max_attempts=3, foreground=True),
+}
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+MODEL_UPGRADES = {'haiku': 'sonnet', 'sonnet': 'opus', 'opus': 'opus'}
+
+
+def get_retry_policy(error_type: Optional[str]) -> RetryPolicy:
+    # Undiagnosed failures are 'unknown' (and are queued under that name)
+    return RETRY_POLICIES.get(error_type or 'unknown', DEFAULT_RETRY_POLICY)
+
+
+# Running-Task Leases (v2.2)
+
+# A running task must show signs of life (heartbeat call or report file
+# modification) within its lease, otherwise it is presumed dead.
+LEASE_TTL_SECONDS = {'background': 900, 'foreground': 3600}
+REAP_INTERVAL_SECONDS = 30
+
+
+def lease_ttl(mode: str) -> float:
+    return LEASE_TTL_SECONDS.get(mode, LEASE_TTL_SECONDS['background'])
+
+
+# Adaptive Concurrency (v2.2)
+
+class ConcurrencyController:
+    """
+    AIMD limit for parallel background tasks (v2.2).
+
+    Congestion signals are TIMEOUT / NETWORK_ERROR failures and completions
+    much slower than usual (latency relative to the effort estimate, compared
+    with a running baseline). While the congestion rate over the recent
+    window is high, the limit is halved at most once per cooldown, so a burst
+    of tasks timing out together counts as one event. Otherwise every
+    completion adds 1/limit, i.e. roughly +1 per round of completions.
+    The limit always stays within [floor, ceiling].
+
+    State is a plain dict stored in Checkpoint.concurrency.
+    """
+    CONGESTION_TYPES = ('timeout', 'network_error')
+    WINDOW_SIZE = 20
+    WINDOW_SECONDS = 1800
+    MAX_DECISIONS = 20
+
+    def __init__(self, ceiling: int, state: Dict[str, any] = None, floor: int = 1,
+                 decrease: float = 0.5, congestion_threshold: float = 0.2,
+                 latency_threshold: float = 2.0, cooldown: float = 120.0):
+        self.ceiling = max(floor, ceiling)
+        self.floor = floor
+        self.decrease = decrease
+        self.congestion_threshold = congestion_threshold
+        self.latency_threshold = latency_threshold
+        self.cooldown = cooldown
+        state = state or {}
+        self.value = min(float(state.get('limit', self.ceiling)), self.ceiling)
+        self.outcomes: List[List] = [list(o) for o in state.get('outcomes', [])]  # [at, kind]
+        self.baseline: Optional[float] = state.get('baseline')  # EWMA of latency ratios
+        self.samples = state.get('samples', 0)
+        self.last_decrease = state.get('last_decrease', 0.0)
+        self.decisions: List[Dict[str, any]] = list(state.get('decisions', []))
+
+    @property
+    def limit(self) -> int:
+        return max(self.floor, int(self.value))
+
+    def congestion_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(1 for _, kind in self.outcomes if kind == 'congestion') / len(self.outcomes)
+
+    def observe(self, task_id: str, now: float, failed: bool = False,
+                error_type: Optional[str] = None,
+                latency_ratio: Optional[float] = None) -> Optional[Dict[str, any]]:
+        """Record one task outcome; returns the decision if the integer limit changed."""
+        reason = None
+        if failed:
+            if error_type not in self.CONGESTION_TYPES:
+                return None  # not a capacity problem
+            kind = 'congestion'
+            reason = f"{task_id} {error_type}"
+        else:
+            kind = 'ok'
+            if latency_ratio is not None:
+                slow = (self.samples >= 5 and self.baseline
+                        and latency_ratio > self.latency_threshold * self.baseline)
+                if slow:
+                    kind = 'congestion'
+                    reason = f"{task_id} took {latency_ratio / self.baseline:.1f}x usual time"
+                else:
+                    self.baseline = latency_ratio if self.baseline is None else \
+                        0.8 * self.baseline + 0.2 * latency_ratio
+                    self.samples += 1
+
+        self.outcomes.append([round(now, 1), kind])
+        self.outcomes = [o for o in self.outcomes if now - o[0] <= self.WINDOW_SECONDS][-self.WINDOW_SIZE:]
+
+        before = self.limit
+        rate = self.congestion_rate()
+        if kind == 'congestion' and rate >= self.congestion_threshold:
+            if now - self.last_decrease >= self.cooldown:
+                self.value = max(float(self.floor), self.value * self.decrease)
+                self.last_decrease = now
+                reason = f"{reason}; congestion {rate:.0%} of last {len(self.outcomes)}"
+        elif kind == 'ok' and rate < self.congestion_threshold:
+            self.value = min(float(self.ceiling), self.value + 1.0 / self.value)
+            reason = "additive increase"
+
+        if self.limit == before:
+            return None
+        decision = {
+            'at': datetime.fromtimestamp(now).isoformat(timespec='seconds'),
+            'from': before,
+            'to': self.limit,
+            'reason': reason,
+        }
+        self.decisions = (self.decisions + [decision])[-self.MAX_DECISIONS:]
+        return decision
+
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'limit': round(self.value, 3),
+            'outcomes': self.outcomes,
+            'baseline': self.baseline,
+            'samples': self.samples,
+            'last_decrease': self.last_decrease,
+            'decisions': self.decisions,
+        }
+
+
 # Priority & Mode Selection (v1.2)
 
-def calculate_priority_score(task: Task) -> float:
+# Points per hour spent in the ready queue. The largest static gap between two
+# tasks is ~190 points, so no task waits more than ~6h behind newer arrivals.
+PRIORITY_AGING_PER_HOUR = 30.0
+
+
+def calculate_priority_score(task: Task, waited_minutes: float = 0.0,
+                             aging_per_hour: float = PRIORITY_AGING_PER_HOUR) -> float:
     """Calculate priority score for task selection (higher = more important)"""
     score = 0.0
 
+    # Aging: time already spent ready (prevents starvation under sustained load)
+    score += aging_per_hour * max(0.0, waited_minutes) / 60
+
     # Critical path tasks highest priority
     if task.is_on_critical_path:
         score += 100
@@ -229,7 +493,9 @@ def select_batch(
     ready_tasks: List[Task],
     constraints: ResourceConstraints,
     running_tasks: Dict[str, str],
-    current_iteration: int
+    current_iteration: int,
+    waited: Optional[Dict[str, float]] = None,
+    aging_per_hour: float = PRIORITY_AGING_PER_HOUR
 ) -> List[Task]:
     """Select which tasks to launch in current iteration.
 
@@ -238,6 +504,7 @@ def select_batch(
         constraints: Resource limits
         running_tasks: Dict of task_id -> mode ('background' or 'foreground')
         current_iteration: Current dispatch iteration number
+        waited: Minutes each task has spent ready (priority aging)
 
     Returns:
         List of tasks to launch (respecting constraints)
@@ -259,7 +526,7 @@ def select_batch(
         if task.id in running_tasks:
             continue
 
-        score = calculate_priority_score(task)
+        score = calculate_priority_score(task, (waited or {}).get(task.id, 0.0), aging_per_hour)
         mode = get_task_mode(task)
         scored_tasks.append((score, task, mode))
 
@@ -293,6 +560,116 @@ def select_batch(
     return selected
 
 
+# Cooperative preemption (v2.2): a ready critical-path task may ask a running
+# non-critical background task to stop at its next safe point and yield its slot.
+# The victim resumes later from its report, paying a fixed restart overhead.
+PREEMPT_OVERHEAD_MINUTES = 5
+
+
+def select_preemptions(
+    blocked: List[Task],
+    running: Dict[str, str],
+    tasks: Dict[str, Task],
+    remaining: Dict[str, float],
+    already_preempted: Set[str]
+) -> List[Tuple[str, str]]:
+    """Pair blocked critical-path background tasks with running tasks that should yield.
+
+    Args:
+        blocked: Ready tasks that select_batch could not place
+        running: task_id -> mode of running tasks
+        tasks: All tasks by id
+        remaining: Estimated minutes of work left per running task
+        already_preempted: Tasks that were preempted before (never preempted twice)
+
+    Returns:
+        List of (victim, beneficiary); victims with the most work left go first.
+    """
+    victims = sorted(
+        (tid for tid, mode in running.items()
+         if mode == 'background' and tid in tasks and not tasks[tid].is_on_critical_path
+         and tid not in already_preempted
+         and remaining.get(tid, 0) > PREEMPT_OVERHEAD_MINUTES),
+        key=lambda tid: -remaining.get(tid, 0)
+    )
+    beneficiaries = [t.id for t in blocked if t.is_on_critical_path and get_task_mode(t) == 'background']
+    return list(zip(victims, beneficiaries))
+
+
+# Small-task coalescing (v2.2): compatible small ready tasks are dispatched as one
+# unit: one brief, one subagent, one combined report that is split back into
+# reports/T##.md. The fixed per-dispatch overhead (brief rendering, context
+# warm-up, report parsing) is then paid once per unit instead of once per task.
+COALESCE_MAX_TASKS = 4
+DISPATCH_OVERHEAD_MINUTES = 5
+UNIT_SEPARATOR = '+'
+UNIT_REPORTS_DIR = 'units'  # reports/units/<unit>.md: outside the reports/T*.md namespace
+
+_UNIT_PART_RE = re.compile(r'^# Subagent Report: Task ([A-Za-z0-9_.-]+)', re.MULTILINE)
+_BLOCKED_RE = re.compile(r'^\*\*Status:\*\*.*Blocked', re.MULTILINE)
+
+
+def is_coalescible(task: Task) -> bool:
+    """Small unattended tasks off the critical path (running those back to back would lengthen it)."""
+    return (task.effort.upper().startswith('S') and not task.needs_user_input
+            and task.concurrency_class != 'write-shared' and not task.is_on_critical_path)
+
+
+def touches_adjacent(a: Task, b: Task) -> bool:
+    """Some touch of a and some touch of b are the same path, nested, or in the same directory."""
+    try:
+        from .merge_context import path_relatedness
+    except ImportError:
+        from merge_context import path_relatedness
+    return any(path_relatedness(x, y) >= 2 for x in a.touches for y in b.touches)
+
+
+def coalesce_tasks(tasks: List[Task], max_tasks: int = COALESCE_MAX_TASKS) -> List[List[Task]]:
+    """
+    Group tasks into dispatch units, keeping the input (priority) order.
+
+    A coalescible task joins the first unit with the same owner role, model,
+    mode and concurrency class that has room and holds a task with an
+    overlapping or adjacent touch. Everything else is a unit of one.
+    """
+    units: List[List[Task]] = []
+    open_units: Dict[tuple, List[List[Task]]] = {}
+    for task in tasks:
+        if max_tasks < 2 or not is_coalescible(task):
+            units.append([task])
+            continue
+        key = (task.owner_role.strip().lower(), select_model(task), get_task_mode(task), task.concurrency_class)
+        for unit in open_units.get(key, []):
+            if len(unit) < max_tasks and any(touches_adjacent(task, other) for other in unit):
+                unit.append(task)
+                break
+        else:
+            units.append([task])
+            open_units.setdefault(key, []).append(units[-1])
+    return units
+
+
+def unit_id(unit: List[Task]) -> str:
+    """Brief/report name of a dispatch unit: T03+T04+T07 (a single task keeps its own ID)."""
+    return UNIT_SEPARATOR.join(task.id for task in unit)
+
+
+def split_unit_report(content: str, task_ids: List[str]) -> Dict[str, str]:
+    """
+    Per-task reports from a unit's combined report.
+
+    Each task's part starts with its own "# Subagent Report: Task T##" heading
+    (templates/subagent_report.md) and runs to the next one. Tasks without a
+    part are absent from the result.
+    """
+    parts = [m for m in _UNIT_PART_RE.finditer(content) if m.group(1) in task_ids]
+    reports = {}
+    for i, match in enumerate(parts):
+        end = parts[i + 1].start() if i + 1 < len(parts) else len(content)
+        reports.setdefault(match.group(1), content[match.start():end].rstrip() + '\n')
+    return reports
+
+
 def simulate_batch_selection(
     all_tasks: List[Task],
     dependencies: Dict[str, List[str]],
@@ -377,97 +754,637 @@ def effort_to_minutes(effort: str) -> int:
         
     return 120  # default
 
+# Incremental Critical Path (v2.2)
+
+class DependencyCycleError(ValueError):
+    """The plan's dependencies form a cycle (`cycle` lists it, first task repeated)."""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Dependency cycle: {' -> '.join(cycle)}")
+
+
+class CriticalPathIndex:
+    """
+    Longest path through the task DAG, kept current under task/edge changes (v2.2).
+
+    Per task: `finish` = effort + max finish of its dependencies (earliest finish)
+    and `tail` = effort + max tail of its dependents (longest run to a sink).
+    A change re-evaluates finish downstream and tail upstream of the touched task,
+    stopping wherever a value does not change. Earliest/latest start and slack
+    derive from the two; the path length is the top key of a finish -> tasks map.
+    """
+
+    def __init__(self):
+        self.effort: Dict[str, int] = {}
+        self.deps: Dict[str, List[str]] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.finish: Dict[str, int] = {}
+        self.tail: Dict[str, int] = {}
+        self._order: Dict[str, int] = {}
+        self._by_finish: Dict[int, Set[str]] = {}
+        self.evaluations = 0  # tasks re-evaluated so far (cost of maintenance)
+
+    @classmethod
+    def build(cls, tasks: Dict[str, 'Task']) -> 'CriticalPathIndex':
+        index = cls()
+        for task in tasks.values():
+            index.add_task(task.id, effort_to_minutes(task.effort), task.depends_on)
+        return index
+
+    def add_task(self, task_id: str, effort: int, depends_on: Iterable[str] = ()):
+        """Insert a task; dependencies that are not (yet) known are ignored until added."""
+        if task_id in self.effort:
+            self.remove_task(task_id)
+        self._order.setdefault(task_id, len(self._order))
+        self.effort[task_id] = effort
+        self.deps[task_id] = list(depends_on)
+        for dep in self.deps[task_id]:
+            self.children.setdefault(dep, set()).add(task_id)
+        self._update_finish([task_id])
+        self._update_tail([task_id])
+
+    def remove_task(self, task_id: str):
+        if task_id not in self.effort:
+            return
+        del self.effort[task_id]
+        deps = self.deps.pop(task_id)
+        for dep in deps:
+            self.children.get(dep, set()).discard(task_id)
+        self._set_finish(task_id, None)
+        self.tail.pop(task_id, None)
+        self._update_finish(list(self.children.get(task_id, ())))
+        self._update_tail([dep for dep in deps if dep in self.effort])
+
+    def add_edge(self, dep: str, task_id: str):
+        """`task_id` now also depends on `dep`."""
+        if dep in self.deps[task_id]:
+            return
+        self.deps[task_id].append(dep)
+        self.children.setdefault(dep, set()).add(task_id)
+        self._update_finish([task_id])
+        self._update_tail([dep])
+
+    def remove_edge(self, dep: str, task_id: str):
+        if dep not in self.deps.get(task_id, ()):
+            return
+        self.deps[task_id].remove(dep)
+        self.children[dep].discard(task_id)
+        self._update_finish([task_id])
+        self._update_tail([dep])
+
+    def set_effort(self, task_id: str, effort: int):
+        if self.effort.get(task_id) == effort:
+            return
+        self.effort[task_id] = effort
+        self._update_finish([task_id])
+        self._update_tail([task_id])
+
+    def deps_of(self, task_id: str) -> List[str]:
+        """Dependencies of a task that are in the index."""
+        return [dep for dep in self.deps.get(task_id, ()) if dep in self.effort]
+
+    def _set_finish(self, task_id: str, value: Optional[int]):
+        old = self.finish.pop(task_id, None)
+        if old is not None:
+            bucket = self._by_finish[old]
+            bucket.discard(task_id)
+            if not bucket:
+                del self._by_finish[old]
+        if value is not None:
+            self.finish[task_id] = value
+            self._by_finish.setdefault(value, set()).add(task_id)
+
+    def _propagate(self, start: Iterable[str], values: Dict[str, int], inputs, outputs, store):
+        queue = deque(start)
+        budget = (len(self.effort) + 1) ** 2
+        while queue:
+            task_id = queue.popleft()
+            if task_id not in self.effort:
+                continue
+            self.evaluations += 1
+            budget -= 1
+            if budget < 0:
+                raise DependencyCycleError(self.find_cycle())
+            value = self.effort[task_id] + max(
+                (values[other] for other in inputs(task_id) if other in values), default=0)
+            if values.get(task_id) == value:
+                continue
+            store(task_id, value)
+            queue.extend(outputs(task_id))
+
+    def _update_finish(self, start: Iterable[str]):
+        self._propagate(start, self.finish, self.deps_of,
+                        lambda tid: self.children.get(tid, ()), self._set_finish)
+
+    def _update_tail(self, start: Iterable[str]):
+        self._propagate(start, self.tail, lambda tid: self.children.get(tid, ()),
+                        self.deps_of, self.tail.__setitem__)
+
+    def find_cycle(self) -> List[str]:
+        """One dependency cycle in execution order ([T01, T02, T01]: T02 needs T01, T01 needs T02), or []."""
+        done: Set[str] = set()
+        for root in sorted(self.effort, key=self._order.__getitem__):
+            if root in done:
+                continue
+            path, on_path = [root], {root: 0}
+            stack = [iter(self.deps_of(root))]
+            while stack:
+                for dep in stack[-1]:
+                    if dep in on_path:
+                        return (path[on_path[dep]:] + [dep])[::-1]
+                    if dep not in done:
+                        on_path[dep] = len(path)
+                        path.append(dep)
+                        stack.append(iter(self.deps_of(dep)))
+                        break
+                else:
+                    stack.pop()
+                    done.add(path[-1])
+                    del on_path[path.pop()]
+        return []
+
+    @property
+    def length(self) -> int:
+        """Critical path length in minutes."""
+        return max(self._by_finish, default=0)
+
+    def path(self) -> List[str]:
+        """One longest path; ties resolve to the first task in plan order and the first dependency."""
+        if not self._by_finish:
+            return []
+        task_id = min(self._by_finish[self.length], key=self._order.__getitem__)
+        path = [task_id]
+        while True:
+            deps = self.deps_of(task_id)
+            if not deps:
+                return path[::-1]
+            task_id = max(deps, key=self.finish.__getitem__)
+            path.append(task_id)
+
+    def schedule(self, task_id: str) -> Dict[str, int]:
+        """Earliest/latest start and slack (minutes) with unlimited parallelism."""
+        earliest = self.finish[task_id] - self.effort[task_id]
+        latest = self.length - self.tail[task_id]
+        return {'earliest_start': earliest, 'latest_start': latest, 'slack': latest - earliest}
+
+
+# Speculative Execution (v2.2)
+
+# A read-only critical-path task running longer than this multiple of its
+# expected duration (~p90 of DurationModel's default spread) gets a duplicate.
+SPECULATION_THRESHOLD = 1.5
+SPECULATIVE_REPORTS_DIR = 'speculative'
+
+
+class DurationModel:
+    """
+    Seeded task-duration variance for simulations (v2.2).
+
+    Each run of a task takes effort_to_minutes() times a lognormal factor, and
+    with `straggler_rate` probability is `straggler_factor` times slower still.
+    Draws are keyed by (seed, task, copy), so the original run of a task lasts
+    the same in every simulation with the same seed, with or without duplicates.
+    """
+
+    def __init__(self, seed: int = 0, sigma: float = 0.25,
+                 straggler_rate: float = 0.1, straggler_factor: float = 3.0):
+        self.seed = seed
+        self.sigma = sigma
+        self.straggler_rate = straggler_rate
+        self.straggler_factor = straggler_factor
+
+    def sample(self, task: Task, copy: int = 0) -> int:
+        rng = random.Random(f"{self.seed}:{task.id}:{copy}")
+        minutes = effort_to_minutes(task.effort) * rng.lognormvariate(0, self.sigma)
+        if rng.random() < self.straggler_rate:
+            minutes *= self.straggler_factor
+        return max(1, int(round(minutes)))
+
+
+# Worktree isolation (v2.2): checking out a task's worktree, 3-way merging each
+# file another task changed while it ran, and the chance that such a file does
+# not merge cleanly (the task then re-runs serially in the main tree).
+WORKTREE_SETUP_MINUTES = 1
+MERGE_MINUTES_PER_FILE = 2
+MERGE_CONFLICT_RATE = 0.15
+
+
+def is_speculation_eligible(task: Task) -> bool:
+    """Only read-only tasks can safely run twice; only critical-path ones are worth it."""
+    return task.concurrency_class == 'read-only' and task.is_on_critical_path
+
+
+@dataclass
+class SimulationOptions:
+    """
+    Scenario switches for simulate_track (v2.2); the defaults simulate plain dispatch.
+
+    durations: sample per-run durations (default: exactly effort_to_minutes)
+    speculate: launch a duplicate of a straggling read-only critical-path task
+        into an idle background slot; the first copy to finish wins
+    aging_per_hour: priority aging rate passed to select_batch (0 disables)
+    preempt: let blocked critical-path tasks take slots from non-critical
+        background tasks (cooperative; the victim resumes with its remaining work)
+    touch_locks: write tasks with a common touch never run at the same time
+        (the Lock Plan's "sequential only")
+    isolate: write-local tasks run in worktrees despite overlapping touches and
+        are merged when done (serialized; MERGE_MINUTES_PER_FILE per file another
+        task changed meanwhile). A file conflicts with MERGE_CONFLICT_RATE (seeded),
+        and the task then re-runs serially. Other writers keep touch locks.
+    coalesce: compatible small ready tasks (coalesce_tasks) run back to back as
+        one dispatch in one slot and complete together
+    dispatch_overhead: fixed minutes added to every dispatch (brief, warm-up,
+        report parsing); a coalesced unit pays it once
+    """
+    max_iterations: int = 100
+    durations: Optional[DurationModel] = None
+    speculate: bool = False
+    speculation_threshold: float = SPECULATION_THRESHOLD
+    aging_per_hour: float = PRIORITY_AGING_PER_HOUR
+    preempt: bool = False
+    touch_locks: bool = False
+    isolate: bool = False
+    seed: int = 42
+    coalesce: bool = False
+    dispatch_overhead: int = 0
+
+
+class _TrackSimulation:
+    """Virtual-time state of one simulate_track run; each optional scenario is one step of a tick."""
+
+    def __init__(self, tasks: Dict[str, Task], constraints: ResourceConstraints, options: SimulationOptions):
+        self.tasks = tasks
+        self.constraints = constraints
+        self.options = options
+        self.completed: Set[str] = set()
+        # task_id -> (start_time, end_time, mode)
+        self.running: Dict[str, Tuple[int, int, str]] = {}
+        self.duplicates: Dict[str, int] = {}  # task_id -> end_time of the speculative copy
+        self.speculated: List[Dict[str, any]] = []
+        self.open_speculation: Dict[str, Dict[str, any]] = {}
+        self.ready_since: Dict[str, int] = {}
+        self.waits: Dict[str, int] = {tid: 0 for tid in tasks}
+        self.resume_work: Dict[str, int] = {}  # preempted task -> minutes left (+ overhead)
+        self.preempted: Set[str] = set()
+        self.preemptions: List[Dict[str, any]] = []
+        self.in_worktree: Set[str] = set()  # running (or merging) in an isolated worktree
+        self.merging: Dict[str, bool] = {}  # task -> merge will conflict
+        self.serial: Set[str] = set()  # sent back to the main tree by a merge conflict
+        self.landed: Dict[str, int] = {}  # task -> time its changes reached the main tree
+        self.merges: List[Dict[str, any]] = []
+        self.merge_free = 0  # merges are applied one at a time
+        self.units: Dict[str, List[str]] = {}  # running unit lead -> member ids (lead first)
+        self.grouped: Dict[str, List[Task]] = {}  # this tick's candidate leads -> their unit
+        self.coalesced: List[Dict[str, any]] = []
+        self.rng = random.Random(options.seed)
+        self.current_time = 0
+        self.events: List[Dict[str, any]] = []
+        self.task_stats = {tid: {'start': 0, 'end': 0} for tid in tasks}
+
+    # --- Helpers -----------------------------------------------------------
+
+    def duration_of(self, task: Task, copy: int = 0) -> int:
+        durations = self.options.durations
+        return durations.sample(task, copy) if durations else effort_to_minutes(task.effort)
+
+    def finish_time(self, tid: str) -> int:
+        end = self.running[tid][1]
+        return min(end, self.duplicates[tid]) if tid in self.duplicates else end
+
+    def running_modes(self) -> Dict[str, str]:
+        # A merge is done by the planner, not in a worker slot
+        modes = {tid: mode for tid, (_, _, mode) in self.running.items() if tid not in self.merging}
+        modes.update({f"{tid}~dup": 'background' for tid in self.duplicates})
+        return modes
+
+    @staticmethod
+    def writes(task: Task) -> bool:
+        return task.concurrency_class != 'read-only'
+
+    def touches_of(self, tid: str) -> Set[str]:
+        members = self.units.get(tid) or [t.id for t in self.grouped.get(tid, [self.tasks[tid]])]
+        return {f for m in members for f in self.tasks[m].touches}
+
+    def isolated(self, task: Task) -> bool:
+        return (self.options.isolate and task.concurrency_class == 'write-local' and bool(task.touches)
+                and task.id not in self.serial)
+
+    # --- Steps -------------------------------------------------------------
+
+    def run(self) -> Dict[str, any]:
+        iteration = 0
+        while len(self.completed) < len(self.tasks) and iteration < self.options.max_iterations:
+            iteration += 1
+
+            # 1. Update completed tasks based on current time (first finishing copy wins)
+            for tid in [tid for tid in self.running if self.finish_time(tid) <= self.current_time]:
+                if not self._merge_or_retry(tid):
+                    self._complete(tid)
+
+            # 2. Find ready tasks (deps met, not running, not completed)
+            ready_ids, ready_tasks = self._ready()
+
+            # 3. Select batch using standard logic
+            batch = self._select(ready_ids, ready_tasks, iteration)
+
+            # 3b. Cooperative preemption: blocked critical-path tasks take non-critical slots
+            if self.options.preempt:
+                self._preempt(ready_tasks, batch)
+
+            # 4. Start selected tasks
+            for t in batch:
+                self._start(t)
+
+            # 4b. Speculative duplicates for stragglers, only into idle background slots
+            speculation_checks = self._speculate() if self.options.speculate else []
+
+            # 5. Advance time to next event
+            if self.running:
+                # Jump to the next completion (or the next straggler check)
+                self.current_time = min([self.finish_time(tid) for tid in self.running] + speculation_checks)
+            elif ready_ids and not batch:
+                # Blocked by constraints or conflicts
+                self.current_time += 30
+            else:
+                # Nothing ready or running: done (or a circular dependency)
+                break
+        return self._result()
+
+    def _merge_or_retry(self, tid: str) -> bool:
+        """
+        Worktree tasks merge before they land. True if the task is not done yet:
+        its merge was just scheduled, or the merge conflicted and the task goes
+        back to the ready queue to retry serially in the main tree.
+        """
+        running = self.running
+        if tid in self.in_worktree and tid not in self.merging:
+            # Work done: merge every file another task landed while this one ran
+            start = running[tid][0]
+            contended = [touch for touch in self.tasks[tid].touches
+                         if any(other != tid and at > start and touch in self.tasks[other].touches
+                                for other, at in self.landed.items())]
+            if contended:
+                merge_start = max(self.current_time, self.merge_free)
+                self.merge_free = merge_start + MERGE_MINUTES_PER_FILE * len(contended)
+                self.merging[tid] = any(self.rng.random() < MERGE_CONFLICT_RATE for _ in contended)
+                self.merges.append({'task': tid, 'time': merge_start, 'files': len(contended),
+                                    'minutes': self.merge_free - self.current_time,
+                                    'conflict': self.merging[tid]})
+                running[tid] = (start, self.merge_free, running[tid][2])
+                return True
+        self.in_worktree.discard(tid)
+        if self.merging.pop(tid, False):
+            # Conflict: nothing applied, the task re-runs in the main tree
+            self.serial.add(tid)
+            del running[tid]
+            self.ready_since[tid] = self.current_time
+            self.events.append({'time': self.current_time, 'type': 'conflict', 'task': tid, 'mode': 'background'})
+            return True
+        return False
+
+    def _complete(self, tid: str):
+        self.landed[tid] = self.current_time
+        self.completed.add(tid)
+        self.task_stats[tid]['end'] = self.finish_time(tid)
+        for member in self.units.pop(tid, [])[1:]:
+            self.completed.add(member)
+            self.task_stats[member]['end'] = self.task_stats[tid]['end']
+        if tid in self.duplicates:
+            # The losing copy is cancelled, freeing its slot
+            self.open_speculation.pop(tid).update(
+                winner='duplicate' if self.duplicates[tid] < self.running[tid][1] else 'original',
+                saved=max(0, self.running[tid][1] - self.duplicates[tid]),
+            )
+            del self.duplicates[tid]
+        del self.running[tid]
+
+    def _ready(self) -> Tuple[List[str], List[Task]]:
+        in_units = {m for members in self.units.values() for m in members}
+        ready_ids = [
+            tid for tid, t in self.tasks.items()
+            if tid not in self.completed and tid not in self.running and tid not in in_units and
+            all(d in self.completed or d not in self.tasks for d in t.depends_on)
+        ]
+        ready_tasks = [self.tasks[tid] for tid in ready_ids]
+        for tid in ready_ids:
+            self.ready_since.setdefault(tid, self.current_time)
+        if self.options.touch_locks or self.options.isolate:
+            writing = [tid for tid in self.running if self.writes(self.tasks[tid])]
+            held_all = {f for tid in writing for f in self.touches_of(tid)}
+            held_main = {f for tid in writing if tid not in self.in_worktree for f in self.touches_of(tid)}
+            ready_tasks = [t for t in ready_tasks
+                           if not self.writes(t) or not set(t.touches) & (held_main if self.isolated(t) else held_all)]
+        return ready_ids, ready_tasks
+
+    def _select(self, ready_ids: List[str], ready_tasks: List[Task], iteration: int) -> List[Task]:
+        waited = {tid: self.current_time - self.ready_since[tid] for tid in ready_ids}
+        candidates = self._coalesce(ready_tasks) if self.options.coalesce else ready_tasks
+        batch = select_batch(candidates, self.constraints, self.running_modes(), iteration, waited,
+                             self.options.aging_per_hour)
+        if self.options.touch_locks or self.options.isolate:
+            # Two writers picked in the same batch must not share a touch either
+            kept: List[Task] = []
+            for t in batch:
+                if self.writes(t) and any(
+                        self.writes(k) and not (self.isolated(t) and self.isolated(k))
+                        and self.touches_of(t.id) & self.touches_of(k.id)
+                        for k in kept):
+                    continue
+                kept.append(t)
+            batch = kept
+        return batch
+
+    def _coalesce(self, ready_tasks: List[Task]) -> List[Task]:
+        """Group ready tasks into units; a unit competes for one slot under its lead (its first, highest-ranked task)."""
+        self.grouped = {unit[0].id: unit for unit in coalesce_tasks(ready_tasks)}
+        return [unit[0] for unit in self.grouped.values()]
+
+    def _preempt(self, ready_tasks: List[Task], batch: List[Task]):
+        """Blocked critical-path tasks take the slots of non-critical background tasks (added to `batch`)."""
+        selected = {t.id for t in batch}
+        blocked = [t for t in ready_tasks if t.id not in selected]
+        remaining = {tid: end - self.current_time for tid, (_, end, _) in self.running.items()}
+        for victim, beneficiary in select_preemptions(
+                blocked, self.running_modes(), self.tasks, remaining, self.preempted):
+            self.resume_work[victim] = remaining[victim] + PREEMPT_OVERHEAD_MINUTES
+            self.preempted.add(victim)
+            del self.running[victim]
+            self.ready_since[victim] = self.current_time
+            batch.append(self.tasks[beneficiary])
+            self.preemptions.append({'time': self.current_time, 'victim': victim, 'for': beneficiary})
+            self.events.append({'time': self.current_time, 'type': 'preempt', 'task': victim,
+                                'mode': 'background'})
+
+    def _start(self, t: Task):
+        now = self.current_time
+        mode = get_task_mode(t)
+        unit = self.grouped.get(t.id, [t])
+        duration = self.resume_work.pop(t.id, None) or sum(self.duration_of(m) for m in unit)
+        duration += self.options.dispatch_overhead
+        if len(unit) > 1:
+            self.units[t.id] = [m.id for m in unit]
+            self.coalesced.append({'time': now, 'tasks': self.units[t.id]})
+            for m in unit[1:]:
+                self.task_stats[m.id]['start'] = now
+                self.waits[m.id] += now - self.ready_since.pop(m.id, now)
+        if self.isolated(t):
+            self.in_worktree.add(t.id)
+            duration += WORKTREE_SETUP_MINUTES
+        self.running[t.id] = (now, now + duration, mode)
+        if t.id not in self.preempted:
+            self.task_stats[t.id]['start'] = now
+        self.waits[t.id] += now - self.ready_since.pop(t.id, now)
+        self.events.append({'time': now, 'type': 'start', 'task': t.id, 'mode': mode})
+
+    def _speculate(self) -> List[int]:
+        """Duplicate stragglers into idle background slots. Returns times of pending straggler checks."""
+        checks = []
+        modes = self.running_modes()
+        bg_used = sum(1 for m in modes.values() if m == 'background')
+        free = min(self.constraints.max_parallel_background - bg_used,
+                   self.constraints.max_total_parallel - len(modes))
+        for tid, (start, end, _) in sorted(self.running.items(), key=lambda r: r[1][0]):
+            task = self.tasks[tid]
+            if tid in self.duplicates or not is_speculation_eligible(task):
+                continue
+            check_at = start + self.options.speculation_threshold * effort_to_minutes(task.effort)
+            if self.current_time < check_at:
+                checks.append(int(check_at + 0.999))
+            elif free > 0 and end > self.current_time:
+                self.duplicates[tid] = self.current_time + self.duration_of(task, copy=1)
+                free -= 1
+                self.speculated.append({'task': tid, 'time': self.current_time})
+                self.open_speculation[tid] = self.speculated[-1]
+                self.events.append({'time': self.current_time, 'type': 'speculate', 'task': tid,
+                                    'mode': 'background'})
+        return checks
+
+    def _result(self) -> Dict[str, any]:
+        # Bottleneck analysis
+        dependency_counts = {}
+        for tid, t in self.tasks.items():
+            for dep in t.depends_on:
+                dependency_counts[dep] = dependency_counts.get(dep, 0) + 1
+
+        bottlenecks = sorted(
+            [(tid, count) for tid, count in dependency_counts.items() if tid in self.tasks],
+            key=lambda x: x[1],
+            reverse=True
+        )[:5]
+
+        waits = self.waits
+        return {
+            'total_time': self.current_time,
+            'task_stats': self.task_stats,
+            'events': self.events,
+            'bottlenecks': bottlenecks,
+            'completed_count': len(self.completed),
+            'speculated': self.speculated,
+            'preemptions': self.preemptions,
+            'merges': self.merges,
+            'merge_conflicts': sum(1 for m in self.merges if m['conflict']),
+            'units': self.coalesced,
+            'dispatches': sum(1 for e in self.events if e['type'] == 'start'),
+            'waits': waits,
+            'max_wait': max(waits.values(), default=0),
+            'avg_wait': round(sum(waits.values()) / len(waits), 1) if waits else 0.0,
+        }
+
+
 def simulate_track(
     tasks: Dict[str, Task],
     constraints: ResourceConstraints,
-    max_iterations: int = 100
+    options: Optional[SimulationOptions] = None
 ) -> Dict[str, any]:
     """
     Simulate full track execution with virtual time.
-    Returns: Dict with timeline, bottleneck analysis, and stats.
+
+    options: scenario switches (SimulationOptions); default is plain dispatch
+
+    Returns: Dict with timeline, bottleneck analysis, and stats
+    (including per-task ready-queue wait in minutes).
     """
-    completed = set()
-    # task_id -> (start_time, end_time, mode)
-    running: Dict[str, Tuple[int, int, str]] = {}
-    current_time = 0
-    events = []
-    iteration = 0
-    
-    task_stats = {tid: {'start': 0, 'end': 0} for tid in tasks}
+    return _TrackSimulation(tasks, constraints, options or SimulationOptions()).run()
 
-    while (len(completed) < len(tasks)) and (iteration < max_iterations):
-        iteration += 1
-        
-        # 1. Update completed tasks based on current time
-        finished_this_tick = [tid for tid, (_, end, _) in running.items() if end <= current_time]
-        for tid in finished_this_tick:
-            completed.add(tid)
-            task_stats[tid]['end'] = running[tid][1]
-            del running[tid]
 
-        # 2. Find ready tasks (deps met, not running, not completed)
-        ready_ids = [
-            tid for tid, t in tasks.items()
-            if tid not in completed and tid not in running and
-            all(d in completed or d not in tasks for d in t.depends_on)
-        ]
-        ready_tasks = [tasks[tid] for tid in ready_ids]
-
-        # 3. Select batch using standard logic
-        current_running_modes = {tid: mode for tid, (_, _, mode) in running.items()}
-        batch = select_batch(ready_tasks, constraints, current_running_modes, iteration)
-
-        # 4. Start selected tasks
-        for t in batch:
-            mode = get_task_mode(t)
-            duration = effort_to_minutes(t.effort)
-            start_time = current_time
-            end_time = current_time + duration
-            running[t.id] = (start_time, end_time, mode)
-            task_stats[t.id]['start'] = start_time
-            
-            events.append({
-                'time': current_time,
-                'type': 'start',
-                'task': t.id,
-                'mode': mode
-            })
-
-        # 5. Advance time to next event
-        if running:
-            # Next completion or next possible start if we have slots?
-            # For simulation simplicity, we jump to next completion
-            next_completion = min(end for _, end, _ in running.values())
-            current_time = next_completion
-        elif ready_ids and not batch:
-            # Blocked by constraints or conflicts
-            current_time += 30
-        elif not ready_ids and len(completed) < len(tasks):
-            # Potential circular dependency check
-            break
-        else:
-            break
+def compare_speculation(
+    tasks: Dict[str, Task],
+    constraints: ResourceConstraints,
+    seed: int = 42,
+    runs: int = 20
+) -> Dict[str, any]:
+    """Average makespan with and without speculation over `runs` seeded duration draws."""
+    baseline, speculative, duplicates, wins = [], [], 0, 0
+    for run in range(runs):
+        model = DurationModel(seed=seed + run)
+        baseline.append(simulate_track(tasks, constraints, SimulationOptions(durations=model))['total_time'])
+        result = simulate_track(tasks, constraints, SimulationOptions(durations=model, speculate=True))
+        speculative.append(result['total_time'])
+        duplicates += len(result['speculated'])
+        wins += sum(1 for s in result['speculated'] if s.get('winner') == 'duplicate')
+
+    avg_base = sum(baseline) / runs
+    avg_spec = sum(speculative) / runs
+    return {
+        'runs': runs,
+        'seed': seed,
+        'baseline_makespan': round(avg_base),
+        'speculative_makespan': round(avg_spec),
+        'gain_percent': round(100 * (avg_base - avg_spec) / avg_base, 1) if avg_base else 0.0,
+        'duplicates': duplicates,
+        'duplicate_wins': wins,
+    }
 
-    # Bottleneck analysis
-    dependency_counts = {}
-    for tid, t in tasks.items():
-        for dep in t.depends_on:
-            dependency_counts[dep] = dependency_counts.get(dep, 0) + 1
-    
-    bottlenecks = sorted(
-        [(tid, count) for tid, count in dependency_counts.items() if tid in tasks],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
+def compare_isolation(
+    tasks: Dict[str, Task],
+    constraints: ResourceConstraints,
+    seed: int = 42,
+    runs: int = 20
+) -> Dict[str, any]:
+    """Makespan under touch locks vs worktree isolation (merge conflicts averaged over `runs` seeds)."""
+    locked = simulate_track(tasks, constraints, SimulationOptions(touch_locks=True))['total_time']
+    makespans, merges, merge_minutes, conflicts = [], 0, 0, 0
+    for run in range(runs):
+        result = simulate_track(tasks, constraints, SimulationOptions(isolate=True, seed=seed + run))
+        makespans.append(result['total_time'])
+        merges += len(result['merges'])
+        merge_minutes += sum(m['minutes'] for m in result['merges'])
+        conflicts += result['merge_conflicts']
+
+    avg_isolated = sum(makespans) / runs
+    return {
+        'runs': runs,
+        'seed': seed,
+        'locked_makespan': locked,
+        'isolated_makespan': round(avg_isolated),
+        'gain_percent': round(100 * (locked - avg_isolated) / locked, 1) if locked else 0.0,
+        'merges_per_run': round(merges / runs, 1),
+        'merge_minutes_per_run': round(merge_minutes / runs, 1),
+        'conflicts_per_run': round(conflicts / runs, 2),
+    }
 
+
+def compare_coalescing(
+    tasks: Dict[str, Task],
+    constraints: ResourceConstraints,
+    overhead: int = DISPATCH_OVERHEAD_MINUTES
+) -> Dict[str, any]:
+    """Makespan and dispatch count with a fixed per-dispatch overhead, one task per dispatch vs coalesced units."""
+    single = simulate_track(tasks, constraints, SimulationOptions(dispatch_overhead=overhead))
+    coalesced = simulate_track(tasks, constraints, SimulationOptions(dispatch_overhead=overhead, coalesce=True))
+    base = single['total_time']
     return {
-        'total_time': current_time,
-        'task_stats': task_stats,
-        'events': events,
-        'bottlenecks': bottlenecks,
-        'completed_count': len(completed)
+        'overhead': overhead,
+        'single_makespan': base,
+        'coalesced_makespan': coalesced['total_time'],
+        'gain_percent': round(100 * (base - coalesced['total_time']) / base, 1) if base else 0.0,
+        'single_dispatches': single['dispatches'],
+        'coalesced_dispatches': coalesced['dispatches'],
+        'units': coalesced['units'],
     }
 
+
 def render_ascii_timeline(simulation_results: Dict[str, any], tasks: Dict[str, Task]) -> str:
     """Generate ASCII Gantт chart for simulation results"""
     stats = simulation_results['task_stats']
@@ -503,7 +1420,8 @@ def render_ascii_timeline(simulation_results: Dict[str, any], tasks: Dict[str, T
     return "\n".join(lines)
 
 
-def generate_simulation_report(planner: 'OrchestrationPlanner', constraints: ResourceConstraints) -> str:
+def generate_simulation_report(planner: 'OrchestrationPlanner', constraints: ResourceConstraints,
+                               seed: int = 42) -> str:
     """Generate full markdown simulation report"""
     results = simulate_track(planner.tasks, constraints)
     
@@ -536,7 +1454,84 @@ def generate_simulation_report(planner: 'OrchestrationPlanner', constraints: Res
     lines.append(f"- Serial Time: {serial_time//60}h {serial_time%60}m")
     lines.append(f"- Simulated Parallel Time: {parallel_time//60}h {parallel_time%60}m")
     lines.append(f"- Efficiency Gain: {speedup:.1f}x speedup")
-    
+
+    eligible = [tid for tid, t in planner.tasks.items() if is_speculation_eligible(t)]
+    lines.append("")
+    lines.append("## Speculative Execution (v2.2)")
+    if eligible:
+        cmp = compare_speculation(planner.tasks, constraints, seed=seed)
+        lines.append(f"Duration variance model: seeds {cmp['seed']}..{cmp['seed'] + cmp['runs'] - 1}, "
+                     f"±25% lognormal, 10% stragglers at 3x. Duplicates launched after "
+                     f"{SPECULATION_THRESHOLD}x expected duration for: {', '.join(eligible)}")
+        lines.append("")
+        lines.append(f"- Avg makespan without speculation: {cmp['baseline_makespan']//60}h {cmp['baseline_makespan']%60}m")
+        lines.append(f"- Avg makespan with speculation: {cmp['speculative_makespan']//60}h {cmp['speculative_makespan']%60}m")
+        lines.append(f"- Gain: {cmp['gain_percent']}% "
+                     f"({cmp['duplicates']} duplicates, {cmp['duplicate_wins']} finished first)")
+    else:
+        lines.append("No read-only tasks on the critical path; speculation does not apply.")
+
+    shared = {}
+    for tid, task in planner.tasks.items():
+        if task.concurrency_class != 'read-only':
+            for touch in task.touches:
+                shared.setdefault(touch, []).append(tid)
+    shared = {touch: tids for touch, tids in shared.items() if len(tids) > 1}
+    lines.append("")
+    lines.append("## Worktree Isolation (v2.2)")
+    if shared:
+        cmp = compare_isolation(planner.tasks, constraints, seed=seed)
+        lines.append(f"Shared touches: {', '.join(f'`{t}` ({len(ids)} tasks)' for t, ids in shared.items())}. "
+                     f"Merge model: {WORKTREE_SETUP_MINUTES}m worktree setup, {MERGE_MINUTES_PER_FILE}m per "
+                     f"contended file (merges serialized), {MERGE_CONFLICT_RATE:.0%} conflict rate per file "
+                     f"(seeds {cmp['seed']}..{cmp['seed'] + cmp['runs'] - 1}).")
+        lines.append("")
+        lines.append(f"- Makespan with touch locks (sequential only): {cmp['locked_makespan']//60}h {cmp['locked_makespan']%60}m")
+        lines.append(f"- Avg makespan with worktree isolation: {cmp['isolated_makespan']//60}h {cmp['isolated_makespan']%60}m")
+        lines.append(f"- Gain: {cmp['gain_percent']}% ({cmp['merges_per_run']} merges, "
+                     f"{cmp['merge_minutes_per_run']}m merging, {cmp['conflicts_per_run']} serial re-runs per run)")
+    else:
+        lines.append("No write tasks share a touch; isolation does not apply.")
+
+    cmp = compare_coalescing(planner.tasks, constraints)
+    lines.append("")
+    lines.append("## Small-Task Coalescing (v2.2)")
+    if cmp['units']:
+        lines.append(f"Compatible small tasks (same role, model and mode; overlapping or adjacent touches; "
+                     f"up to {COALESCE_MAX_TASKS} per unit) run as one dispatch. Overhead model: "
+                     f"{cmp['overhead']}m per dispatch (brief, context warm-up, report parsing).")
+        lines.append("")
+        lines.append(f"- Makespan, one task per dispatch: {cmp['single_makespan']//60}h {cmp['single_makespan']%60}m "
+                     f"({cmp['single_dispatches']} dispatches)")
+        lines.append(f"- Makespan, coalesced: {cmp['coalesced_makespan']//60}h {cmp['coalesced_makespan']%60}m "
+                     f"({cmp['coalesced_dispatches']} dispatches)")
+        saved = cmp['single_dispatches'] - cmp['coalesced_dispatches']
+        lines.append(f"- Gain: {cmp['gain_percent']}% ({saved} dispatches, ~{saved * cmp['overhead']}m of overhead saved)")
+        lines.append(f"- Units: {', '.join(UNIT_SEPARATOR.join(u['tasks']) for u in cmp['units'])}")
+    else:
+        lines.append("No compatible small tasks are ready together; coalescing does not apply.")
+
+    lines.append("")
+    lines.append("## Ready-Queue Wait (v2.2)")
+    lines.append(f"Time each task spent ready but not dispatched. Priority aging adds "
+                 f"{PRIORITY_AGING_PER_HOUR:g} points per hour waited.")
+    lines.append("")
+    lines.append("| Scheduling | Makespan | Max wait | Avg wait | Preemptions |")
+    lines.append("|------------|----------|----------|----------|-------------|")
+    variants = [
+        ("No aging", simulate_track(planner.tasks, constraints, SimulationOptions(aging_per_hour=0))),
+        ("Aging", results),
+        ("Aging + preemption", simulate_track(planner.tasks, constraints, SimulationOptions(preempt=True))),
+    ]
+    for name, run in variants:
+        lines.append(f"| {name} | {run['total_time']}m | {run['max_wait']}m | {run['avg_wait']}m "
+                     f"| {len(run['preemptions'])} |")
+    longest = sorted(results['waits'].items(), key=lambda item: -item[1])[:3]
+    if longest and longest[0][1] > 0:
+        lines.append("")
+        lines.append("Longest waits (with aging): " +
+                     ", ".join(f"{tid} {wait}m" for tid, wait in longest if wait > 0))
+
     return "\n".join(lines)
 
 
@@ -573,6 +1568,88 @@ def calculate_metrics(
     }
 
 
+# State File Writing (v2.2)
+
+# Lines that change on every render but carry no state of their own
+VOLATILE_STATE_PREFIXES = ('**Last Updated:**',)
+
+
+def _strip_volatile(content: str) -> List[str]:
+    return [line for line in content.split('\n') if not line.startswith(VOLATILE_STATE_PREFIXES)]
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Atomically write `content` unless the file already holds the same state.
+
+    The comparison ignores VOLATILE_STATE_PREFIXES lines, so re-rendering an
+    unchanged state with a newer timestamp leaves the file (and its mtime) alone.
+    Returns True if the file was written.
+    """
+    try:
+        current = path.read_text(encoding='utf-8')
+    except (FileNotFoundError, UnicodeDecodeError):
+        current = None
+    if current is not None and _strip_volatile(current) == _strip_volatile(content):
+        return False
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, path)
+    return True
+
+
+class StateWriter:
+    """
+    Coalesces state-file writes inside a debounce window.
+
+    schedule() keeps only the most recent render callable; the render runs once
+    when the window closes (flush()). With debounce=0 (the CLI default) every
+    schedule() flushes immediately. Long-lived processes (daemon) set a window
+    and call flush_if_due() from their event loop.
+    """
+
+    def __init__(self, path: Path, debounce: float = 0.0, lock: Callable = None):
+        self.path = path
+        self.debounce = debounce
+        self.lock = lock or contextlib.nullcontext
+        self._pending = None
+        self._deadline: Optional[float] = None
+        self.writes = 0
+        self.skipped = 0
+
+    def schedule(self, render):
+        self._pending = render
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.debounce
+        if self.debounce <= 0:
+            self.flush()
+
+    def time_until_due(self) -> Optional[float]:
+        """Seconds until the pending write is due (None if nothing is pending)."""
+        if self._pending is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def flush_if_due(self) -> bool:
+        if self._pending is not None and time.monotonic() >= self._deadline:
+            return self.flush()
+        return False
+
+    def flush(self) -> bool:
+        """Render and write now. Returns True if the file changed on disk."""
+        render, self._pending, self._deadline = self._pending, None, None
+        if render is None:
+            return False
+        with self.lock():
+            written = write_if_changed(self.path, render())
+        if written:
+            self.writes += 1
+        else:
+            self.skipped += 1
+        return written
+
+
 def generate_mermaid_graph(planner: 'OrchestrationPlanner') -> str:
     """Generate Mermaid flowchart of the task graph."""
     lines = ["graph TD"]
@@ -648,27 +1725,103 @@ def detect_anti_patterns(planner: 'OrchestrationPlanner') -> List[str]:
     return warnings
 
 
+def report_is_complete(content: str) -> bool:
+    """Basic check: report exists and has 'Complete' status."""
+    return 'Status:** вњ… Complete' in content or 'Status:** Complete' in content
+
+
+# Templates (v2.2): compiled once, cached by path and mtime
+
+_VARIABLE_RE = re.compile(r'\{\{(.+?)\}\}')
+_TEMPLATE_CACHE: Dict[Path, Tuple[Tuple[int, int], 'CompiledTemplate']] = {}
+BRIEF_WORKERS = 4
+
+
+class CompiledTemplate:
+    """
+    A template split once into literal and {{variable}} segments.
+
+    render() fills all variables in a single pass; unknown variables are left
+    as written, like the original per-variable str.replace.
+    """
+
+    __slots__ = ('source', '_segments', '_slots')
+
+    def __init__(self, source: str):
+        self.source = source
+        # re.split with one group alternates literal, variable name, literal, ...
+        self._segments = _VARIABLE_RE.split(source)
+        self._slots = [(i, self._segments[i]) for i in range(1, len(self._segments), 2)]
+
+    def render(self, variables: Dict[str, str]) -> str:
+        parts = list(self._segments)
+        for i, name in self._slots:
+            if name in variables:
+                parts[i] = str(variables[name])
+            else:
+                parts[i] = f"{{{{{name}}}}}"
+        return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_template(content: str) -> CompiledTemplate:
+    return CompiledTemplate(content)
+
+
+def _template_candidates(name: str, track_path: Path = None) -> List[Path]:
+    candidates = []
+    if track_path:
+        parents = Path(track_path).resolve().parents  # swarm/tracks/<id> -> swarm/templates
+        if len(parents) > 1:
+            candidates.append(parents[1] / 'templates' / name)
+    candidates.append(Path(__file__).parent.parent / 'templates' / name)
+    return candidates
+
+
+def load_compiled_template(name: str, track_path: Path = None) -> CompiledTemplate:
+    """
+    Compiled template by name (same resolution order as load_template).
+
+    Each call costs one stat per candidate path; the file is only re-read and
+    re-compiled when its mtime or size changed.
+    """
+    for path in _template_candidates(name, track_path):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _TEMPLATE_CACHE.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        compiled = CompiledTemplate(path.read_text(encoding='utf-8'))
+        _TEMPLATE_CACHE[path] = (key, compiled)
+        return compiled
+    raise FileNotFoundError(f"Template '{name}' not found.")
+
+
 def load_template(name: str, track_path: Path = None) -> str:
     """
     Load a template by name with resolution order:
     1. swarm/templates/<name>
     2. .claude/skills/swarm-iosm/templates/<name>
     """
-    # 1. Project-specific override
-    if track_path:
-        project_template = track_path.parents[1] / 'templates' / name
-        if project_template.exists():
-            return project_template.read_text(encoding='utf-8')
-            
-    # 2. Skill defaults
-    skill_template = Path(__file__).parent.parent / 'templates' / name
-    if skill_template.exists():
-        return skill_template.read_text(encoding='utf-8')
-        
-    raise FileNotFoundError(f"Template '{name}' not found.")
+    return load_compiled_template(name, track_path).source
+
 
 def render_template(content: str, variables: Dict[str, str]) -> str:
-    """Simple variable substitution."""
+    """Simple variable substitution (single pass over the compiled template)."""
+    return compile_template(content).render(variables)
+
+
+def _render_template_naive(name: str, track_path: Path, variables: Dict[str, str]) -> str:
+    # Pre-v2.2 path, kept for benchmark_brief_rendering: disk lookup + one replace per variable
+    for path in _template_candidates(name, track_path):
+        if path.exists():
+            content = path.read_text(encoding='utf-8')
+            break
+    else:
+        raise FileNotFoundError(f"Template '{name}' not found.")
     for key, val in variables.items():
         content = content.replace(f"{{{{{key}}}}}", str(val))
     return content
@@ -679,12 +1832,38 @@ class OrchestrationPlanner:
         self.plan_path = Path(plan_path)
         self.tasks: Dict[str, Task] = {}
         self.graph: Dict[str, List[str]] = {}
+        # Incremental indexes kept current by insert_task(): reverse edges, touches -> tasks
+        self._dependents: Dict[str, Set[str]] = {}
+        self._touch_index: Dict[str, Set[str]] = {}
         self.waves: List[List[str]] = []
         self.critical_path: List[str] = []
+        # Longest-path index: rebuilt after parse_plan(), updated in place by insert_task()
+        self._critical_index: Optional[CriticalPathIndex] = None
+        self._critical_generation = -1
+        self.constraints = ResourceConstraints()
+        # In-memory checkpoint, valid while latest.json is unchanged on disk
+        self._checkpoint_cache: Optional[Tuple[Tuple[int, int, int], Checkpoint]] = None
+        # iosm_state.md rendering: per-section cache + debounced, diff-based writer
+        self._plan_generation = 0
+        self._state_sections: Dict[str, Tuple[tuple, List[str]]] = {}
+        self._state_metrics: Dict[str, any] = {}
+        self._task_costs: Dict[str, float] = {}
+        self._task_costs_generation = -1
+        # LSH index of spawned/deferred candidates' MinHash signatures (spawn_candidates.py)
+        self._near_duplicates = None
+        # Content-addressed reports of read-only tasks (result_cache.py)
+        self._result_cache = None
+        # Per-task git worktrees (worktree_isolation.py)
+        self._worktrees = None
+        self.state_writer = StateWriter(
+            self.plan_path.parent / 'iosm_state.md',
+            lock=lambda: checkpoint_lock(self.latest_checkpoint_path),
+        )
 
     def parse_plan(self):
         """Parse plan.md and extract tasks with new fields."""
         content = self.plan_path.read_text(encoding='utf-8')
+        self._plan_generation += 1
 
         # Pattern for task sections: - [ ] **T##**: Title OR - [x] **T##**: Title
         task_pattern = re.compile(
@@ -747,49 +1926,127 @@ class OrchestrationPlanner:
 
     def build_dependency_graph(self):
         """Build adjacency list for task dependencies."""
+        self._dependents = {}
+        self._touch_index = {}
         for task_id, task in self.tasks.items():
-            self.graph[task_id] = task.depends_on
+            self._index_task(task)
+
+    def _index_task(self, task: Task):
+        self.graph[task.id] = task.depends_on
+        for dep in task.depends_on:
+            self._dependents.setdefault(dep, set()).add(task.id)
+        if task.concurrency_class != 'read-only':
+            for touch in task.touches:
+                self._touch_index.setdefault(touch, set()).add(task.id)
+
+    def insert_task(self, task: Task):
+        """
+        Add a task to the in-memory plan without re-parsing or rebuilding the graph.
+
+        Only the new task's edges and touches are indexed; readiness and locks for it
+        follow from those (see is_ready / lock_holders). If the critical path has been
+        computed, it is updated incrementally and only tasks whose membership changed
+        get their is_on_critical_path flag rewritten.
+        """
+        self.tasks[task.id] = task
+        self._index_task(task)
+        if self._task_costs_generation == self._plan_generation:
+            self._task_costs[task.id] = estimate_task_cost(task, select_model(task))
+            self._task_costs_generation += 1
+        if self._critical_generation == self._plan_generation:
+            self._critical_index.add_task(task.id, effort_to_minutes(task.effort), task.depends_on)
+            self._sync_critical_path()
+            self._critical_generation += 1
+        self._plan_generation += 1
+
+    def is_ready(self, task_id: str, cp: Checkpoint) -> bool:
+        """Readiness of one task from its own dependencies (no full scan)."""
+        if task_id in cp.running_tasks or task_id in cp.completed_tasks:
+            return False
+        completed = cp.completed_tasks
+        return all(dep in completed or dep not in self.tasks for dep in self.tasks[task_id].depends_on)
+
+    def locked_paths(self, cp: Checkpoint, main_tree_only: bool = False) -> Set[str]:
+        """Touches held by running write tasks (main_tree_only: not those in a worktree)."""
+        isolated = cp.isolation.get('worktrees', {}) if main_tree_only else {}
+        return {touch for tid in cp.running_tasks if tid in self.tasks and tid not in isolated
+                and self.tasks[tid].concurrency_class != 'read-only'
+                for touch in self.tasks[tid].touches}
+
+    def isolatable(self, task: Task, cp: Checkpoint) -> bool:
+        """Write-local tasks run in their own worktree, unless a merge conflict sent them back to serial."""
+        return (task.concurrency_class == 'write-local' and bool(task.touches)
+                and task.id not in cp.isolation.get('serial', []))
+
+    def dispatch_filter(self, cp: Checkpoint, candidates: List[Task], isolate: bool = False) -> List[Task]:
+        """
+        Candidates whose touches may be written now. Without isolation a write
+        task needs all its touches free. With isolation, write-local tasks only
+        wait for main-tree writers (write-shared tasks and serial re-runs).
+        """
+        locked = self.locked_paths(cp)
+        if not isolate:
+            return [t for t in candidates if not self.check_conflicts(t.id, locked)]
+        main_tree = self.locked_paths(cp, main_tree_only=True)
+        return [t for t in candidates
+                if not self.check_conflicts(t.id, main_tree if self.isolatable(t, cp) else locked)]
+
+    def dependency_order(self, task_ids: Iterable[str]) -> List[str]:
+        """task_ids with every task after its (transitive) dependencies, plan order otherwise."""
+        position = {tid: i for i, tid in enumerate(self.tasks)}
+        depth: Dict[str, int] = {}
+
+        def depth_of(tid: str, stack: frozenset = frozenset()) -> int:
+            if tid not in depth:
+                deps = [d for d in self.tasks[tid].depends_on
+                        if d in self.tasks and d not in stack] if tid in self.tasks else []
+                depth[tid] = 1 + max((depth_of(d, stack | {tid}) for d in deps), default=-1)
+            return depth[tid]
+
+        return sorted(task_ids, key=lambda tid: (depth_of(tid), position.get(tid, len(position)), tid))
+
+    def lock_holders(self, task_id: str, cp: Checkpoint) -> Set[str]:
+        """Running tasks holding a lock this task needs (via the touches index)."""
+        task = self.tasks[task_id]
+        if task.concurrency_class == 'read-only':
+            return set()
+        holders = set()
+        for touch in task.touches:
+            holders |= {tid for tid in self._touch_index.get(touch, ()) if tid in cp.running_tasks}
+        holders.discard(task_id)
+        return holders
 
     def find_critical_path(self) -> Tuple[List[str], int]:
         """
         Find critical path (longest path by effort).
         Returns: (path as list of task IDs, total effort in minutes)
-        """
-        # Topological sort + longest path
-        def dfs_longest_path(task_id: str, memo: dict) -> Tuple[List[str], int]:
-            if task_id in memo:
-                return memo[task_id]
-
-            task = self.tasks[task_id]
-            task_effort = effort_to_minutes(task.effort)
 
-            if not task.depends_on:
-                result = ([task_id], task_effort)
-            else:
-                longest_subpath = ([], 0)
-                for dep in task.depends_on:
-                    if dep in self.tasks:  # Safety check
-                        subpath, subeffort = dfs_longest_path(dep, memo)
-                        if subeffort > longest_subpath[1]:
-                            longest_subpath = (subpath, subeffort)
-
-                result = (longest_subpath[0] + [task_id],
-                         longest_subpath[1] + task_effort)
-
-            memo[task_id] = result
-            return result
-
-        memo = {}
-        all_paths = [dfs_longest_path(tid, memo) for tid in self.tasks]
-        critical = max(all_paths, key=lambda x: x[1]) if all_paths else ([], 0)
-
-        self.critical_path = critical[0]
-
-        # Mark tasks on critical path (v1.2)
-        for tid in self.tasks:
-            self.tasks[tid].is_on_critical_path = (tid in self.critical_path)
-
-        return critical
+        The longest-path index is built once per parsed plan; later calls (and
+        insert_task) reuse it instead of recomputing from scratch.
+        """
+        if self._critical_generation != self._plan_generation or self._critical_index is None:
+            self._critical_index = CriticalPathIndex.build(self.tasks)
+            self._critical_generation = self._plan_generation
+            self.critical_path = self._critical_index.path()
+            # Mark tasks on critical path (v1.2)
+            on_path = set(self.critical_path)
+            for tid, task in self.tasks.items():
+                task.is_on_critical_path = tid in on_path
+        return list(self.critical_path), self._critical_index.length
+
+    def _sync_critical_path(self):
+        """Re-read the path from the index; flip flags only where membership changed."""
+        path = self._critical_index.path()
+        old, new = set(self.critical_path), set(path)
+        for tid in old ^ new:
+            if tid in self.tasks:
+                self.tasks[tid].is_on_critical_path = tid in new
+        self.critical_path = path
+
+    def task_schedule(self, task_id: str) -> Dict[str, int]:
+        """Earliest/latest start and slack of a task (minutes from track start)."""
+        self.find_critical_path()
+        return self._critical_index.schedule(task_id)
 
     def detect_file_conflicts(self, task_ids: List[str]) -> bool:
         """Check if any tasks in list have overlapping 'touches'."""
@@ -961,6 +2218,27 @@ class OrchestrationPlanner:
         lines.append("---")
         lines.append("")
 
+        # Rebuild Set (v2.2): after --rebuild, only invalidated tasks are re-dispatched
+        cp = self.load_latest_checkpoint()
+        rebuilding = cp is not None and bool(cp.rebuild)
+        if rebuilding:
+            pending = [tid for tid in self.tasks if tid not in cp.completed_tasks]
+            lines.append("## Rebuild Set")
+            lines.append("")
+            lines.append(f"**Re-run:** {len(cp.rebuild)} invalidated task(s); "
+                         f"{len(self.tasks) - len(pending)} completed task(s) are up to date and are skipped")
+            lines.append("")
+            for tid in sorted(cp.rebuild):
+                if tid in self.tasks:
+                    lines.append(f"- **{tid}**: {self.tasks[tid].title} — {cp.rebuild[tid]}")
+            rebuild_minutes = sum(effort_to_minutes(self.tasks[tid].effort) for tid in pending)
+            lines.append("")
+            lines.append(f"**Remaining effort:** {rebuild_minutes//60}h {rebuild_minutes%60}m "
+                         f"({len(pending)} task(s) incl. never-completed ones)")
+            lines.append("")
+            lines.append("---")
+            lines.append("")
+
         # Continuous Dispatch Rules
         lines.append("## Continuous Dispatch Rules")
         lines.append("")
@@ -981,7 +2259,7 @@ class OrchestrationPlanner:
         lines.append("| Task | Role | Model | Concurrency | Mode | Effort | Deps | Touches |")
         lines.append("|------|------|-------|-------------|------|--------|------|---------|")
 
-        for tid in sorted(self.tasks.keys(), key=lambda x: int(x[1:])):
+        for tid in sorted(self.tasks.keys(), key=task_sort_key):
             task = self.tasks[tid]
             mode = self.classify_task_mode(tid)
             model = select_model(task)
@@ -1004,15 +2282,30 @@ class OrchestrationPlanner:
         # Initial Ready Set
         lines.append("## Initial Ready Set")
         lines.append("")
-        lines.append("Tasks ready at start (no dependencies):")
+        if rebuilding:
+            lines.append("Tasks ready at start (dependencies up to date or rebuilt):")
+            initial_ready = self.ready_from_checkpoint(cp)
+        else:
+            lines.append("Tasks ready at start (no dependencies):")
+            initial_ready = self.get_ready_tasks(completed=set(), running=set())
         lines.append("")
 
-        initial_ready = self.get_ready_tasks(completed=set(), running=set())
         for tid in initial_ready:
             task = self.tasks[tid]
             mode = self.classify_task_mode(tid)
             lines.append(f"- **{tid}**: {task.title} ({mode})")
 
+        # Small-task coalescing (v2.2): one subagent per unit instead of per task
+        units = [unit for unit in coalesce_tasks([self.tasks[tid] for tid in initial_ready]) if len(unit) > 1]
+        if units:
+            lines.append("")
+            lines.append(f"**Coalesced units:** {sum(len(unit) for unit in units)} small tasks in "
+                         f"{len(units)} dispatch(es), saving {sum(len(unit) - 1 for unit in units)} "
+                         f"(`--briefs --coalesce`, then `--split-report <unit>`):")
+            for unit in units:
+                lines.append(f"- **{unit_id(unit)}**: {unit[0].owner_role}, {select_model(unit[0])} — "
+                             f"{', '.join(dict.fromkeys(f'`{t}`' for task in unit for t in task.touches))}")
+
         lines.append("")
         lines.append("**Action:** Launch all in single message")
         lines.append("")
@@ -1040,6 +2333,10 @@ class OrchestrationPlanner:
 
         if not conflicts_found:
             lines.append("No file conflicts detected. All write tasks can run in parallel.")
+        else:
+            lines.append("")
+            lines.append("*With worktree isolation (`work_queue.py serve --isolate`, or `--worktree T##`), "
+                         "write-local tasks above run in parallel and are merged in dependency order.*")
 
         lines.append("")
         lines.append("---")
@@ -1214,16 +2511,15 @@ class OrchestrationPlanner:
         Reconcile current state by reading reports and plan.md.
         Returns: Dict with completed tasks, running, etc.
         """
-        self.parse_plan()
+        if not self.tasks:
+            self.parse_plan()
         
         # Check reports for completion
         reports_dir = self.plan_path.parent / 'reports'
         completed = []
         if reports_dir.exists():
             for report in reports_dir.glob('T*.md'):
-                # Basic check: if report exists and has 'Complete' status
-                content = report.read_text(encoding='utf-8')
-                if 'Status:** вњ… Complete' in content or 'Status:** Complete' in content:
+                if report_is_complete(report.read_text(encoding='utf-8')):
                     completed.append(report.stem.upper())
         
         # Merge with plan.md status
@@ -1237,194 +2533,1693 @@ class OrchestrationPlanner:
         }
 
     def save_checkpoint(self, iteration: int = 0):
-        """Save current orchestration state to checkpoint file."""
+        """
+        Record an iteration: fold report/plan completions into the latest
+        checkpoint and snapshot it to checkpoints/iter_NNN.json.
+
+        Only completed/running/iteration change; retries, leases, spawn state and
+        the rest of the checkpoint are kept. Tasks invalidated by --rebuild stay
+        pending even though their old reports are complete.
+        """
         state = self.reconcile_state()
-        
-        cp = Checkpoint(
-            iteration=iteration,
-            timestamp=state['timestamp'],
-            completed_tasks=state['completed'],
-            running_tasks={}, # Orchestrator will fill this during loop
-            gate_scores={},   # Will be filled from gate check
-            spawn_budget_remaining=20, # Default or load from state
-            seen_dedup_keys=[],
-            retry_counts={}
-        )
-        
-        checkpoint_dir = self.plan_path.parent / 'checkpoints'
-        checkpoint_dir.mkdir(exist_ok=True)
-        
-        cp_path = checkpoint_dir / f"iter_{iteration:03d}.json"
+
+        def mutate(cp: Checkpoint) -> bool:
+            reconciled = [tid for tid in state['completed'] if tid not in cp.rebuild]
+            cp.completed_tasks = sorted(set(cp.completed_tasks) | set(reconciled), key=task_sort_key)
+            cp.running_tasks = {tid: mode for tid, mode in cp.running_tasks.items()
+                                if tid not in cp.completed_tasks}
+            cp.iteration = iteration
+            cp.timestamp = state['timestamp']
+            return True
+
+        cp, _ = self.transact_checkpoint(mutate)
+        cp_path = self.plan_path.parent / 'checkpoints' / f"iter_{iteration:03d}.json"
         cp.save(cp_path)
-        
-        # Also symlink latest.json (manual copy for Windows compatibility)
-        latest_path = checkpoint_dir / "latest.json"
-        cp.save(latest_path)
-        
+
         print(f"вњ… Saved checkpoint: {cp_path}")
 
+    @property
+    def latest_checkpoint_path(self) -> Path:
+        return self.plan_path.parent / 'checkpoints' / 'latest.json'
+
     def load_latest_checkpoint(self) -> Optional[Checkpoint]:
-        """Load the most recent checkpoint."""
-        latest_path = self.plan_path.parent / 'checkpoints' / 'latest.json'
-        if latest_path.exists():
-            return Checkpoint.load(latest_path)
-        return None
+        """Load the most recent checkpoint.
 
+        Long-lived planners (daemon mode) reuse the in-memory copy as long as
+        latest.json has not been modified by another process.
+        """
+        latest_path = self.latest_checkpoint_path
+        try:
+            st = latest_path.stat()
+        except FileNotFoundError:
+            self._checkpoint_cache = None
+            return None
+
+        stat_key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if self._checkpoint_cache and self._checkpoint_cache[0] == stat_key:
+            return self._checkpoint_cache[1]
+
+        cp = Checkpoint.load(latest_path)
+        self._checkpoint_cache = (stat_key, cp)
+        self._adopt_spawned(cp)
+        return cp
+
+    def _store_checkpoint(self, cp: Checkpoint):
+        """Write latest.json and keep the in-memory copy in sync (caller holds the checkpoint lock)."""
+        latest_path = self.latest_checkpoint_path
+        cp.version = Checkpoint.read_version(latest_path) + 1
+        cp.save(latest_path)
+        st = latest_path.stat()
+        self._checkpoint_cache = ((st.st_mtime_ns, st.st_size, st.st_ino), cp)
 
-    def retry_task(self, task_id: str) -> bool:
+    def transact_checkpoint(
+        self,
+        mutate: Callable[[Checkpoint], bool]
+    ) -> Tuple[Checkpoint, bool]:
         """
-        Record a retry attempt for a task and check limits.
+        Read-modify-write of latest.json under the checkpoint lock.
+
+        `mutate` receives a private copy of the latest checkpoint and returns True
+        if it changed anything. The lock serializes concurrent updaters (threads
+        and processes), so none of them loses another's changes or has to retry.
+        The version stamp only validates the in-memory copy: if it is behind the
+        file, it is dropped and latest.json re-read.
+
+        Returns: (checkpoint as committed or loaded, whether it was written)
         """
+        latest_path = self.latest_checkpoint_path
+        with checkpoint_lock(latest_path):
+            base = self._load_or_init_checkpoint()
+            if base.version != Checkpoint.read_version(latest_path):
+                self._checkpoint_cache = None
+                base = self._load_or_init_checkpoint()
+            cp = copy.deepcopy(base)
+            if not mutate(cp):
+                return cp, False
+            self._refresh_ready_since(cp)
+            self._store_checkpoint(cp)
+        return cp, True
+
+    def _load_or_init_checkpoint(self) -> Checkpoint:
+        """Latest checkpoint, or a fresh one reconciled from reports and plan.md."""
         cp = self.load_latest_checkpoint()
-        if not cp:
-            # Create fresh checkpoint
+        if cp:
+            return cp
+        state = self.reconcile_state()
+        return Checkpoint(
+            iteration=0,
+            timestamp=state['timestamp'],
+            completed_tasks=state['completed'],
+            running_tasks={},
+            gate_scores={},
+            spawn_budget_remaining=20,
+            seen_dedup_keys=[],
+            retry_counts={}
+        )
+
+    def print_resume_status(self):
+        """Show checkpoint summary and the recalculated ready queue."""
+        if not self.tasks:
+            self.parse_plan()  # before loading, so tasks spawned into the checkpoint are adopted
+        cp = self.load_latest_checkpoint()
+        if cp:
+            self._adopt_spawned(cp)
+            print(f"вњ… Loaded checkpoint from {cp.timestamp}")
+            print(f"Iteration: {cp.iteration}")
+            print(f"Completed tasks: {', '.join(cp.completed_tasks)}")
+
+            # Recalculate ready tasks
+            ready = self.ready_from_checkpoint(cp)
+            print(f"Ready to dispatch: {', '.join(ready)}")
+            if cp.retry_queue:
+                now = time.time()
+                print("Scheduled retries: " + "; ".join(self._describe_retry(e, now) for e in cp.retry_queue))
+            if cp.blocked:
+                print(f"Blocked (retry limit reached): {', '.join(sorted(cp.blocked, key=task_sort_key))}")
+        else:
+            print("вќЊ No checkpoint found. Reconciling from files...")
             state = self.reconcile_state()
-            cp = Checkpoint(
-                iteration=0,
-                timestamp=state['timestamp'],
-                completed_tasks=state['completed'],
-                running_tasks={},
-                gate_scores={},
-                spawn_budget_remaining=20,
-                seen_dedup_keys=[],
-                retry_counts={}
-            )
-            
+            print(f"Completed tasks: {', '.join(state['completed'])}")
+
+
+    def diagnose_task_failure(self, task_id: str) -> Optional[str]:
+        """ErrorType value of the first diagnosed error in the task's report, if any."""
+        try:
+            from .parse_errors import parse_subagent_errors
+        except ImportError:
+            from parse_errors import parse_subagent_errors
+
+        report_path = self.plan_path.parent / 'reports' / f"{task_id}.md"
+        diagnoses = parse_subagent_errors(report_path, task_id)
+        return diagnoses[0].error_type.value if diagnoses else None
+
+    def _schedule_retry(self, cp: Checkpoint, task_id: str, error_type: Optional[str],
+                        now: float) -> Optional[Dict[str, any]]:
+        """
+        Queue the next retry for a task per its ErrorType policy.
+
+        At the limit nothing is queued and the task is recorded in cp.blocked, so
+        it stays out of the ready queue. Returns None then (or if already blocked).
+        """
+        policy = get_retry_policy(error_type)
         count = cp.retry_counts.get(task_id, 0)
-        if count >= 3:
-            print(f"рџљЁ Task {task_id} reached max retry limit (3). Manual intervention required.")
+        if count >= policy.max_attempts or task_id in cp.blocked:
+            cp.blocked.setdefault(task_id, error_type or 'unknown')
+            self._release_task(cp, task_id)
+            return None
+
+        attempt = count + 1
+        task = self.tasks.get(task_id)
+        mode = 'foreground' if policy.foreground else (
+            self.classify_task_mode(task_id) if task else 'background')
+        model = select_model(task) if task else 'sonnet'
+        if policy.upgrade_model and attempt > 1:
+            model = MODEL_UPGRADES.get(model, model)
+        entry = {
+            'task': task_id,
+            'due': math.floor((now + policy.delay_for(attempt)) * 10) / 10,  # never later than asked
+            'attempt': attempt,
+            'error_type': error_type or 'unknown',
+            'mode': mode,
+            'model': model,
+        }
+
+        cp.retry_counts[task_id] = attempt
+        self._release_task(cp, task_id)
+        index = bisect.bisect_right([e['due'] for e in cp.retry_queue], entry['due'])
+        cp.retry_queue.insert(index, entry)
+        return entry
+
+    @staticmethod
+    def _release_task(cp: Checkpoint, task_id: str):
+        """Drop a failed task's running state and any queued retry."""
+        cp.running_tasks.pop(task_id, None)
+        cp.started_at.pop(task_id, None)
+        cp.leases.pop(task_id, None)
+        cp.speculative.pop(task_id, None)
+        cp.retry_queue = [e for e in cp.retry_queue if e['task'] != task_id]
+
+    @staticmethod
+    def _describe_retry(entry: Dict[str, any], now: float) -> str:
+        wait = entry['due'] - now
+        when = f"in {wait:.0f}s" if wait >= 1 else "now"
+        return (f"{entry['task']} attempt #{entry['attempt']} {when} "
+                f"({entry['error_type']}, {entry['mode']}, {entry['model']})")
+
+    def retry_task(self, task_id: str, error_type: Optional[str] = None, reset: bool = False) -> bool:
+        """
+        Schedule a retry for a failed task using the policy for its ErrorType.
+
+        The error type is taken from the task report's diagnosis unless given.
+        The retry lands in the checkpoint's time-ordered retry queue; the
+        dispatcher picks it up with due_retries() once its backoff has elapsed.
+        At the limit the task is blocked; `reset` (a manual decision) clears the
+        block and the attempt count first.
+        """
+        if not self.tasks:
+            self.parse_plan()
+        if error_type is None:
+            error_type = self.diagnose_task_failure(task_id)
+        now = time.time()
+        scheduled = {}
+
+        def mutate(cp: Checkpoint) -> bool:
+            was_blocked = task_id in cp.blocked
+            if reset:
+                cp.blocked.pop(task_id, None)
+                cp.retry_counts.pop(task_id, None)
+            scheduled['entry'] = self._schedule_retry(cp, task_id, error_type, now)
+            return scheduled['entry'] is not None or (task_id in cp.blocked) != was_blocked
+
+        _, written = self.transact_checkpoint(mutate)
+        if written:
+            self.state_writer.schedule(self._render_latest_state)
+        if not scheduled['entry']:
+            limit = get_retry_policy(error_type).max_attempts
+            print(f"🚨 Task {task_id} reached max retry limit ({limit}). Manual intervention required; "
+                  f"it stays blocked until --retry {task_id} --reset.")
             return False
-            
-        cp.retry_counts[task_id] = count + 1
-        cp.save(self.plan_path.parent / 'checkpoints' / 'latest.json')
-        print(f"вњ… Recorded retry #{count + 1} for {task_id}")
+
+        print(f"✅ Scheduled retry: {self._describe_retry(scheduled['entry'], now)}")
         return True
 
+    def retry_cluster(self, fingerprint: str) -> List[str]:
+        """
+        Retry every task that failed with the same root cause (error fingerprint).
+
+        The shared diagnosis is shown once; one retry per affected task is queued
+        in a single checkpoint update. Tasks already at the retry limit are skipped.
+        """
+        try:
+            from .parse_errors import find_error_cluster
+        except ImportError:
+            from parse_errors import find_error_cluster
+
+        cluster = find_error_cluster(self.plan_path.parent, fingerprint)
+        if cluster is None:
+            print(f"❌ No unique error cluster matches '{fingerprint}'")
+            return []
+
+        diag = cluster.diagnosis
+        error_type = diag.error_type.value
+        print(f"🔁 Cluster {cluster.fingerprint}: {error_type} in {len(cluster.tasks)} task(s): "
+              f"{', '.join(cluster.tasks)}")
+        print(f"   Reason: {diag.reason}")
+        for fix in diag.suggested_fixes:
+            print(f"   - {fix}")
+
+        if not self.tasks:
+            self.parse_plan()
+        now = time.time()
+        entries: List[Dict[str, any]] = []
+
+        def mutate(cp: Checkpoint) -> bool:
+            entries.clear()
+            blocked = len(cp.blocked)
+            for task_id in cluster.tasks:
+                entry = self._schedule_retry(cp, task_id, error_type, now)
+                if entry:
+                    entries.append(entry)
+            return bool(entries) or len(cp.blocked) != blocked
+
+        _, written = self.transact_checkpoint(mutate)
+        retried = [e['task'] for e in entries]
+        limit = get_retry_policy(error_type).max_attempts
+        for task_id in cluster.tasks:
+            if task_id not in retried:
+                print(f"🚨 Task {task_id} reached max retry limit ({limit}). Manual intervention required; "
+                      f"it stays blocked until --retry {task_id} --reset.")
+        for entry in entries:
+            print(f"✅ Scheduled retry: {self._describe_retry(entry, now)}")
+        if written:
+            self.state_writer.schedule(self._render_latest_state)
+        return retried
+
+    def due_retries(self, now: float = None) -> List[Dict[str, any]]:
+        """Pop retries whose backoff has elapsed (oldest first); they become ready again."""
+        now = time.time() if now is None else now
+        drained: List[Dict[str, any]] = []
+
+        def mutate(cp: Checkpoint) -> bool:
+            split = bisect.bisect_right([e['due'] for e in cp.retry_queue], now)
+            drained[:] = cp.retry_queue[:split]
+            cp.retry_queue = cp.retry_queue[split:]
+            return bool(drained)
+
+        _, written = self.transact_checkpoint(mutate)
+        if written:
+            self.state_writer.schedule(self._render_latest_state)
+        return drained
+
+    def print_due_retries(self, due: List[Dict[str, any]], as_json: bool = False):
+        """Print drained retries (see due_retries) and what is still waiting."""
+        if as_json:
+            print(json.dumps(due, indent=2))
+            return
+        now = time.time()
+        for entry in due:
+            print(f"🔁 {self._describe_retry(entry, now)}")
+        cp = self.load_latest_checkpoint()
+        if cp and cp.retry_queue:
+            print(f"⏳ {len(cp.retry_queue)} retr{'y' if len(cp.retry_queue) == 1 else 'ies'} waiting; "
+                  f"next: {self._describe_retry(cp.retry_queue[0], now)}")
+        elif not due:
+            print("No retries due.")
+
+    def heartbeat(self, task_id: str, now: float = None) -> bool:
+        """Renew a running task's lease. False if the task is not running (lease lost)."""
+        now = time.time() if now is None else now
+
+        def mutate(cp: Checkpoint) -> bool:
+            mode = cp.running_tasks.get(task_id)
+            if mode is None:
+                return False
+            cp.leases[task_id] = now + lease_ttl(mode)
+            return True
+
+        _, renewed = self.transact_checkpoint(mutate)
+        return renewed
+
+    def _report_mtime(self, task_id: str) -> Optional[float]:
+        """Latest modification of the task's report (or its speculative copy's)."""
+        mtimes = []
+        for path in (self.plan_path.parent / 'reports' / f"{task_id}.md", self.speculative_report_path(task_id)):
+            try:
+                mtimes.append(path.stat().st_mtime)
+            except OSError:
+                pass
+        return max(mtimes) if mtimes else None
+
+    def reap_expired_leases(self, now: float = None) -> List[Dict[str, any]]:
+        """
+        Recover running tasks whose lease ran out (the subagent died silently).
+
+        A report file modified since the lease was granted counts as a heartbeat.
+        Expired tasks leave running_tasks (releasing their touches locks), count
+        as a TIMEOUT for the concurrency controller, and are re-queued through the
+        retry policy (blocked at its limit, see _schedule_retry). Running tasks from
+        older checkpoints without a lease get one.
+
+        Returns: [{"task": tid, "retry": retry entry or None}] for reaped tasks.
+        """
+        if not self.tasks:
+            self.parse_plan()
+        now = time.time() if now is None else now
+        reaped: List[Dict[str, any]] = []
+
+        def mutate(cp: Checkpoint) -> bool:
+            reaped.clear()
+            changed = False
+            for task_id, mode in list(cp.running_tasks.items()):
+                ttl = lease_ttl(mode)
+                expires = cp.leases.get(task_id)
+                if expires is None:
+                    cp.leases[task_id] = now + ttl
+                    changed = True
+                    continue
+                if now < expires:
+                    continue
+                mtime = self._report_mtime(task_id)
+                if mtime is not None and mtime > expires - ttl and mtime + ttl > now:
+                    cp.leases[task_id] = mtime + ttl
+                    changed = True
+                    continue
+
+                del cp.running_tasks[task_id]
+                del cp.leases[task_id]
+                cp.speculative.pop(task_id, None)
+                self._observe_outcome(cp, task_id, True, 'timeout', now)
+                reaped.append({'task': task_id, 'retry': self._schedule_retry(cp, task_id, 'timeout', now)})
+                changed = True
+            if reaped:
+                cp.iteration += 1
+            return changed
+
+        _, written = self.transact_checkpoint(mutate)
+        if written:
+            self.state_writer.schedule(self._render_latest_state)
+        for item in reaped:
+            if item['retry']:
+                print(f"💀 Lease expired for {item['task']}; locks released, "
+                      f"retry: {self._describe_retry(item['retry'], now)}")
+            else:
+                print(f"💀 Lease expired for {item['task']}; locks released, retry limit reached. "
+                      f"Blocked until --retry {item['task']} --reset.")
+        return reaped
+
+    def speculation_candidates(self, cp: Checkpoint, now: float = None) -> List[Dict[str, any]]:
+        """
+        Straggling read-only critical-path tasks that should get a duplicate now.
+
+        Expected duration is the effort estimate scaled by the observed latency
+        baseline once there is enough history. Limited to idle background slots.
+        """
+        now = time.time() if now is None else now
+        controller = self.concurrency_controller(cp)
+        scale = controller.baseline if controller.samples >= 5 and controller.baseline else None
+        background = sum(1 for mode in cp.running_tasks.values() if mode == 'background')
+        free = controller.limit - background - len(cp.speculative)
+
+        candidates = []
+        for task_id in cp.running_tasks:
+            task = self.tasks.get(task_id)
+            started = cp.started_at.get(task_id)
+            if task is None or started is None or task_id in cp.speculative:
+                continue
+            if not is_speculation_eligible(task):
+                continue
+            expected = effort_to_minutes(task.effort) * 60 * (scale or 1.0)
+            ratio = (now - started) / expected
+            if ratio >= SPECULATION_THRESHOLD:
+                candidates.append({'task': task_id, 'ratio': round(ratio, 2),
+                                   'basis': 'history' if scale else 'effort'})
+        candidates.sort(key=lambda c: -c['ratio'])
+        return candidates[:max(0, free)]
+
+    def speculative_report_path(self, task_id: str) -> Path:
+        return self.plan_path.parent / 'reports' / SPECULATIVE_REPORTS_DIR / f"{task_id}.md"
+
+    def start_speculation(self, task_id: str, now: float = None) -> bool:
+        """Record that a duplicate of a running read-only task was launched."""
+        if not self.tasks:
+            self.parse_plan()
+        task = self.tasks.get(task_id)
+        if task is None or task.concurrency_class != 'read-only':
+            print(f"❌ Only read-only tasks can run speculatively ({task_id})")
+            return False
+        now = time.time() if now is None else now
+
+        def mutate(cp: Checkpoint) -> bool:
+            if task_id not in cp.running_tasks or task_id in cp.speculative:
+                return False
+            cp.speculative[task_id] = now
+            return True
+
+        _, recorded = self.transact_checkpoint(mutate)
+        if recorded:
+            self.state_writer.schedule(self._render_latest_state)
+        return recorded
+
+    def _settle_speculation(self, task_id: str):
+        """Task finished: keep the winning copy's report and tell the caller to cancel the other."""
+        cp = self.load_latest_checkpoint()
+        if not cp or task_id not in cp.speculative:
+            return
+        primary = self.plan_path.parent / 'reports' / f"{task_id}.md"
+        duplicate = self.speculative_report_path(task_id)
+        primary_done = primary.exists() and report_is_complete(primary.read_text(encoding='utf-8'))
+        duplicate_done = duplicate.exists() and report_is_complete(duplicate.read_text(encoding='utf-8'))
+        if duplicate_done and not primary_done:
+            os.replace(duplicate, primary)
+            print(f"⚡ Speculative copy of {task_id} finished first; its report was promoted. "
+                  f"Cancel the original run.")
+        else:
+            print(f"⚡ {task_id} finished; cancel its speculative duplicate.")
+
+    def ready_from_checkpoint(self, cp: Optional[Checkpoint]) -> List[str]:
+        """Ready queue for a checkpoint: tasks waiting in the retry queue or blocked are not ready."""
+        if cp is None:
+            return self.get_ready_tasks(set(), set())
+        waiting = {e['task'] for e in cp.retry_queue} | set(cp.blocked)
+        return self.get_ready_tasks(set(cp.completed_tasks), set(cp.running_tasks) | waiting)
+
+    def _refresh_ready_since(self, cp: Checkpoint, now: float = None):
+        """Stamp tasks that just became ready; forget tasks that left the ready queue."""
+        if not self.tasks:
+            return
+        now = time.time() if now is None else now
+        ready = self.ready_from_checkpoint(cp)
+        # Keep stamps of tasks spawned but not yet adopted into this plan
+        pending = {tid: t for tid, t in cp.ready_since.items() if tid not in self.tasks}
+        cp.ready_since = {**pending, **{tid: cp.ready_since.get(tid, now) for tid in ready}}
+
+    def prioritized_ready(self, cp: Optional[Checkpoint], now: float = None) -> List[Tuple[str, float]]:
+        """Ready queue as (task_id, minutes waited), highest aged priority score first."""
+        ready = self.ready_from_checkpoint(cp)
+        if cp is None:
+            return [(tid, 0.0) for tid in ready]
+        now = time.time() if now is None else now
+        waited = {tid: max(0.0, now - cp.ready_since.get(tid, now)) / 60 for tid in ready}
+        ready.sort(key=lambda tid: -calculate_priority_score(self.tasks[tid], waited[tid]))
+        return [(tid, waited[tid]) for tid in ready]
+
+    def print_ready(self, as_json: bool = False):
+        """Print the ready queue (dispatch from the top) and the current background limit."""
+        cp = self.load_latest_checkpoint()
+        ready = self.prioritized_ready(cp)
+        limit = self.effective_constraints(cp).max_parallel_background
+        if as_json:
+            print(json.dumps({'ready': [tid for tid, _ in ready], 'max_parallel_background': limit}, indent=2))
+            return
+        if not ready:
+            print("No tasks ready.")
+        for tid, waited in ready:
+            print(f"▶️  {tid} ({get_task_mode(self.tasks[tid])}, waiting {waited:.0f} min)")
+        print(f"Background limit: {limit}")
+
+    def preemption_candidates(self, cp: Checkpoint, now: float = None) -> List[Dict[str, any]]:
+        """
+        Running non-critical background tasks that should yield their slot to a
+        ready critical-path task. Only suggested while background slots are full.
+        """
+        now = time.time() if now is None else now
+        limit = self.concurrency_controller(cp).limit
+        background = sum(1 for mode in cp.running_tasks.values() if mode == 'background')
+        if background < limit:
+            return []
+        blocked = [self.tasks[tid] for tid, _ in self.prioritized_ready(cp, now)]
+        remaining = {}
+        for tid, started in cp.started_at.items():
+            if tid in self.tasks:
+                elapsed = (now - started) / 60
+                remaining[tid] = effort_to_minutes(self.tasks[tid].effort) - elapsed
+        pairs = select_preemptions(blocked, cp.running_tasks, self.tasks, remaining, set(cp.preempted))
+        return [{'victim': victim, 'for': beneficiary, 'remaining': round(remaining[victim])}
+                for victim, beneficiary in pairs]
+
+    def preempt_task(self, task_id: str, now: float = None) -> bool:
+        """Record that a running task stopped at a safe point and gave up its slot.
+
+        Not a failure: no retry is counted and the concurrency controller is not
+        fed. The task returns to the ready queue and resumes from its report.
+        """
+        now = time.time() if now is None else now
+
+        def mutate(cp: Checkpoint) -> bool:
+            if task_id not in cp.running_tasks or task_id in cp.speculative:
+                return False
+            del cp.running_tasks[task_id]
+            cp.started_at.pop(task_id, None)
+            cp.leases.pop(task_id, None)
+            cp.preempted[task_id] = now
+            return True
+
+        _, changed = self.transact_checkpoint(mutate)
+        if changed:
+            self.state_writer.schedule(self._render_latest_state)
+        return changed
+
+    # --- Auto-spawn (v2.2) ---------------------------------------------------
+
+    def _adopt_spawned(self, cp: Checkpoint):
+        """Insert tasks spawned by other processes into this in-memory plan."""
+        if not self.tasks:
+            return  # plan not parsed yet; adopted on a later load
+        for task_id, spec in cp.spawn.get('tasks', {}).items():
+            if task_id not in self.tasks:
+                self.insert_task(Task(**spec))
+
+    def _spawned_task(self, task_id: str, candidate: Dict[str, any]) -> Task:
+        source = self.tasks.get(candidate['source_task'])
+        return Task(
+            id=task_id,
+            title=candidate['subtask'],
+            owner_role=source.owner_role if source else 'Implementer',
+            depends_on=[source.id] if source else [],
+            touches=candidate['touches'],
+            # Critical discoveries always spawn, but a human looks at them first
+            needs_user_input=candidate['needs_user_input'] or candidate['severity'] == 'critical',
+            effort=candidate['effort'],
+            status='TODO',
+            iosm_checks=candidate['gate'],
+            acceptance=candidate['accept_criteria'],
+            artifacts='',
+            concurrency_class='write-local' if candidate['touches'] else 'read-only',
+            severity=candidate['severity'],
+        )
+
+    @staticmethod
+    def _spawn_deferral(cp: Checkpoint, candidate: Dict[str, any]) -> Optional[str]:
+        """Why a candidate must wait for the user (None = spawn now). SKILL.md Spawn Protection."""
+        try:
+            from .spawn_candidates import SPAWN_BUDGET_PER_GATE, SPAWN_BUDGET_TOTAL
+        except ImportError:
+            from spawn_candidates import SPAWN_BUDGET_PER_GATE, SPAWN_BUDGET_TOTAL
+
+        gate = candidate['gate']
+        if candidate['severity'] == 'critical':
+            return None
+        if candidate['needs_user_input']:
+            return 'needs user input'
+        if candidate['severity'] == 'low':
+            return 'low severity'
+        # gate_scores hold progress toward each gate's target; 1.0 = met
+        if cp.gate_scores.get(gate, 0.0) >= 1.0:
+            return f"{gate} already met"
+        if cp.spawn_budget_remaining <= 0:
+            return 'spawn budget exhausted'
+        if cp.spawn.get('used', {}).get(gate, 0) >= SPAWN_BUDGET_PER_GATE.get(gate, SPAWN_BUDGET_TOTAL):
+            return f"{gate} budget exhausted"
+        return None
+
+    def _commit_spawn(self, cp: Checkpoint, candidate: Dict[str, any], charge: bool = True) -> str:
+        """Record a spawned task in the checkpoint and charge its gate's budget."""
+        spawn = cp.spawn
+        task_id = f"T-AUTO-{spawn.get('next_id', 1):02d}"
+        spawn['next_id'] = spawn.get('next_id', 1) + 1
+        spawn.setdefault('tasks', {})[task_id] = asdict(self._spawned_task(task_id, candidate))
+        # Spawned from a completed task, so it enters the ready queue now
+        cp.ready_since.setdefault(task_id, time.time())
+        if charge:
+            used = spawn.setdefault('used', {})
+            used[candidate['gate']] = used.get(candidate['gate'], 0) + 1
+            cp.spawn_budget_remaining = max(0, cp.spawn_budget_remaining - 1)
+        return task_id
+
+    def ingest_spawn_candidates(self, task_ids: Optional[List[str]] = None) -> Dict[str, any]:
+        """
+        Parse SpawnCandidates from completed tasks' reports and insert eligible tasks.
+
+        Dedup goes through a set built from seen_dedup_keys (first wins), then a
+        MinHash/LSH index catches near-duplicates reported under another key or
+        wording (never applied to critical candidates). Critical candidates always
+        spawn (and stop the loop); user-input, low-severity, met-gate and
+        over-budget candidates are deferred until --approve-spawn. New tasks are
+        inserted into the in-memory plan incrementally.
+
+        Returns: {'spawned', 'duplicates', 'near_duplicates', 'deferred', 'critical', 'stop'}
+        """
+        try:
+            from .spawn_candidates import candidate_features, minhash_signature, parse_report_candidates
+        except ImportError:
+            from spawn_candidates import candidate_features, minhash_signature, parse_report_candidates
+
+        if not self.tasks:
+            self.parse_plan()
+            self.build_dependency_graph()
+        base = self._load_or_init_checkpoint()
+        ingested = set(base.spawn.get('sources', []))
+        sources = [tid for tid in (task_ids or base.completed_tasks) if tid not in ingested]
+        reports_dir = self.plan_path.parent / 'reports'
+        parsed = {tid: [(asdict(c), minhash_signature(candidate_features(c)))
+                        for c in parse_report_candidates(reports_dir / f"{tid}.md", tid)]
+                  for tid in sources}
+        parsed = {tid: candidates for tid, candidates in parsed.items() if candidates}
+        result = {'spawned': [], 'duplicates': [], 'near_duplicates': [], 'deferred': [],
+                  'critical': [], 'stop': False}
+        if not parsed:
+            return result
+
+        def mutate(cp: Checkpoint) -> bool:
+            for key in result:
+                result[key] = [] if key != 'stop' else False
+            seen = set(cp.seen_dedup_keys)
+            done = set(cp.spawn.get('sources', []))
+            index = self._near_duplicate_index(cp)
+            for source, candidates in parsed.items():
+                if source in done:
+                    continue
+                for candidate, signature in candidates:
+                    key = candidate['dedup_key']
+                    if key in seen:
+                        result['duplicates'].append(candidate)
+                        continue
+                    seen.add(key)
+                    cp.seen_dedup_keys.append(key)
+                    match = index.query(signature) if candidate['severity'] != 'critical' else None
+                    if match:
+                        near = dict(candidate, duplicate_of=match[0], similarity=round(match[1], 2))
+                        result['near_duplicates'].append(near)
+                        cp.spawn['near_duplicates'] = cp.spawn.get('near_duplicates', 0) + 1
+                        # Merge into a still-deferred original so the user sees every reporter
+                        for entry in cp.spawn.get('deferred', []):
+                            if entry['dedup_key'] == match[0]:
+                                entry.setdefault('also_reported_by', []).append(
+                                    f"{candidate['source_task']}/{candidate['candidate_id']}")
+                        continue
+                    index.add(key, signature)
+                    cp.spawn.setdefault('signatures', {})[key] = signature
+                    reason = self._spawn_deferral(cp, candidate)
+                    if reason:
+                        cp.spawn.setdefault('deferred', []).append(dict(candidate, reason=reason))
+                        result['deferred'].append(dict(candidate, reason=reason))
+                        result['stop'] = result['stop'] or 'budget' in reason
+                        continue
+                    critical = candidate['severity'] == 'critical'
+                    task_id = self._commit_spawn(cp, candidate, charge=not critical)
+                    result['spawned'].append(task_id)
+                    if critical:
+                        result['critical'].append(task_id)
+                        result['stop'] = True
+                cp.spawn.setdefault('sources', []).append(source)
+            return True
+
+        cp, _ = self.transact_checkpoint(mutate)
+        for task_id in result['spawned']:
+            if task_id not in self.tasks:
+                self.insert_task(Task(**cp.spawn['tasks'][task_id]))
+        self.state_writer.schedule(self._render_latest_state)
+        self._print_spawn_result(cp, result)
+        return result
+
+    def _near_duplicate_index(self, cp: Checkpoint):
+        """
+        The in-memory LSH index, brought up to date with the checkpoint's signatures.
+
+        Signatures only accumulate, so normally just new ones are added. Entries left
+        over from a transaction that was not committed make the index larger than
+        the checkpoint's set, which triggers a rebuild.
+        """
+        try:
+            from .spawn_candidates import NearDuplicateIndex
+        except ImportError:
+            from spawn_candidates import NearDuplicateIndex
+
+        signatures = cp.spawn.get('signatures', {})
+        index = self._near_duplicates
+        if index is not None and len(index) < len(signatures):
+            for key, signature in signatures.items():
+                index.add(key, signature)
+        if index is None or len(index) != len(signatures):
+            index = self._near_duplicates = NearDuplicateIndex()
+            for key, signature in signatures.items():
+                index.add(key, signature)
+        return index
+
+    def _print_spawn_result(self, cp: Checkpoint, result: Dict[str, any]):
+        for task_id in result['spawned']:
+            task = self.tasks[task_id]
+            holders = self.lock_holders(task_id, cp)
+            where = ("ready" if self.is_ready(task_id, cp) and not holders
+                     else f"waits for lock held by {', '.join(sorted(holders))}" if holders else "waiting")
+            print(f"🌱 Spawned {task_id}: {task.title} ({task.iosm_checks}, {task.severity}, "
+                  f"from {task.depends_on[0] if task.depends_on else '?'}) — {where}")
+        if result['duplicates']:
+            print(f"   Skipped {len(result['duplicates'])} duplicate candidate(s): "
+                  f"{', '.join(c['dedup_key'] for c in result['duplicates'])}")
+        for candidate in result['near_duplicates']:
+            print(f"   Skipped near-duplicate {candidate['source_task']}/{candidate['candidate_id']} "
+                  f"[{candidate['dedup_key']}] ≈ [{candidate['duplicate_of']}] "
+                  f"(similarity {candidate['similarity']:.2f})")
+        for candidate in result['deferred']:
+            print(f"⏸️  Deferred {candidate['source_task']}/{candidate['candidate_id']} "
+                  f"[{candidate['dedup_key']}]: {candidate['reason']}")
+        for task_id in result['critical']:
+            print(f"🚨 Critical SpawnCandidate spawned as {task_id}: STOP the loop and alert the user")
+        if any('budget' in c['reason'] for c in result['deferred']):
+            print(f"🚨 Spawn budget exhausted (remaining {cp.spawn_budget_remaining}): stop and ask the user; "
+                  f"approve individual candidates with --approve-spawn <dedup key>")
+
+    def approve_spawn(self, dedup_key: str) -> Optional[str]:
+        """User override: spawn a deferred candidate regardless of severity rules and budget."""
+        try:
+            from .spawn_candidates import normalize_dedup_key
+        except ImportError:
+            from spawn_candidates import normalize_dedup_key
+
+        if not self.tasks:
+            self.parse_plan()
+            self.build_dependency_graph()
+        key = normalize_dedup_key(dedup_key)
+        approved = {}
+
+        def mutate(cp: Checkpoint) -> bool:
+            approved.clear()
+            deferred = cp.spawn.get('deferred', [])
+            for i, candidate in enumerate(deferred):
+                if candidate['dedup_key'] == key:
+                    del deferred[i]
+                    candidate = {k: v for k, v in candidate.items() if k != 'reason'}
+                    approved['task'] = self._commit_spawn(cp, candidate)
+                    return True
+            return False
+
+        cp, changed = self.transact_checkpoint(mutate)
+        if not changed:
+            return None
+        task_id = approved['task']
+        self.insert_task(Task(**cp.spawn['tasks'][task_id]))
+        self.state_writer.schedule(self._render_latest_state)
+        self._print_spawn_result(cp, {'spawned': [task_id], 'duplicates': [], 'near_duplicates': [],
+                                      'deferred': [], 'critical': [], 'stop': False})
+        return task_id
+
+    def brief_variables(self, task_id: str, created: str, shared_context: str,
+                        unit: Optional[List[Task]] = None) -> Dict[str, str]:
+        """Template variables of templates/subagent_brief.md for one task (or a coalesced unit)."""
+        task = self.unit_task(unit) if unit else self.tasks[task_id]
+        members = {t.id for t in unit} if unit else {task_id}
+        deps = [f"- {dep}: {self.tasks[dep].title}" if dep in self.tasks else f"- {dep}"
+                for dep in task.depends_on]
+        dependents = [f"- {tid}: {self.tasks[tid].title}"
+                      for tid in sorted({d for m in members for d in self._dependents.get(m, ())} - members)
+                      if tid in self.tasks]
+        return {
+            'track_id': self.plan_path.resolve().parent.name,
+            'task_id': task.id,
+            'task_title': task.title,
+            'role': task.owner_role or 'Implementer',
+            'created': created,
+            'mode': get_task_mode(task).capitalize(),
+            'model': select_model(task),
+            'depends_on': '\n'.join(deps) or '- None',
+            'dependents': '\n'.join(dependents) or '- None',
+            'touches': '\n'.join(task.touches) or '(read-only: do not modify any files)',
+            'acceptance': task.acceptance or '[Specific functional requirement met]',
+            'shared_context': shared_context,
+        }
+
+    def unit_task(self, unit: List[Task]) -> Task:
+        """A coalesced unit as one task: union of touches, outside dependencies, per-task acceptance."""
+        ids = [task.id for task in unit]
+        return replace(
+            unit[0],
+            id=unit_id(unit),
+            title=f"{len(unit)} coalesced tasks: " + '; '.join(task.title for task in unit),
+            depends_on=sorted({dep for task in unit for dep in task.depends_on if dep not in ids}),
+            touches=list(dict.fromkeys(touch for task in unit for touch in task.touches)),
+            acceptance='\n- [ ] '.join(f"{task.id}: {task.acceptance or task.title}" for task in unit),
+        )
+
+    def unit_brief(self, unit: List[Task], rendered: str) -> str:
+        """Insert the member list and the combined-report contract after the brief's header."""
+        lines = ["## Coalesced Tasks (v2.2)", "",
+                 f"This brief covers {len(unit)} small tasks dispatched together. Do them one after another.", ""]
+        for task in unit:
+            touches = ', '.join(f"`{t}`" for t in task.touches) or 'read-only'
+            lines.append(f"- **{task.id}**: {task.title} ({touches})")
+        lines += ["",
+                  f"**Report:** save ONE file, `reports/{UNIT_REPORTS_DIR}/{unit_id(unit)}.md`, holding one complete report per task, "
+                  f"each starting with its own `# Subagent Report: Task T##` heading. The orchestrator splits it "
+                  f"into `reports/T##.md`; a task without its own part counts as failed.",
+                  "", "---", ""]
+        head, sep, rest = rendered.partition('\n---\n')
+        if not sep:
+            return rendered + '\n\n' + '\n'.join(lines)
+        return head + sep + '\n' + '\n'.join(lines) + rest
+
+    def render_briefs(self, task_ids: Optional[List[str]] = None,
+                      workers: int = BRIEF_WORKERS, coalesce: bool = False) -> Dict[str, any]:
+        """
+        Render briefs/<T##>.md for the given tasks (default: the ready queue).
+
+        The template is compiled once and the shared-context index loaded once;
+        per-task slicing, rendering and writing run on a thread pool. With
+        coalesce, compatible small tasks share one brief, briefs/T03+T04.md
+        (coalesce_tasks), sliced for their combined touches.
+
+        Returns: {'paths', 'written', 'context_tokens', 'saved_tokens', 'units'}
+        """
+        try:
+            from .merge_context import INDEX_FILE, ContextIndex, full_context_tokens, slice_shared_context
+        except ImportError:
+            from merge_context import INDEX_FILE, ContextIndex, full_context_tokens, slice_shared_context
+
+        if not self.tasks:
+            self.parse_plan()
+            self.build_dependency_graph()
+        if task_ids is None:
+            task_ids = [tid for tid, _ in self.prioritized_ready(self.load_latest_checkpoint())]
+        track = self.plan_path.parent
+        template = load_compiled_template('subagent_brief.md', track)
+        index = ContextIndex(track / INDEX_FILE)
+        index.load()
+        full = full_context_tokens(track, index)
+        out_dir = track / 'briefs'
+        out_dir.mkdir(exist_ok=True)
+        created = datetime.now().strftime('%Y-%m-%d')
+
+        units = coalesce_tasks([self.tasks[tid] for tid in task_ids]) if coalesce else \
+            [[self.tasks[tid]] for tid in task_ids]
+
+        def render_one(unit: List[Task]):
+            if len(unit) == 1:
+                task, tasks, unit = unit[0], self.tasks, None
+            else:
+                task = self.unit_task(unit)
+                tasks = {**self.tasks, task.id: task}
+            context, stats = slice_shared_context(track, task.id, tasks=tasks, index=index,
+                                                  full_tokens=full, heading_level=3)
+            rendered = template.render(self.brief_variables(task.id, created, context, unit))
+            if unit:
+                rendered = self.unit_brief(unit, rendered)
+            path = out_dir / f"{task.id}.md"
+            return path, write_if_changed(path, rendered), stats
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(render_one, units))
+        return {
+            'paths': [path for path, _, _ in results],
+            'written': sum(1 for _, written, _ in results if written),
+            'context_tokens': sum(stats['tokens'] for _, _, stats in results),
+            'saved_tokens': sum(stats['saved_tokens'] for _, _, stats in results),
+            'units': [unit_id(unit) for unit in units if len(unit) > 1],
+        }
+
+    def complete_unit(self, unit: str) -> Dict[str, List[str]]:
+        """
+        Split reports/units/<T03+T04>.md back into reports/T##.md and record the
+        outcome: tasks with a part are DONE (FAILED if it says Blocked), tasks
+        without one FAILED. Every part gets its status: parts not marked RUNNING
+        at dispatch are started first, so a failure still counts and is retried.
+
+        Returns: {'done', 'failed', 'missing'}
+        """
+        task_ids = unit.split(UNIT_SEPARATOR)
+        reports_dir = self.plan_path.parent / 'reports'
+        content = (reports_dir / UNIT_REPORTS_DIR / f"{unit}.md").read_text(encoding='utf-8')
+        parts = split_unit_report(content, task_ids)
+        result = {'done': [], 'failed': [], 'missing': [tid for tid in task_ids if tid not in parts]}
+        for task_id, part in parts.items():
+            write_if_changed(reports_dir / f"{task_id}.md", part)
+            result['failed' if _BLOCKED_RE.search(part) else 'done'].append(task_id)
+        result['failed'] += result['missing']
+        cp = self.load_latest_checkpoint()
+        pending = [tid for tid in task_ids
+                   if cp is None or (tid not in cp.running_tasks and tid not in cp.completed_tasks)]
+        mode = get_task_mode(self.tasks[task_ids[0]])
+        self.update_tasks(
+            [{'task': tid, 'status': 'RUNNING', 'mode': mode} for tid in pending] +
+            [{'task': tid, 'status': 'DONE', 'mode': mode} for tid in result['done']] +
+            [{'task': tid, 'status': 'FAILED', 'mode': mode} for tid in result['failed']]
+        )
+        return result
+
+    def result_cache(self):
+        """ResultCache for this track (result_cache.py), created on first use."""
+        if self._result_cache is None:
+            try:
+                from .result_cache import ResultCache
+            except ImportError:
+                from result_cache import ResultCache
+            self._result_cache = ResultCache(self.plan_path.parent)
+        return self._result_cache
+
+    def _input_manifests(self, updates: List[Tuple[str, str]]) -> Dict[str, Dict[str, any]]:
+        """
+        Input manifests for (task_id, status) updates: every task that finishes now
+        (what --rebuild compares against), and cacheable read-only tasks that start
+        now (their result cache key; kept on completion). Hashing happens here,
+        outside the checkpoint transaction.
+
+        A finishing write task also carries 'absorbs': fresh hashes of completed
+        tasks' touches that overlap its own, so edits made by the plan itself are
+        not mistaken for outside changes by --rebuild.
+        """
+        try:
+            from .result_cache import cacheable, paths_overlap
+        except ImportError:
+            from result_cache import cacheable, paths_overlap
+        cp = self.load_latest_checkpoint()
+        running = cp.running_tasks if cp else {}
+        completed = set(cp.completed_tasks) if cp else set()
+        recorded = cp.task_inputs if cp else {}
+        needed = {}
+        for task_id, status in updates:
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            if status in RUNNING_STATUSES and task_id not in running and cacheable(task):
+                needed[task_id] = task
+            elif (status in DONE_STATUSES and task_id not in completed
+                  and not (cacheable(task) and task_id in running and task_id in recorded)):
+                needed[task_id] = task
+        manifests = self.result_cache().manifests(needed.values())
+
+        overlaps: Dict[str, Dict[str, Set[str]]] = {}
+        for task_id, status in updates:
+            task = self.tasks.get(task_id)
+            if task_id not in manifests or status not in DONE_STATUSES or task.concurrency_class == 'read-only':
+                continue
+            for other in completed & set(recorded):
+                touches = {touch for touch in recorded[other].get('files', {})
+                           if any(paths_overlap(touch, written) for written in task.touches)}
+                if touches and other != task_id:
+                    overlaps.setdefault(task_id, {})[other] = touches
+        if overlaps:
+            digests = self.result_cache().touch_digests(
+                touch for by_task in overlaps.values() for touches in by_task.values() for touch in touches)
+            for task_id, by_task in overlaps.items():
+                manifests[task_id]['absorbs'] = {other: {touch: digests[touch] for touch in touches}
+                                                 for other, touches in by_task.items()}
+        return manifests
+
+    def _store_results(self, cp: Checkpoint, task_ids: List[str]):
+        """Store the reports of completed cacheable tasks under their input key."""
+        try:
+            from .result_cache import cacheable
+        except ImportError:
+            from result_cache import cacheable
+        cache = None
+        for task_id in task_ids:
+            manifest = cp.task_inputs.get(task_id)
+            if (manifest is None or task_id not in cp.completed_tasks or task_id not in self.tasks
+                    or not cacheable(self.tasks[task_id])):
+                continue
+            try:
+                report = (self.plan_path.parent / 'reports' / f"{task_id}.md").read_text(encoding='utf-8')
+            except FileNotFoundError:
+                continue
+            cache = cache or self.result_cache()
+            evicted = cache.store(manifest['key'], task_id, report)
+            if evicted:
+                print(f"🗑️  Result cache: evicted {len(evicted)} least recently used entr"
+                      f"{'y' if len(evicted) == 1 else 'ies'}")
+
+    def complete_from_cache(self, task_ids: Optional[List[str]] = None) -> List[str]:
+        """
+        Serve ready read-only tasks from the result cache: copy the stored report
+        to reports/T##.md and mark the task DONE, without dispatching a model.
+        Repeats while completions make more cached tasks ready.
+
+        Returns: task IDs completed from the cache, in completion order.
+        """
+        try:
+            from .result_cache import cacheable
+        except ImportError:
+            from result_cache import cacheable
+        served: List[str] = []
+        while True:
+            cp = self._load_or_init_checkpoint()
+            ready = [self.tasks[tid] for tid in self.ready_from_checkpoint(cp)
+                     if cacheable(self.tasks[tid]) and (task_ids is None or tid in task_ids)]
+            hits = {}
+            for task_id, manifest in self.result_cache().manifests(ready).items():
+                report = self.result_cache().lookup(manifest['key'])
+                if report is not None:
+                    report_path = self.plan_path.parent / 'reports' / f"{task_id}.md"
+                    report_path.parent.mkdir(parents=True, exist_ok=True)
+                    write_if_changed(report_path, report)
+                    hits[task_id] = manifest
+            if not hits:
+                break
+
+            def mutate(cp: Checkpoint) -> bool:
+                changed = [tid for tid, manifest in hits.items()
+                           if self._apply_status(cp, tid, 'DONE', inputs=manifest)]
+                if changed:
+                    cp.iteration += 1
+                return bool(changed)
+
+            _, updated = self.transact_checkpoint(mutate)
+            if not updated:
+                break
+            for task_id in hits:
+                print(f"♻️  {task_id}: inputs unchanged, served from the result cache")
+            served.extend(hits)
+
+        if served:
+            self.state_writer.schedule(self._render_latest_state)
+            self.ingest_spawn_candidates(served)
+        return served
+
+    def find_dirty_tasks(self, cp: Checkpoint) -> Tuple[Dict[str, str], Dict[str, Dict[str, any]]]:
+        """
+        Make-style invalidation: completed tasks whose recorded inputs (task
+        definition, touched-file hashes, dependency reports) differ from the
+        current ones, plus all their completed transitive dependents.
+
+        Returns: (task_id -> reason for each dirty task, current manifests of
+        completed tasks that have no recorded inputs yet)
+        """
+        try:
+            from .result_cache import manifest_changes
+        except ImportError:
+            from result_cache import manifest_changes
+        completed = [tid for tid in cp.completed_tasks if tid in self.tasks]
+        current = self.result_cache().manifests(self.tasks[tid] for tid in completed)
+        dirty: Dict[str, str] = {}
+        unrecorded = {}
+        for tid in completed:
+            if tid not in cp.task_inputs:
+                unrecorded[tid] = current[tid]
+                continue
+            changes = manifest_changes(cp.task_inputs[tid], current[tid])
+            if changes:
+                dirty[tid] = 'changed ' + '; '.join(changes)
+
+        completed_set = set(completed)
+        queue = deque(sorted(dirty))
+        while queue:
+            tid = queue.popleft()
+            for child in sorted(self._dependents.get(tid, ())):
+                if child in completed_set and child not in dirty:
+                    dirty[child] = f"upstream {tid} is dirty"
+                    queue.append(child)
+        return dirty, unrecorded
+
+    def rebuild(self, dry_run: bool = False) -> Dict[str, any]:
+        """
+        Invalidate only what changed: dirty tasks leave the completed set (and are
+        listed in cp.rebuild), so the ready queue, --continuous and work-queue
+        claims schedule just them. Completed tasks without recorded inputs get the
+        current state recorded as their baseline.
+
+        Returns: {'dirty': {tid: reason}, 'baseline': [tids], 'checked': count}
+        """
+        cp = self._load_or_init_checkpoint()
+        dirty, unrecorded = self.find_dirty_tasks(cp)
+        result = {'dirty': dirty, 'baseline': sorted(unrecorded),
+                  'checked': len([tid for tid in cp.completed_tasks if tid in self.tasks])}
+        if dry_run or not (dirty or unrecorded):
+            return result
+
+        def mutate(cp: Checkpoint) -> bool:
+            changed = False
+            for tid, manifest in unrecorded.items():
+                if tid in cp.completed_tasks and tid not in cp.task_inputs:
+                    cp.task_inputs[tid] = manifest
+                    changed = True
+            for tid, reason in dirty.items():
+                if tid in cp.completed_tasks:
+                    cp.completed_tasks.remove(tid)
+                    cp.task_inputs.pop(tid, None)
+                    cp.rebuild[tid] = reason
+                    changed = True
+            if changed:
+                cp.iteration += 1
+            return changed
+
+        _, updated = self.transact_checkpoint(mutate)
+        if updated:
+            self.state_writer.schedule(self._render_latest_state)
+        return result
+
+    def worktrees(self):
+        """WorktreeManager for this track (worktree_isolation.py), created on first use."""
+        if self._worktrees is None:
+            try:
+                from .worktree_isolation import WorktreeManager
+            except ImportError:
+                from worktree_isolation import WorktreeManager
+            self._worktrees = WorktreeManager(self.plan_path.parent)
+        return self._worktrees
+
+    def has_worktree(self, task_id: str) -> bool:
+        cp = self.load_latest_checkpoint()
+        return cp is not None and task_id in cp.isolation.get('worktrees', {})
+
+    def create_worktree(self, task_id: str) -> Dict[str, str]:
+        """Check out an isolated worktree for a task and record it. Returns {'path', 'base'}."""
+        info = self.worktrees().create(task_id)
+
+        def mutate(cp: Checkpoint) -> bool:
+            cp.isolation.setdefault('worktrees', {})[task_id] = info
+            return True
+
+        self.transact_checkpoint(mutate)
+        return info
+
+    def merge_worktrees(self, task_ids: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Merge finished tasks' worktrees into the main tree in dependency order
+        and remove them. A task with a merge conflict is taken off the running
+        list and marked serial: it becomes ready again and re-runs in the main
+        tree once its touches are free.
+
+        Returns: (merged task IDs, conflicted task IDs)
+        """
+        cp = self._load_or_init_checkpoint()
+        entries = cp.isolation.get('worktrees', {})
+        manager = self.worktrees()
+        results = []
+        for task_id in self.dependency_order(tid for tid in task_ids if tid in entries):
+            result = manager.merge(task_id, entries[task_id])
+            manager.remove(entries[task_id])
+            results.append(result)
+            if result.ok:
+                print(f"🔀 {task_id}: merged {len(result.applied)} file(s) from its worktree")
+            else:
+                print(f"⚠️  {task_id}: merge conflict in {', '.join(result.conflicts)}; "
+                      f"re-queued for a serial re-run")
+        if not results:
+            return [], []
+
+        def mutate(cp: Checkpoint) -> bool:
+            isolation = cp.isolation
+            for result in results:
+                isolation.setdefault('worktrees', {}).pop(result.task_id, None)
+                if result.ok:
+                    isolation['merged'] = isolation.get('merged', 0) + 1
+                    continue
+                isolation['conflicts'] = isolation.get('conflicts', 0) + 1
+                if result.task_id not in isolation.setdefault('serial', []):
+                    isolation['serial'].append(result.task_id)
+                cp.running_tasks.pop(result.task_id, None)
+                cp.leases.pop(result.task_id, None)
+                cp.started_at.pop(result.task_id, None)
+            cp.iteration += 1
+            return True
+
+        self.transact_checkpoint(mutate)
+        return ([r.task_id for r in results if r.ok], [r.task_id for r in results if not r.ok])
+
+    def discard_worktree(self, task_id: str):
+        """Drop a failed task's worktree; a retry starts from a fresh snapshot."""
+        cp = self.load_latest_checkpoint()
+        info = cp.isolation.get('worktrees', {}).get(task_id) if cp else None
+        if info is None:
+            return
+        self.worktrees().remove(info)
+
+        def mutate(cp: Checkpoint) -> bool:
+            return cp.isolation.get('worktrees', {}).pop(task_id, None) is not None
+
+        self.transact_checkpoint(mutate)
+
+    def _cached_section(self, name: str, key: tuple, build) -> List[str]:
+        """Return section lines, rebuilding only when the section's inputs changed."""
+        cached = self._state_sections.get(name)
+        if cached and cached[0] == key:
+            return cached[1]
+        lines = build()
+        self._state_sections[name] = (key, lines)
+        return lines
 
     def render_iosm_state(self, cp: Checkpoint) -> str:
-        """Render iosm_state.md from checkpoint data."""
-        metrics = calculate_metrics(self.tasks, cp.completed_tasks, cp.timestamp)
-        
-        # Calculate cost
-        track_cost = estimate_track_cost(self.tasks)
-        spent = 0.0
-        for tid in cp.completed_tasks:
+        """Render iosm_state.md from checkpoint data.
+
+        Each section is cached against its inputs, so a change to the Running list
+        does not recompute metrics or cost.
+        """
+        completed_key = tuple(sorted(cp.completed_tasks))
+        running_key = (tuple(cp.running_tasks.items()),
+                       tuple(cp.leases.items()),
+                       tuple(cp.speculative),
+                       tuple((e['task'], e['due']) for e in cp.retry_queue),
+                       tuple(cp.blocked.items()),
+                       cp.concurrency.get('limit'),
+                       tuple(cp.ready_since.items()))
+        plan_key = self._plan_generation
+        metrics_key = (plan_key, completed_key, cp.timestamp)
+
+        # IDs no longer in the plan (removed tasks, stray updates) are left out of every section
+        known_completed = [tid for tid in cp.completed_tasks if tid in self.tasks]
+
+        def build_metrics():
+            metrics = calculate_metrics(self.tasks, known_completed, cp.timestamp)
+            self._state_metrics = metrics
+            return [
+                "## Metrics",
+                "",
+                f"| Metric | Value |",
+                f"|--------|-------|",
+                f"| Progress | {metrics['percent']}% ({metrics['done']}/{metrics['total']}) |",
+                f"| Velocity | {metrics['velocity']} tasks/hr |",
+                f"| ETA | {metrics['eta_min']//60}h {metrics['eta_min']%60}m |",
+                "",
+                "**Progress Bar:**",
+                f"`[{render_progress_bar(metrics['percent'], 40)}]`",
+                "",
+                "---",
+                "",
+            ]
+
+        def build_cost():
+            if self._task_costs_generation != plan_key:
+                self._task_costs = {
+                    tid: estimate_task_cost(task, select_model(task))
+                    for tid, task in self.tasks.items()
+                }
+                self._task_costs_generation = plan_key
             # Use actual cost if we had it, currently using estimate
-            task = self.tasks[tid]
-            spent += estimate_task_cost(task, select_model(task))
-            
-        constraints = ResourceConstraints() # Load defaults or from config if available
-        
+            spent = sum(self._task_costs[tid] for tid in known_completed)
+            constraints = self.constraints
+            return [
+                "## Cost Tracking (v1.2)",
+                "",
+                f"| Metric | Value |",
+                f"|--------|-------|",
+                f"| Budget Total | ${constraints.cost_limit_per_track:.2f} |",
+                f"| Spent So Far | ${spent:.2f} |",
+                f"| Remaining | ${max(0, constraints.cost_limit_per_track - spent):.2f} |",
+                "",
+                "---",
+                "",
+            ]
+
+        def build_queues():
+            background = sum(1 for mode in cp.running_tasks.values() if mode == 'background')
+            controller = self.concurrency_controller(cp)
+            lines = [
+                "## Task Queues",
+                "",
+                f"**Background slots:** {background}/{controller.limit} "
+                f"(adaptive, ceiling {controller.ceiling})",
+                "",
+                "**Running:**",
+            ]
+            if cp.running_tasks:
+                for tid, mode in cp.running_tasks.items():
+                    if tid not in self.tasks:
+                        continue
+                    lease = ""
+                    if tid in cp.leases:
+                        lease = f", lease until {datetime.fromtimestamp(cp.leases[tid]).strftime('%H:%M')}"
+                    duplicate = " + speculative copy" if tid in cp.speculative else ""
+                    lines.append(f"- {tid}: {self.tasks[tid].title} ({mode}{duplicate}{lease})")
+            else:
+                lines.append("*(None)*")
+
+            if cp.retry_queue:
+                lines.append("")
+                lines.append("**Retry Queue:**")
+                for entry in cp.retry_queue:
+                    due = datetime.fromtimestamp(entry['due']).strftime('%H:%M:%S')
+                    lines.append(f"- {entry['task']}: attempt #{entry['attempt']} due {due} "
+                                 f"({entry['error_type']}, {entry['mode']}, {entry['model']})")
+
+            blocked = [tid for tid in cp.blocked if tid in self.tasks]
+            if blocked:
+                lines.append("")
+                lines.append("**Blocked (retry limit reached):**")
+                for tid in blocked:
+                    lines.append(f"- {tid}: {self.tasks[tid].title} ({cp.blocked[tid]}; "
+                                 f"fix, then --retry {tid} --reset)")
+
+            lines.append("")
+            lines.append("**Next Ready:**")
+
+            ready = [tid for tid, _ in self.prioritized_ready(cp) if tid in self.tasks]
+            for tid in ready[:5]:
+                since = cp.ready_since.get(tid)
+                waiting = f" (ready since {datetime.fromtimestamp(since).strftime('%H:%M')})" if since else ""
+                lines.append(f"- {tid}: {self.tasks[tid].title}{waiting}")
+            if len(ready) > 5:
+                lines.append(f"... and {len(ready)-5} more")
+
+            if (not ready and not cp.running_tasks and not cp.retry_queue and not blocked
+                    and len(set(known_completed)) < len(self.tasks)):
+                lines.append("*(No ready tasks - check blockers or dependencies)*")
+
+            lines.append("")
+            lines.append("---")
+            lines.append("")
+            return lines
+
+        def build_spawn():
+            try:
+                from .spawn_candidates import SPAWN_BUDGET_PER_GATE, SPAWN_BUDGET_TOTAL
+            except ImportError:
+                from spawn_candidates import SPAWN_BUDGET_PER_GATE, SPAWN_BUDGET_TOTAL
+            used = cp.spawn.get('used', {})
+            lines = [
+                "## Spawn Budget",
+                f"- spawn_budget_total: {SPAWN_BUDGET_TOTAL}",
+                f"- spawn_budget_used: {sum(used.values())}",
+                f"- spawn_budget_remaining: {cp.spawn_budget_remaining}",
+                f"- near_duplicates_skipped: {cp.spawn.get('near_duplicates', 0)}",
+                "- spawn_budget_per_gate:",
+            ]
+            for gate, budget in SPAWN_BUDGET_PER_GATE.items():
+                lines.append(f"  - {gate}: {budget} (used: {used.get(gate, 0)})")
+            deferred = cp.spawn.get('deferred', [])
+            if deferred:
+                lines.append("")
+                lines.append("**Awaiting decision** (`--approve-spawn <dedup key>`):")
+                for candidate in deferred:
+                    also = candidate.get('also_reported_by')
+                    lines.append(f"- `{candidate['dedup_key']}`: {candidate['subtask']} "
+                                 f"({candidate['severity']}, {candidate['reason']}"
+                                 f"{'; also reported by ' + ', '.join(also) if also else ''})")
+            lines.extend(["", "---", ""])
+            return lines
+
+        spawn_key = (cp.spawn_budget_remaining, tuple(sorted(cp.spawn.get('used', {}).items())),
+                     cp.spawn.get('near_duplicates', 0),
+                     tuple((c['dedup_key'], len(c.get('also_reported_by', ())))
+                           for c in cp.spawn.get('deferred', [])))
+
+        def build_result_cache():
+            stats = self.result_cache().stats()
+            return [
+                "## Result Cache",
+                f"- entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KiB)",
+                f"- hits: {stats['hits']} (tasks completed without dispatch)",
+                f"- misses: {stats['misses']} (read-only tasks run and stored)",
+                f"- hit_rate: {stats['hit_rate']:.0%}",
+                f"- evictions: {stats['evictions']}",
+                "", "---", "",
+            ]
+
+        def build_rebuild():
+            lines = [
+                "## Rebuild",
+                f"{len(cp.rebuild)} completed task(s) invalidated by `--rebuild` and queued to re-run:",
+            ]
+            for tid, reason in sorted(cp.rebuild.items()):
+                lines.append(f"- {tid}: {reason}")
+            lines.extend(["", "---", ""])
+            return lines
+
+        try:
+            index_stat = self.result_cache().index_path.stat()
+            cache_key = (index_stat.st_mtime_ns, index_stat.st_size)
+        except FileNotFoundError:
+            cache_key = None
+
+        metrics_lines = self._cached_section('metrics', metrics_key, build_metrics)
+        cost_lines = self._cached_section('cost', (plan_key, completed_key), build_cost)
+        queue_lines = self._cached_section('queues', (plan_key, completed_key, running_key), build_queues)
+        spawn_lines = self._cached_section('spawn', spawn_key, build_spawn)
+        cache_lines = self._cached_section('result_cache', cache_key, build_result_cache) if cache_key else []
+        rebuild_lines = self._cached_section('rebuild', tuple(cp.rebuild.items()), build_rebuild) if cp.rebuild else []
+
         lines = [
             f"# IOSM State вЂ” {self.plan_path.parent.name}",
             "",
             f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-            f"**Status:** {'COMPLETE' if metrics['percent'] == 100 else 'IN_PROGRESS'}",
+            f"**Status:** {'COMPLETE' if self._state_metrics['percent'] == 100 else 'IN_PROGRESS'}",
             f"**Iteration:** {cp.iteration}",
             "",
-            "## Metrics",
-            "",
-            f"| Metric | Value |",
-            f"|--------|-------|",
-            f"| Progress | {metrics['percent']}% ({metrics['done']}/{metrics['total']}) |",
-            f"| Velocity | {metrics['velocity']} tasks/hr |",
-            f"| ETA | {metrics['eta_min']//60}h {metrics['eta_min']%60}m |",
-            "",
-            "**Progress Bar:**",
-            f"`[{render_progress_bar(metrics['percent'], 40)}]`",
-            "",
-            "---",
-            "",
-            "## Cost Tracking (v1.2)",
-            "",
-            f"| Metric | Value |",
-            f"|--------|-------|",
-            f"| Budget Total | ${constraints.cost_limit_per_track:.2f} |",
-            f"| Spent So Far | ${spent:.2f} |",
-            f"| Remaining | ${max(0, constraints.cost_limit_per_track - spent):.2f} |",
-            "",
-            "---",
-            "",
-            "## Task Queues",
-            "",
-            "**Running:**",
         ]
-        
-        if cp.running_tasks:
-            for tid, mode in cp.running_tasks.items():
-                lines.append(f"- {tid}: {self.tasks[tid].title} ({mode})")
-        else:
-            lines.append("*(None)*")
-            
-        lines.append("")
-        lines.append("**Next Ready:**")
-        
-        ready = self.get_ready_tasks(set(cp.completed_tasks), set(cp.running_tasks.keys()))
-        for tid in ready[:5]:
-            lines.append(f"- {tid}: {self.tasks[tid].title}")
-        if len(ready) > 5:
-            lines.append(f"... and {len(ready)-5} more")
-            
-        if not ready and not cp.running_tasks and metrics['percent'] < 100:
-             lines.append("*(No ready tasks - check blockers or dependencies)*")
-
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+        lines.extend(metrics_lines)
+        lines.extend(cost_lines)
+        lines.extend(queue_lines)
+        lines.extend(rebuild_lines)
+        lines.extend(spawn_lines)
+        lines.extend(cache_lines)
         lines.append("**Note:** This file is auto-generated. Do not edit manually.")
         
         return "\n".join(lines)
 
-    def update_task_state(self, task_id: str, status: str):
-        """Update task status in checkpoint and regenerate state file."""
-        cp = self.load_latest_checkpoint()
-        if not cp:
-            # Init checkpoint if missing
-            state = self.reconcile_state()
-            cp = Checkpoint(
-                iteration=0,
-                timestamp=state['timestamp'],
-                completed_tasks=state['completed'],
-                running_tasks={},
-                gate_scores={},
-                spawn_budget_remaining=20,
-                seen_dedup_keys=[],
-                retry_counts={}
-            )
-            
-        status = status.upper()
+    def _render_latest_state(self) -> str:
+        """Render from the newest committed checkpoint (called under the checkpoint lock),
+        so a slower concurrent writer can never overwrite iosm_state.md with older state."""
+        return self.render_iosm_state(self._load_or_init_checkpoint())
+
+    def concurrency_controller(self, cp: Checkpoint) -> ConcurrencyController:
+        ceiling = min(self.constraints.max_parallel_background, self.constraints.max_total_parallel)
+        return ConcurrencyController(ceiling, cp.concurrency)
+
+    def effective_constraints(self, cp: Optional[Checkpoint]) -> ResourceConstraints:
+        """Configured constraints with max_parallel_background set by the AIMD controller."""
+        if cp is None:
+            return self.constraints
+        return replace(self.constraints, max_parallel_background=self.concurrency_controller(cp).limit)
+
+    def _observe_outcome(self, cp: Checkpoint, task_id: str, failed: bool,
+                         error_type: Optional[str], at: float) -> Optional[Dict[str, any]]:
+        """Feed a finished task into the concurrency controller (state kept in cp)."""
+        started = cp.started_at.pop(task_id, None)
+        latency_ratio = None
+        task = self.tasks.get(task_id)
+        if started is not None and task and not failed:
+            latency_ratio = max(0.0, at - started) / (effort_to_minutes(task.effort) * 60)
+        controller = self.concurrency_controller(cp)
+        decision = controller.observe(task_id, at, failed, error_type, latency_ratio)
+        cp.concurrency = controller.to_dict()
+        return decision
+
+    def _apply_status(self, cp: Checkpoint, task_id: str, status: str, mode: str = None,
+                      error_type: Optional[str] = None, at: float = None,
+                      inputs: Optional[Dict[str, any]] = None) -> bool:
+        """Apply one status transition to a checkpoint. Returns True if it changed.
+
+        `inputs` is the task's input manifest (see _input_manifests), recorded on
+        completion, and when a cacheable read-only task starts.
+        """
         updated = False
-        
-        if status in ['DONE', 'COMPLETE', 'SUCCESS']:
+        at = time.time() if at is None else at
+
+        if status in DONE_STATUSES:
+            if inputs is not None and task_id not in cp.completed_tasks:
+                cp.task_inputs[task_id] = {k: v for k, v in inputs.items() if k != 'absorbs'}
+                for other, files in inputs.get('absorbs', {}).items():
+                    if other in cp.task_inputs:
+                        recorded = cp.task_inputs[other]
+                        cp.task_inputs[other] = {**recorded, 'files': {**recorded['files'], **files}}
+            cp.rebuild.pop(task_id, None)
+            cp.blocked.pop(task_id, None)  # finished by hand after all
             if task_id not in cp.completed_tasks:
                 cp.completed_tasks.append(task_id)
                 updated = True
             if task_id in cp.running_tasks:
                 del cp.running_tasks[task_id]
                 updated = True
+            cp.leases.pop(task_id, None)
+            cp.speculative.pop(task_id, None)
+            if updated and task_id in cp.started_at:
+                self._observe_outcome(cp, task_id, False, None, at)
                 
-        elif status in ['RUNNING', 'IN_PROGRESS']:
+        elif status in RUNNING_STATUSES:
             # Assume background default if not specified, usually classification handles this
+            mode = mode or "background"
             if task_id not in cp.running_tasks:
-                cp.running_tasks[task_id] = "background" 
+                cp.started_at[task_id] = at
+                if inputs is not None:
+                    cp.task_inputs[task_id] = inputs
+            if cp.running_tasks.get(task_id) != mode:
+                cp.running_tasks[task_id] = mode
+                cp.leases[task_id] = at + lease_ttl(mode)
                 updated = True
                 
-        elif status in ['FAILED', 'BLOCKED']:
+        elif status in FAILED_STATUSES:
+            if task_id in cp.speculative and task_id in cp.running_tasks:
+                # One of two copies failed; the other keeps running
+                del cp.speculative[task_id]
+                return True
+            cp.leases.pop(task_id, None)
             if task_id in cp.running_tasks:
                 del cp.running_tasks[task_id]
                 updated = True
-        
-        if updated:
+                self._observe_outcome(cp, task_id, True, error_type, at)
+
+        return updated
+
+    def _update_error(self, task_id: str, status: str) -> Optional[str]:
+        """Why a status update is invalid (unknown task or status), or None."""
+        problems = []
+        if not task_id:
+            problems.append("missing 'task'")
+        elif self.tasks and task_id not in self.tasks:
+            problems.append(f"unknown task {task_id}")
+        if status not in ALL_STATUSES:
+            problems.append(f"invalid status '{status}'")
+        return '; '.join(problems) or None
+
+    def update_task_state(self, task_id: str, status: str, mode: str = None,
+                          error_type: Optional[str] = None):
+        """Update task status in checkpoint and regenerate state file."""
+        status = status.strip().upper()
+        error = self._update_error(task_id, status)
+        if error:
+            raise ValueError(error)
+        if status in FAILED_STATUSES and error_type is None:
+            error_type = self.diagnose_task_failure(task_id)
+        if status in DONE_STATUSES:
+            self._settle_speculation(task_id)
+            if self.has_worktree(task_id) and self.merge_worktrees([task_id])[1]:
+                return  # merge conflict: the task goes back to the ready queue
+        elif status in FAILED_STATUSES and self.has_worktree(task_id):
+            self.discard_worktree(task_id)
+        limit_before = None
+        inputs = self._input_manifests([(task_id, status)])
+
+        def mutate(cp: Checkpoint) -> bool:
+            nonlocal limit_before
+            limit_before = self.concurrency_controller(cp).limit
+            if not self._apply_status(cp, task_id, status, mode, error_type, inputs=inputs.get(task_id)):
+                return False
             cp.iteration += 1
-            cp.save(self.plan_path.parent / 'checkpoints' / 'latest.json')
-            
-            # Regenerate iosm_state.md
-            state_content = self.render_iosm_state(cp)
-            (self.plan_path.parent / 'iosm_state.md').write_text(state_content, encoding='utf-8')
+            return True
+
+        cp, updated = self.transact_checkpoint(mutate)
+        if updated:
+            self.state_writer.schedule(self._render_latest_state)
             print(f"вњ… Updated status for {task_id} to {status}. State regenerated.")
+            self._report_concurrency_change(cp, limit_before)
+            if status in DONE_STATUSES:
+                self._store_results(cp, [task_id])
+            if status in DONE_STATUSES and self.tasks:
+                self.ingest_spawn_candidates([task_id])
         else:
             print(f"No changes needed for {task_id}.")
 
+    def _report_concurrency_change(self, cp: Checkpoint, limit_before: Optional[int]):
+        controller = self.concurrency_controller(cp)
+        if limit_before is not None and controller.limit != limit_before and controller.decisions:
+            decision = controller.decisions[-1]
+            print(f"⚙️  Background concurrency {decision['from']} → {decision['to']} ({decision['reason']})")
+
+    def update_tasks(self, records: List[Dict[str, str]]) -> int:
+        """
+        Apply many status updates with a single checkpoint write and state render.
+
+        Each record: {"task": "T01", "status": "DONE", "mode": "background", "timestamp": "<iso>",
+        "error_type": "timeout"} (mode, timestamp and error_type optional). When every record carries a timestamp they are
+        applied in timestamp order, so a RUNNING→DONE pair for the same task lands
+        correctly regardless of input order; otherwise input order is used.
+        The batch is validated up front: one bad record rejects the whole batch.
+
+        Returns: number of records that changed state.
+        """
+        normalized = []
+        errors = []
+        for i, record in enumerate(records):
+            task_id = str(record.get('task') or record.get('task_id') or '').strip()
+            status = str(record.get('status') or '').strip().upper()
+            error = self._update_error(task_id, status)
+            if error:
+                errors.append(f"record {i}: {error}")
+            normalized.append((str(record.get('timestamp') or ''), i, task_id, status, record.get('mode'),
+                               record.get('error_type')))
+
+        if errors:
+            raise ValueError("Batch rejected: " + "; ".join(errors))
+
+        if all(ts for ts, *_ in normalized):
+            normalized.sort()
+
+        # Isolated tasks: merge finished worktrees (dependency order), drop failed ones
+        isolated = [(task_id, status) for _, _, task_id, status, _, _ in normalized if self.has_worktree(task_id)]
+        if isolated:
+            for task_id, status in isolated:
+                if status in FAILED_STATUSES:
+                    self.discard_worktree(task_id)
+            _, conflicted = self.merge_worktrees([tid for tid, status in isolated if status in DONE_STATUSES])
+            normalized = [r for r in normalized if not (r[2] in conflicted and r[3] in DONE_STATUSES)]
+
+        changed = 0
+        limit_before = None
+        inputs = self._input_manifests([(task_id, status) for _, _, task_id, status, _, _ in normalized])
+
+        def mutate(cp: Checkpoint) -> bool:
+            nonlocal changed, limit_before
+            changed = 0
+            limit_before = self.concurrency_controller(cp).limit
+            for ts, _, task_id, status, mode, error_type in normalized:
+                if self._apply_status(cp, task_id, status, mode, error_type, _epoch(ts),
+                                      inputs=inputs.get(task_id)):
+                    changed += 1
+            if changed:
+                cp.iteration += 1
+            return changed > 0
+
+        cp, _ = self.transact_checkpoint(mutate)
+        if changed:
+            self.state_writer.schedule(self._render_latest_state)
+            print(f"✅ Applied {changed}/{len(records)} status updates. State regenerated.")
+            self._report_concurrency_change(cp, limit_before)
+            finished = [task_id for _, _, task_id, status, _, _ in normalized if status in DONE_STATUSES]
+            self._store_results(cp, finished)
+            if finished and self.tasks:
+                self.ingest_spawn_candidates(finished)
+        else:
+            print(f"No changes needed for {len(records)} updates.")
+        return changed
+
+
+def benchmark_brief_rendering(planner: 'OrchestrationPlanner', count: int = 3000) -> Dict[str, float]:
+    """
+    Time `count` brief renders (tasks cycled, shared context held constant):
+    the pre-v2.2 path (template read from disk + one str.replace per variable
+    per brief) against the compiled, cached template. No files are written.
+    """
+    track = planner.plan_path.parent
+    created = datetime.now().strftime('%Y-%m-%d')
+    task_ids = list(planner.tasks)
+    variables = [planner.brief_variables(task_ids[i % len(task_ids)], created, '')
+                 for i in range(count)]
+
+    start = time.perf_counter()
+    naive = [_render_template_naive('subagent_brief.md', track, v) for v in variables]
+    naive_s = time.perf_counter() - start
+
+    _TEMPLATE_CACHE.clear()
+    start = time.perf_counter()
+    compiled = [load_compiled_template('subagent_brief.md', track).render(v) for v in variables]
+    compiled_s = time.perf_counter() - start
+
+    assert naive == compiled, "compiled template output differs"
+    return {'count': count, 'naive_ms': naive_s * 1000, 'compiled_ms': compiled_s * 1000,
+            'speedup': naive_s / compiled_s if compiled_s else float('inf')}
+
+
+def _epoch(timestamp: str) -> Optional[float]:
+    """ISO timestamp -> epoch seconds (None if missing or unparseable)."""
+    try:
+        return datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+    except ValueError:
+        return None
+
+
+def read_update_records(source: str) -> List[Dict[str, str]]:
+    """
+    Read batch update records from a file path or '-' (stdin).
+
+    Accepts a JSON array, {"updates": [...]}, or JSON Lines (one object per line).
+    """
+    text = sys.stdin.read() if source == '-' else Path(source).read_text(encoding='utf-8')
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get('updates', [data])
+    return list(data)
+
+
+def exit_invalid_plan(error: DependencyCycleError):
+    """Report a plan the scheduler cannot order (same shape as --validate) and exit 1."""
+    print("❌ Validation failed:")
+    print(f"  - {error}")
+    print("Fix the Depends on: fields in plan.md, then re-run --validate.")
+    sys.exit(1)
+
 
 def main():
     if len(sys.argv) < 2:
@@ -1433,7 +4228,12 @@ def main():
 
     plan_path = sys.argv[1]
 
-    if '--validate' in sys.argv:
+    if '--daemon' in sys.argv:
+        # Resident planner serving state operations over a Unix socket
+        from planner_daemon import serve
+        serve(plan_path)
+
+    elif '--validate' in sys.argv:
         # Just validate fields
         planner = OrchestrationPlanner(plan_path)
         planner.parse_plan()
@@ -1448,6 +4248,11 @@ def main():
             # v1.1 warnings (not blocking)
             if not task.concurrency_class or task.concurrency_class == 'write-local':
                 warnings.append(f"{tid}: using default concurrency_class='write-local'")
+        planner.build_dependency_graph()
+        try:
+            planner.find_critical_path()
+        except DependencyCycleError as e:
+            missing.append(str(e))
 
         if missing:
             print("вќЊ Validation failed:")
@@ -1473,7 +4278,10 @@ def main():
         # Generate continuous dispatch plan (v1.1)
         planner = OrchestrationPlanner(plan_path)
         output_path = Path(plan_path).parent / "continuous_dispatch_plan.md"
-        planner.generate_continuous_dispatch_plan(str(output_path))
+        try:
+            planner.generate_continuous_dispatch_plan(str(output_path))
+        except DependencyCycleError as e:
+            exit_invalid_plan(e)
         # Also generate iosm_state.md template
         iosm_state_path = Path(plan_path).parent / "iosm_state.md"
         if not iosm_state_path.exists():
@@ -1492,12 +4300,16 @@ def main():
         planner = OrchestrationPlanner(plan_path)
         planner.parse_plan()
         planner.build_dependency_graph()
-        planner.find_critical_path()
+        try:
+            planner.find_critical_path()
+        except DependencyCycleError as e:
+            exit_invalid_plan(e)
         
         # Load constraints from plan if possible (basic logic for now)
         constraints = ResourceConstraints()
+        seed = int(sys.argv[sys.argv.index('--seed') + 1]) if '--seed' in sys.argv else 42
         
-        report = generate_simulation_report(planner, constraints)
+        report = generate_simulation_report(planner, constraints, seed)
         output_path = Path(plan_path).parent / "simulation_report.md"
         output_path.write_text(report, encoding='utf-8')
         print(f"вњ… Generated simulation report: {output_path}")
@@ -1512,32 +4324,251 @@ def main():
     elif '--resume' in sys.argv:
         # Load latest checkpoint and show status
         planner = OrchestrationPlanner(plan_path)
-        cp = planner.load_latest_checkpoint()
-        if cp:
-            print(f"вњ… Loaded checkpoint from {cp.timestamp}")
-            print(f"Iteration: {cp.iteration}")
-            print(f"Completed tasks: {', '.join(cp.completed_tasks)}")
-            
-            # Recalculate ready tasks
-            planner.parse_plan()
-            ready = planner.get_ready_tasks(set(cp.completed_tasks), set())
-            print(f"Ready to dispatch: {', '.join(ready)}")
-        else:
-            print("вќЊ No checkpoint found. Reconciling from files...")
-            state = planner.reconcile_state()
-            print(f"Completed tasks: {', '.join(state['completed'])}")
+        planner.print_resume_status()
+
+    elif '--retry-cluster' in sys.argv:
+        # Fix one root cause once: retry all tasks sharing an error fingerprint
+        planner = OrchestrationPlanner(plan_path)
+        fingerprint = sys.argv[sys.argv.index('--retry-cluster') + 1]
+        if not planner.retry_cluster(fingerprint):
+            sys.exit(1)
 
     elif '--retry' in sys.argv:
-        # Record retry attempt
+        # Schedule retry per the ErrorType policy (error type from the report unless given)
         planner = OrchestrationPlanner(plan_path)
         task_id = sys.argv[sys.argv.index('--retry') + 1]
-        if planner.retry_task(task_id):
+        error_type = sys.argv[sys.argv.index('--error-type') + 1] if '--error-type' in sys.argv else None
+        if planner.retry_task(task_id, error_type, reset='--reset' in sys.argv):
             print(f"Proceeding with retry for {task_id}...")
         else:
             sys.exit(1)
 
+    elif '--heartbeat' in sys.argv:
+        # Renew a running task's lease; exit 1 tells a zombie worker it lost its lease
+        planner = OrchestrationPlanner(plan_path)
+        task_id = sys.argv[sys.argv.index('--heartbeat') + 1]
+        if not planner.heartbeat(task_id):
+            print(f"❌ {task_id} is not running (lease expired or never started)")
+            sys.exit(1)
+
+    elif '--reap' in sys.argv:
+        # Recover running tasks whose lease expired
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        if not planner.reap_expired_leases():
+            print("No expired leases.")
+
+    elif '--speculate' in sys.argv:
+        # Straggling read-only critical-path tasks: list candidates, or record a launched duplicate
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        planner.find_critical_path()
+        idx = sys.argv.index('--speculate')
+        if idx + 1 < len(sys.argv) and not sys.argv[idx + 1].startswith('--'):
+            task_id = sys.argv[idx + 1]
+            if not planner.start_speculation(task_id):
+                print(f"❌ {task_id} is not running or already has a duplicate")
+                sys.exit(1)
+            print(f"⚡ Recorded speculative copy of {task_id}. Launch it in background with report path "
+                  f"{planner.speculative_report_path(task_id)}")
+        else:
+            cp = planner.load_latest_checkpoint()
+            candidates = planner.speculation_candidates(cp) if cp else []
+            if not candidates:
+                print("No speculation candidates.")
+            for c in candidates:
+                print(f"⚡ {c['task']}: running {c['ratio']}x its expected duration ({c['basis']}); "
+                      f"launch a duplicate, then --speculate {c['task']}")
+
+    elif '--ingest-spawns' in sys.argv:
+        # Parse SpawnCandidates from completed reports (all not yet ingested, or the given tasks)
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        idx = sys.argv.index('--ingest-spawns')
+        task_ids = [arg for arg in sys.argv[idx + 1:] if not arg.startswith('--')]
+        result = planner.ingest_spawn_candidates(task_ids or None)
+        if not any(result[key] for key in ('spawned', 'duplicates', 'near_duplicates', 'deferred')):
+            print("No new SpawnCandidates.")
+        if result['stop']:
+            sys.exit(2)
+
+    elif '--approve-spawn' in sys.argv:
+        # User decision: spawn a deferred candidate (by dedup key)
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        key = sys.argv[sys.argv.index('--approve-spawn') + 1]
+        if not planner.approve_spawn(key):
+            print(f"❌ No deferred SpawnCandidate with dedup key '{key}'")
+            sys.exit(1)
+
+    elif '--rebuild' in sys.argv:
+        # Invalidate completed tasks whose inputs changed (plus dependents); --dry-run only reports
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        dry_run = '--dry-run' in sys.argv
+        result = planner.rebuild(dry_run=dry_run)
+        if result['baseline']:
+            print(f"📌 No recorded inputs for {', '.join(result['baseline'])}: "
+                  f"{'would record' if dry_run else 'recorded'} the current state as baseline")
+        if not result['dirty']:
+            print(f"✅ All {result['checked']} completed task(s) are up to date.")
+        else:
+            verb = 'Would re-run' if dry_run else 'Re-run'
+            print(f"🔁 {verb} {len(result['dirty'])} of {result['checked']} completed task(s):")
+            for tid, reason in sorted(result['dirty'].items()):
+                print(f"  - {tid}: {reason}")
+
+    elif '--worktree' in sys.argv:
+        # Isolation mode: check out a git worktree for a write task (merged back on DONE)
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        task_id = sys.argv[sys.argv.index('--worktree') + 1]
+        if task_id not in planner.tasks:
+            print(f"❌ Unknown task: {task_id}")
+            sys.exit(1)
+        cp = planner._load_or_init_checkpoint()
+        if not planner.isolatable(planner.tasks[task_id], cp):
+            print(f"❌ {task_id} runs in the main tree (not write-local, no touches, or serial after a conflict)")
+            sys.exit(1)
+        try:
+            info = planner.create_worktree(task_id)
+        except Exception as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"🌿 {task_id}: worktree at {info['path']} (base {info['base'][:10]})")
+
+    elif '--from-cache' in sys.argv:
+        # Complete ready read-only tasks whose inputs match a stored result (no dispatch)
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        idx = sys.argv.index('--from-cache')
+        task_ids = [arg for arg in sys.argv[idx + 1:] if not arg.startswith('--')]
+        served = planner.complete_from_cache(task_ids or None)
+        if not served:
+            print("No result cache hits.")
+
+    elif '--briefs' in sys.argv:
+        # Render briefs/<T##>.md for the ready queue (or the given tasks) in parallel
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        idx = sys.argv.index('--briefs')
+        task_ids = [arg for arg in sys.argv[idx + 1:] if not arg.startswith('--')]
+        unknown = [tid for tid in task_ids if tid not in planner.tasks]
+        if unknown:
+            print(f"❌ Unknown task(s): {', '.join(unknown)}")
+            sys.exit(1)
+        if not task_ids:
+            # No brief (and no dispatch) for tasks the result cache can complete
+            planner.complete_from_cache()
+        result = planner.render_briefs(task_ids or None, coalesce='--coalesce' in sys.argv)
+        if not result['paths']:
+            print("No ready tasks.")
+        else:
+            print(f"📝 Rendered {len(result['paths'])} brief(s) in briefs/ ({result['written']} changed); "
+                  f"shared context ~{result['context_tokens']} tokens, ~{result['saved_tokens']} saved")
+            for unit in result['units']:
+                print(f"🧩 {unit}: one brief, one dispatch; split with --split-report {unit}")
+
+    elif '--split-report' in sys.argv:
+        # Coalesced unit finished: split reports/units/<T03+T04>.md into per-task reports and record them
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        idx = sys.argv.index('--split-report')
+        if idx + 1 >= len(sys.argv):
+            print("Usage: --split-report T03+T04")
+            sys.exit(1)
+        unit = sys.argv[idx + 1]
+        unknown = [tid for tid in unit.split(UNIT_SEPARATOR) if tid not in planner.tasks]
+        if unknown:
+            print(f"❌ Unknown task(s): {', '.join(unknown)}")
+            sys.exit(1)
+        try:
+            result = planner.complete_unit(unit)
+        except FileNotFoundError:
+            print(f"❌ No combined report at reports/{UNIT_REPORTS_DIR}/{unit}.md")
+            sys.exit(1)
+        print(f"✂️  {unit}: {len(result['done'])} done, {len(result['failed'])} failed"
+              + (f" (no part for {', '.join(result['missing'])})" if result['missing'] else ""))
+
+    elif '--bench-briefs' in sys.argv:
+        # Brief rendering: compiled/cached templates vs per-call load + str.replace
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        idx = sys.argv.index('--bench-briefs')
+        count = int(sys.argv[idx + 1]) if idx + 1 < len(sys.argv) and sys.argv[idx + 1].isdigit() else 3000
+        bench = benchmark_brief_rendering(planner, count)
+        print(f"⏱️  {bench['count']} briefs: naive {bench['naive_ms']:.0f} ms, "
+              f"compiled {bench['compiled_ms']:.0f} ms ({bench['speedup']:.1f}x)")
+
+    elif '--preempt' in sys.argv:
+        # Critical-path tasks blocked on full background slots: list yields, or record one
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        planner.find_critical_path()
+        idx = sys.argv.index('--preempt')
+        if idx + 1 < len(sys.argv) and not sys.argv[idx + 1].startswith('--'):
+            task_id = sys.argv[idx + 1]
+            if not planner.preempt_task(task_id):
+                print(f"❌ {task_id} is not running (or has a speculative copy)")
+                sys.exit(1)
+            print(f"⏸️ {task_id} yielded its slot and is back in the ready queue; "
+                  f"re-dispatch resumes from reports/{task_id}.md")
+        else:
+            cp = planner.load_latest_checkpoint()
+            candidates = planner.preemption_candidates(cp) if cp else []
+            if not candidates:
+                print("No preemption candidates.")
+            for c in candidates:
+                print(f"⏸️ {c['victim']} (~{c['remaining']}m left) should yield to critical-path "
+                      f"{c['for']}: ask it to stop at a safe point, then --preempt {c['victim']}")
+
+    elif '--concurrency' in sys.argv:
+        # Adaptive background concurrency: current limit and recent AIMD decisions
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        cp = planner.load_latest_checkpoint()
+        if cp is None:
+            print(f"No checkpoint yet; background limit is the configured "
+                  f"{planner.constraints.max_parallel_background}.")
+        else:
+            controller = planner.concurrency_controller(cp)
+            print(f"Background limit: {controller.limit} (ceiling {controller.ceiling}, "
+                  f"congestion {controller.congestion_rate():.0%} of last {len(controller.outcomes)} outcomes)")
+            for decision in controller.decisions[-10:]:
+                print(f"  {decision['at']}  {decision['from']} → {decision['to']}  {decision['reason']}")
+
+    elif '--due-retries' in sys.argv:
+        # Drain retries whose backoff has elapsed; dispatch them with the given mode/model
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.reap_expired_leases()
+        planner.print_due_retries(planner.due_retries(), '--json' in sys.argv)
+
+    elif '--ready' in sys.argv:
+        # Ready queue in dispatch order (aged priority) with the background limit
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        planner.print_ready('--json' in sys.argv)
+
+    elif '--watch' in sys.argv and '--once' not in sys.argv:
+        # Live dashboard: redraws on changes to reports/, checkpoints/ and plan.md
+        from track_watcher import watch_track
+        fps = float(sys.argv[sys.argv.index('--fps') + 1]) if '--fps' in sys.argv else 4.0
+        watch_track(plan_path, max_fps=fps)
+
     elif '--watch' in sys.argv:
-        # Show live status dashboard
+        # Show status dashboard once (--watch --once)
         planner = OrchestrationPlanner(plan_path)
         planner.parse_plan()
         state = planner.reconcile_state()
@@ -1578,13 +4609,35 @@ def main():
             status_idx = sys.argv.index('--status')
             status = sys.argv[status_idx + 1]
             
+            mode = sys.argv[sys.argv.index('--mode') + 1] if '--mode' in sys.argv else None
+            error_type = sys.argv[sys.argv.index('--error-type') + 1] if '--error-type' in sys.argv else None
+            
+        except (ValueError, IndexError):
+            print("Usage: --update-task <TID> --status <STATUS> [--mode background|foreground] [--error-type TYPE]")
+            sys.exit(1)
+
+        planner = OrchestrationPlanner(plan_path)
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        try:
+            planner.update_task_state(task_id, status, mode, error_type)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    elif '--update-tasks' in sys.argv:
+        # Batch status update, single checkpoint write + state regeneration
+        # Usage: python script.py plan.md --update-tasks updates.json   (or '-' for stdin)
+        idx = sys.argv.index('--update-tasks')
+        source = sys.argv[idx + 1] if len(sys.argv) > idx + 1 else '-'
+        try:
+            records = read_update_records(source)
             planner = OrchestrationPlanner(plan_path)
             planner.parse_plan()
             planner.build_dependency_graph()
-            planner.update_task_state(task_id, status)
-            
-        except (ValueError, IndexError):
-            print("Usage: --update-task <TID> --status <STATUS>")
+            planner.update_tasks(records)
+        except (ValueError, OSError) as e:
+            print(f"❌ {e}")
             sys.exit(1)
 
     elif '--graph' in sys.argv:
@@ -1592,7 +4645,10 @@ def main():
         planner = OrchestrationPlanner(plan_path)
         planner.parse_plan()
         planner.build_dependency_graph()
-        planner.find_critical_path()
+        try:
+            planner.find_critical_path()
+        except DependencyCycleError as e:
+            exit_invalid_plan(e)
         
         graph = generate_mermaid_graph(planner)
         output_path = Path(plan_path).parent / "dependency_graph.mermaid"
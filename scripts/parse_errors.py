@@ -5,21 +5,24 @@ Error Parsing Module for Swarm-IOSM (v1.2)
 Parses error sections from subagent reports and generates diagnoses.
 """
 
+import codecs
+import os
 import re
 import sys
+import time
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 
 # Import error classes
 try:
-    from .errors import ErrorDiagnosis
-    from .error_patterns import diagnose_error
+    from .errors import ErrorCluster, ErrorDiagnosis, ErrorType
+    from .error_patterns import diagnose_error, diagnose_many
 except ImportError:
     # For standalone testing
     script_dir = Path(__file__).parent
     sys.path.insert(0, str(script_dir))
-    from errors import ErrorDiagnosis
-    from error_patterns import diagnose_error
+    from errors import ErrorCluster, ErrorDiagnosis, ErrorType
+    from error_patterns import diagnose_error, diagnose_many
 
 
 def parse_subagent_errors(report_path: Path, task_id: str) -> List[ErrorDiagnosis]:
@@ -40,9 +43,10 @@ def parse_subagent_errors(report_path: Path, task_id: str) -> List[ErrorDiagnosi
     except Exception:
         return []
 
-    # Find "Errors Encountered section (capture until end or next header)
+    # Find "Errors Encountered section (capture until end or next H2 header;
+    # the ### E-XX entries belong to the section)
     errors_section = re.search(
-        r'## Errors Encountered\s*\n([\s\S]*?)(?=\n##[^\n]|$)',
+        r'## Errors Encountered\s*\n([\s\S]*?)(?=\n##(?!#)|$)',
         content,
         re.DOTALL
     )
@@ -62,7 +66,7 @@ def parse_subagent_errors(report_path: Path, task_id: str) -> List[ErrorDiagnosi
         errors_list.append(error_match.start())
 
     # Now extract each error block
-    diagnoses = []
+    blocks = []
     for i, start_pos in enumerate(errors_list):
         # End position is either next error start or end of section
         end_pos = errors_list[i + 1] if i + 1 < len(errors_list) else len(section_text)
@@ -89,18 +93,193 @@ def parse_subagent_errors(report_path: Path, task_id: str) -> List[ErrorDiagnosi
         file_match = re.search(r'\*\*File:\*\*\s*`([^`]+)`', error_content)
         file = file_match.group(1) if file_match else None
 
-        # Diagnose the error
-        diagnosis = diagnose_error(error_msg, task_id)
+        blocks.append((error_msg, file))
 
-        # Override file if found
+    # Diagnose all blocks in one pass over the classifier
+    diagnoses = diagnose_many((error_msg, task_id) for error_msg, _ in blocks)
+
+    # Override file if found
+    for diagnosis, (_, file) in zip(diagnoses, blocks):
         if file:
             diagnosis.file = file
 
-        diagnoses.append(diagnosis)
-
     return diagnoses
 
 
+# ============================================================================
+# Streaming Log Ingestion (v2.2)
+# ============================================================================
+
+LOG_CHUNK_SIZE = 1 << 20      # bytes read per chunk
+MAX_LOG_LINE = 8192           # longer lines are truncated
+MAX_SPAN_LINES = 40           # longest error span handed to the classifier
+
+# Literals that open an error span. Plain substrings (no regex) so that long
+# runs of noise are skipped with one str.find per trigger per chunk.
+SPAN_TRIGGERS = (
+    'Traceback (most recent call last)', 'Error', 'Exception', 'ERROR', 'FAILED', 'FATAL',
+    'error:', 'error[', ' failed', 'ERR!', 'panic:', 'ermission denied', 'o such file',
+    'command not found', 'imed out',
+)
+
+
+class LogErrorStream:
+    """Incremental error-span detector over raw subagent output.
+
+    Text is fed in arbitrary pieces; only complete lines are examined, and
+    runs of lines without an error trigger are skipped with one regex search
+    per chunk. A span starts at a trigger line and absorbs indented
+    continuation lines; a Python traceback runs through its final exception
+    line. Memory is bounded by the chunk size, MAX_LOG_LINE and MAX_SPAN_LINES.
+    """
+
+    def __init__(self, task_id: str, include_unknown: bool = False):
+        self.task_id = task_id
+        self.include_unknown = include_unknown
+        self.line_no = 0            # complete lines consumed so far
+        self._pending = ''          # incomplete trailing line
+        self._overflow = False      # discarding the rest of an over-long line
+        self._span: List[str] = []
+        self._span_start = 0
+        self._traceback = False
+
+    def feed(self, text: str) -> List[Tuple[int, ErrorDiagnosis]]:
+        """Consume text; return (line number, diagnosis) for spans that closed."""
+        if self._overflow:
+            cut = text.find('\n')
+            if cut < 0:
+                return []
+            self._overflow = False
+            text = text[cut:]
+
+        buffer = self._pending + text
+        cut = buffer.rfind('\n')
+        if cut < 0:
+            self._pending = self._truncate(buffer)
+            return []
+        self._pending = self._truncate(buffer[cut + 1:])
+        return self._scan(buffer[:cut + 1])
+
+    def close(self) -> List[Tuple[int, ErrorDiagnosis]]:
+        """End of input: flush the trailing line and any open span."""
+        found = []
+        if self._pending:
+            found = self._scan(self._pending + '\n')
+            self._pending = ''
+        found.extend(self._close_span())
+        return found
+
+    def _truncate(self, tail: str) -> str:
+        if len(tail) > MAX_LOG_LINE:
+            self._overflow = True
+            return tail[:MAX_LOG_LINE]
+        return tail
+
+    def _scan(self, block: str) -> List[Tuple[int, ErrorDiagnosis]]:
+        found = []
+        pos, end = 0, len(block)
+        hits = {trigger: block.find(trigger) for trigger in SPAN_TRIGGERS}
+        while pos < end:
+            if not self._span:
+                first = -1
+                for trigger, at in hits.items():
+                    if 0 <= at < pos:
+                        at = hits[trigger] = block.find(trigger, pos)
+                    if at >= 0 and (first < 0 or at < first):
+                        first = at
+                if first < 0:
+                    self.line_no += block.count('\n', pos)
+                    break
+                line_start = block.rfind('\n', pos, first) + 1
+                self.line_no += block.count('\n', pos, line_start)
+                pos = line_start
+            line_end = block.find('\n', pos)
+            self.line_no += 1
+            found.extend(self._feed_line(block[pos:line_end][:MAX_LOG_LINE]))
+            pos = line_end + 1
+        return found
+
+    def _feed_line(self, line: str) -> List[Tuple[int, ErrorDiagnosis]]:
+        if self._span:
+            if self._traceback:
+                self._span.append(line)
+                if line and not line[0].isspace() and not line.startswith('Traceback'):
+                    return self._close_span()
+            elif line[:1].isspace() and line.strip():
+                self._span.append(line)
+            else:
+                found = self._close_span()
+                return found + self._feed_line(line)
+            if len(self._span) >= MAX_SPAN_LINES:
+                return self._close_span()
+            return []
+
+        if any(trigger in line for trigger in SPAN_TRIGGERS):
+            self._span = [line]
+            self._span_start = self.line_no
+            self._traceback = 'Traceback (most recent call last)' in line
+        return []
+
+    def _close_span(self) -> List[Tuple[int, ErrorDiagnosis]]:
+        if not self._span:
+            return []
+        text = '\n'.join(self._span)
+        self._span = []
+        diagnosis = diagnose_error(text, self.task_id)
+        if diagnosis.error_type == ErrorType.UNKNOWN and not self.include_unknown:
+            return []
+        return [(self._span_start, diagnosis)]
+
+
+def iter_log_chunks(log_path: Path, chunk_size: int = LOG_CHUNK_SIZE, follow: bool = False,
+                    poll_interval: float = 0.5,
+                    stop: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+    """Yield decoded text from a log in fixed-size chunks.
+
+    With follow=True, keeps polling for appended data (like `tail -f`) until
+    stop() returns True; a truncated log is re-read from the start.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(log_path, 'rb') as f:
+        while True:
+            data = f.read(chunk_size)
+            if data:
+                text = decoder.decode(data)
+                if text:
+                    yield text
+                continue
+            if not follow or (stop and stop()):
+                break
+            if os.fstat(f.fileno()).st_size < f.tell():
+                f.seek(0)
+                decoder.reset()
+            time.sleep(poll_interval)
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+
+def stream_log_errors(log_path: Path, task_id: str, follow: bool = False,
+                      chunk_size: int = LOG_CHUNK_SIZE, poll_interval: float = 0.5,
+                      stop: Optional[Callable[[], bool]] = None,
+                      include_unknown: bool = False) -> Iterator[Tuple[int, ErrorDiagnosis]]:
+    """Diagnose errors in a (possibly still growing) subagent log.
+
+    Args:
+        log_path: Path to the raw stdout/stderr log
+        task_id: Task identifier used in retry commands
+        follow: Keep reading as the log grows (until stop() is True)
+        include_unknown: Also emit spans no known pattern matched
+
+    Yields:
+        (line number where the span starts, ErrorDiagnosis) as soon as each span ends
+    """
+    stream = LogErrorStream(task_id, include_unknown)
+    for text in iter_log_chunks(log_path, chunk_size, follow, poll_interval, stop):
+        yield from stream.feed(text)
+    yield from stream.close()
+
+
 def generate_error_summary(diagnoses: List[ErrorDiagnosis], task_id: str) -> str:
     """Generate markdown summary of all errors for a task.
 
@@ -165,8 +344,39 @@ def parse_all_track_errors(track_path: Path) -> Dict[str, List[ErrorDiagnosis]]:
     return errors_by_task
 
 
+def cluster_errors(errors_by_task: Dict[str, List[ErrorDiagnosis]]) -> List[ErrorCluster]:
+    """Group diagnoses across tasks by fingerprint.
+
+    Args:
+        errors_by_task: Output of parse_all_track_errors
+
+    Returns:
+        Clusters ordered by number of affected tasks (most widespread first)
+    """
+    index: Dict[str, ErrorCluster] = {}
+    for task_id in sorted(errors_by_task.keys()):
+        for diag in errors_by_task[task_id]:
+            cluster = index.get(diag.fingerprint)
+            if cluster is None:
+                cluster = index[diag.fingerprint] = ErrorCluster(diag.fingerprint, diag)
+            if task_id not in cluster.tasks:
+                cluster.tasks.append(task_id)
+            cluster.occurrences += 1
+
+    return sorted(index.values(), key=lambda c: -len(c.tasks))
+
+
+def find_error_cluster(track_path: Path, fingerprint: str) -> Optional[ErrorCluster]:
+    """Look up a cluster by fingerprint (or unique fingerprint prefix)."""
+    matches = [
+        cluster for cluster in cluster_errors(parse_all_track_errors(track_path))
+        if cluster.fingerprint.startswith(fingerprint)
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
 def generate_track_error_summary(track_path: Path) -> str:
-    """Generate summary of all errors in a track.
+    """Generate summary of all errors in a track, one entry per root cause.
 
     Args:
         track_path: Path to track directory
@@ -179,20 +389,36 @@ def generate_track_error_summary(track_path: Path) -> str:
     if not errors_by_task:
         return "✅ No errors in track\n"
 
+    clusters = cluster_errors(errors_by_task)
+
     lines = [
         f"# Track Error Summary",
         f"**Track:** {track_path.name}",
         f"**Tasks with errors:** {len(errors_by_task)}",
         f"**Total errors:** {sum(len(d) for d in errors_by_task.values())}",
+        f"**Distinct root causes:** {len(clusters)}",
         "",
         "---",
         "",
     ]
 
-    # Sort by task ID
-    for task_id in sorted(errors_by_task.keys()):
-        diagnoses = errors_by_task[task_id]
-        lines.append(generate_error_summary(diagnoses, task_id))
+    for i, cluster in enumerate(clusters, 1):
+        diag = cluster.diagnosis
+        title = diag.error_type.value.replace('_', ' ').title()
+        lines.append(f"### {i}. {title} — {len(cluster.tasks)} task(s) (`{cluster.fingerprint}`)")
+        lines.append(f"**Tasks:** {', '.join(cluster.tasks)}")
+        if diag.file:
+            lines.append(f"**File:** `{diag.file}`")
+        lines.append(f"**Reason:** {diag.reason}")
+        lines.append("")
+        lines.append("**Suggested fixes:**")
+        for fix in diag.suggested_fixes:
+            lines.append(f"- {fix}")
+        lines.append("")
+        lines.append("**Retry:**")
+        lines.append(f"```")
+        lines.append(cluster.retry_command)
+        lines.append(f"```")
         lines.append("")
 
     return '\n'.join(lines)
@@ -202,8 +428,25 @@ def main():
     """CLI for error parsing."""
     if len(sys.argv) < 2:
         print("Usage: python parse_errors.py <report_path|track_path> [--summary]")
+        print("       python parse_errors.py --log <log_path> [--task TID] [--follow] [--all]")
         sys.exit(1)
 
+    if '--log' in sys.argv:
+        log_path = Path(sys.argv[sys.argv.index('--log') + 1])
+        if not log_path.is_file():
+            print(f"Error: Log not found: {log_path}")
+            sys.exit(1)
+        task_id = sys.argv[sys.argv.index('--task') + 1] if '--task' in sys.argv else log_path.stem.upper()
+        count = 0
+        try:
+            for line_no, diag in stream_log_errors(log_path, task_id, follow='--follow' in sys.argv,
+                                                   include_unknown='--all' in sys.argv):
+                count += 1
+                print(f"{task_id}:{line_no}: {diag.error_type.value}: {diag.reason}", flush=True)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(1 if count else 0)
+
     path = Path(sys.argv[1])
     summary_only = '--summary' in sys.argv
 
@@ -220,7 +463,7 @@ def main():
             for task_id in sorted(errors.keys()):
                 print(f"\n{task_id}:")
                 for diag in errors[task_id]:
-                    print(f"  - {diag.error_type.value}: {diag.reason}")
+                    print(f"  - {diag.error_type.value}: {diag.reason} [{diag.fingerprint}]")
     # Otherwise treat as single report
     elif path.is_file():
         task_id = path.stem.upper()
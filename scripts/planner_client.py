@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Thin client for the resident planner daemon (v2.2).
+
+Accepts the same state flags as orchestration_planner.py:
+    --update-task <TID> --status <STATUS> [--mode MODE]
+    --update-tasks <FILE|->
+    --retry <TID> [--reset]
+    --heartbeat <TID>
+    --preempt <TID>
+    --due-retries [--json]
+    --reap
+    --ready [--json]
+    --resume
+    --checkpoint [N]
+    --stop-daemon
+
+If a daemon is serving the track, the request is sent over its Unix socket
+(single-digit milliseconds). Otherwise the client execs orchestration_planner.py
+with the original arguments, so callers never need to know which path ran.
+
+Deliberately imports nothing beyond the standard library basics: the point is
+to avoid paying for module import and plan parsing on every call.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+# sockaddr_un.sun_path is 108 bytes on Linux (104 on macOS)
+MAX_SOCKET_PATH = 100
+SOCKET_NAME = 'planner.sock'
+
+
+def socket_path_for(plan_path: str) -> str:
+    """Socket location for a track: checkpoints/planner.sock, or /tmp if too long."""
+    track_dir = Path(plan_path).resolve().parent
+    path = track_dir / 'checkpoints' / SOCKET_NAME
+    if len(str(path)) <= MAX_SOCKET_PATH:
+        return str(path)
+    digest = hashlib.sha1(str(track_dir).encode('utf-8')).hexdigest()[:16]
+    return os.path.join('/tmp', f"swarm-iosm-{digest}.sock")
+
+
+def send_request(sock_path: str, request: dict, timeout: float = 30.0) -> dict:
+    """Send one JSON request line and read one JSON response line."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(sock_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        buf = b''
+        while not buf.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf.decode('utf-8'))
+
+
+def build_request(argv: list):
+    """Map CLI flags to a daemon request. Returns None for flags the daemon doesn't serve."""
+    if '--stop-daemon' in argv:
+        return {'op': 'shutdown'}
+
+    if '--update-task' in argv:
+        try:
+            task_id = argv[argv.index('--update-task') + 1]
+            status = argv[argv.index('--status') + 1]
+        except (ValueError, IndexError):
+            return None
+        request = {'op': 'update_task', 'task': task_id, 'status': status}
+        if '--mode' in argv:
+            request['mode'] = argv[argv.index('--mode') + 1]
+        if '--error-type' in argv:
+            request['error_type'] = argv[argv.index('--error-type') + 1]
+        return request
+
+    if '--update-tasks' in argv:
+        idx = argv.index('--update-tasks')
+        source = argv[idx + 1] if len(argv) > idx + 1 else '-'
+        # Same record formats as the planner; only batch updates pay for this import
+        sys.path.insert(0, str(Path(__file__).parent))
+        from orchestration_planner import read_update_records
+        return {'op': 'update_tasks', 'updates': read_update_records(source)}
+
+    if '--retry' in argv:
+        idx = argv.index('--retry')
+        if idx + 1 >= len(argv):
+            return None
+        request = {'op': 'retry', 'task': argv[idx + 1], 'reset': '--reset' in argv}
+        if '--error-type' in argv:
+            request['error_type'] = argv[argv.index('--error-type') + 1]
+        return request
+
+    if '--heartbeat' in argv:
+        idx = argv.index('--heartbeat')
+        if idx + 1 >= len(argv):
+            return None
+        return {'op': 'heartbeat', 'task': argv[idx + 1]}
+
+    if '--preempt' in argv:
+        idx = argv.index('--preempt')
+        if idx + 1 >= len(argv) or argv[idx + 1].startswith('--'):
+            return None
+        return {'op': 'preempt', 'task': argv[idx + 1]}
+
+    if '--due-retries' in argv:
+        return {'op': 'due_retries', 'json': '--json' in argv}
+
+    if '--reap' in argv:
+        return {'op': 'reap', 'verbose': True}
+
+    if '--ready' in argv:
+        return {'op': 'ready', 'json': '--json' in argv}
+
+    if '--resume' in argv:
+        return {'op': 'resume'}
+
+    if '--checkpoint' in argv:
+        idx = argv.index('--checkpoint')
+        iteration = int(argv[idx + 1]) if len(argv) > idx + 1 else 0
+        return {'op': 'checkpoint', 'iteration': iteration}
+
+    return None
+
+
+def fallback_to_planner(argv: list, request: dict = None):
+    """No daemon: run the regular planner in this process slot."""
+    if request and request['op'] == 'update_tasks':
+        # stdin is already consumed, so apply the parsed records in-process
+        sys.path.insert(0, str(Path(__file__).parent))
+        from orchestration_planner import OrchestrationPlanner
+        planner = OrchestrationPlanner(argv[1])
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        try:
+            planner.update_tasks(request['updates'])
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    planner_script = str(Path(__file__).parent / 'orchestration_planner.py')
+    os.execv(sys.executable, [sys.executable, planner_script] + argv[1:])
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python planner_client.py <path/to/plan.md> [--update-task TID --status S|--update-tasks FILE|--retry TID|--due-retries|--reap|--ready|--resume|--checkpoint N|--stop-daemon]")
+        sys.exit(1)
+
+    request = build_request(sys.argv)
+    if request is None:
+        fallback_to_planner(sys.argv)
+
+    sock_path = socket_path_for(sys.argv[1])
+    try:
+        response = send_request(sock_path, request)
+    except (FileNotFoundError, ConnectionRefusedError):
+        if request['op'] == 'shutdown':
+            print("No planner daemon running.")
+            sys.exit(0)
+        fallback_to_planner(sys.argv, request)
+
+    if response.get('output'):
+        sys.stdout.write(response['output'])
+    if not response.get('ok', False):
+        if response.get('error'):
+            print(f"Error: {response['error']}", file=sys.stderr)
+        sys.exit(response.get('exit_code', 1))
+    sys.exit(response.get('exit_code', 0))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Resident Planner Daemon for Swarm-IOSM (v2.2)
+
+Keeps one track's parsed plan, dependency graph, ready queue and checkpoint
+in memory and serves state operations over a local Unix socket.
+
+Protocol: one JSON object per line.
+    -> {"op": "update_task", "task": "T01", "status": "DONE"}
+    <- {"ok": true, "exit_code": 0, "output": "...", "ready": ["T03"]}
+
+Ops: ping, update_task, update_tasks, retry, due_retries, heartbeat, reap, preempt,
+resume, checkpoint, ready, shutdown.
+
+The checkpoint is written on every state change; iosm_state.md regeneration is
+debounced (default 250ms) so a burst of updates renders and writes it once.
+Expired running-task leases are reaped every 30s.
+Use planner_client.py (same flags as orchestration_planner.py) to talk to it.
+"""
+
+import contextlib
+import io
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    from .orchestration_planner import OrchestrationPlanner, REAP_INTERVAL_SECONDS
+    from .planner_client import socket_path_for, send_request
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from orchestration_planner import OrchestrationPlanner, REAP_INTERVAL_SECONDS
+    from planner_client import socket_path_for, send_request
+
+
+class PlannerDaemon:
+    """Serves planner state operations for a single track."""
+
+    banner = "Planner daemon"
+
+    def __init__(self, plan_path: str, socket_path: str = None, debounce: float = 0.25):
+        self.plan_path = Path(plan_path)
+        self.socket_path = socket_path or socket_path_for(plan_path)
+        self.debounce = debounce
+        self.planner: Optional[OrchestrationPlanner] = None
+        self._plan_stat: Optional[Tuple[int, int]] = None
+        self._running = False
+        self.handlers = {
+            'ping': self._op_ping,
+            'update_task': self._op_update_task,
+            'update_tasks': self._op_update_tasks,
+            'retry': self._op_retry,
+            'due_retries': self._op_due_retries,
+            'heartbeat': self._op_heartbeat,
+            'reap': self._op_reap,
+            'preempt': self._op_preempt,
+            'resume': self._op_resume,
+            'checkpoint': self._op_checkpoint,
+            'ready': self._op_ready,
+            'shutdown': self._op_shutdown,
+        }
+
+    # --- Plan cache --------------------------------------------------------
+
+    def _ensure_plan(self):
+        """(Re)parse plan.md only when it changed on disk."""
+        st = self.plan_path.stat()
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self.planner is not None and stat_key == self._plan_stat:
+            return
+
+        planner = OrchestrationPlanner(str(self.plan_path))
+        planner.parse_plan()
+        planner.build_dependency_graph()
+        planner.find_critical_path()
+        planner.state_writer.debounce = self.debounce
+        if self.planner is not None:
+            # Keep the warm checkpoint across plan edits
+            self.planner.state_writer.flush()
+            planner._checkpoint_cache = self.planner._checkpoint_cache
+        self.planner = planner
+        self._plan_stat = stat_key
+
+    def _ready_queue(self):
+        # Highest aged priority first, so callers can dispatch from the front
+        return [tid for tid, _ in self.planner.prioritized_ready(self.planner.load_latest_checkpoint())]
+
+    # --- Operations --------------------------------------------------------
+
+    def _op_ping(self, request: Dict) -> Dict:
+        return {'exit_code': 0, 'tasks': len(self.planner.tasks)}
+
+    def _op_update_task(self, request: Dict) -> Dict:
+        self.planner.update_task_state(request['task'], request['status'], request.get('mode'),
+                                       request.get('error_type'))
+        return {'exit_code': 0, 'ready': self._ready_queue()}
+
+    def _op_update_tasks(self, request: Dict) -> Dict:
+        changed = self.planner.update_tasks(request['updates'])
+        return {'exit_code': 0, 'changed': changed, 'ready': self._ready_queue()}
+
+    def _op_retry(self, request: Dict) -> Dict:
+        task_id = request['task']
+        if self.planner.retry_task(task_id, request.get('error_type'), bool(request.get('reset'))):
+            print(f"Proceeding with retry for {task_id}...")
+            return {'exit_code': 0}
+        return {'exit_code': 1}
+
+    def _op_heartbeat(self, request: Dict) -> Dict:
+        if self.planner.heartbeat(request['task']):
+            return {'exit_code': 0}
+        print(f"❌ {request['task']} is not running (lease expired or never started)")
+        return {'exit_code': 1}
+
+    def _op_reap(self, request: Dict) -> Dict:
+        reaped = self.planner.reap_expired_leases()
+        if not reaped and request.get('verbose'):
+            print("No expired leases.")
+        return {'exit_code': 0, 'reaped': [item['task'] for item in reaped]}
+
+    def _op_preempt(self, request: Dict) -> Dict:
+        if self.planner.preempt_task(request['task']):
+            return {'exit_code': 0, 'ready': self._ready_queue()}
+        print(f"❌ {request['task']} is not running (or has a speculative copy)")
+        return {'exit_code': 1}
+
+    def _op_due_retries(self, request: Dict) -> Dict:
+        self.planner.reap_expired_leases()
+        due = self.planner.due_retries()
+        self.planner.print_due_retries(due, request.get('json', False))
+        return {'exit_code': 0, 'due': due, 'ready': self._ready_queue()}
+
+    def _op_resume(self, request: Dict) -> Dict:
+        self.planner.print_resume_status()
+        return {'exit_code': 0}
+
+    def _op_checkpoint(self, request: Dict) -> Dict:
+        self.planner.save_checkpoint(int(request.get('iteration', 0)))
+        return {'exit_code': 0}
+
+    def _op_ready(self, request: Dict) -> Dict:
+        self.planner.print_ready(request.get('json', False))
+        constraints = self.planner.effective_constraints(self.planner.load_latest_checkpoint())
+        return {'exit_code': 0, 'ready': self._ready_queue(),
+                'max_parallel_background': constraints.max_parallel_background}
+
+    def _op_shutdown(self, request: Dict) -> Dict:
+        self._running = False
+        print("Planner daemon stopping.")
+        return {'exit_code': 0}
+
+    def handle(self, request: Dict) -> Dict:
+        """Run one request, capturing anything the planner prints. Errors become error responses."""
+        op = request.get('op')
+        handler = self.handlers.get(op) if isinstance(op, str) else None
+        if handler is None:
+            return {'ok': False, 'exit_code': 2, 'error': f"Unknown op: {request.get('op')!r}"}
+
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                self._ensure_plan()
+                response = handler(request)
+        except Exception as e:  # one bad request must not take the daemon down
+            return {'ok': False, 'exit_code': 1, 'error': f"{type(e).__name__}: {e}",
+                    'output': output.getvalue()}
+
+        response['ok'] = response.get('exit_code', 0) == 0
+        response['output'] = output.getvalue()
+        return response
+
+    # --- Socket server -----------------------------------------------------
+
+    def _claim_socket(self):
+        """Remove a stale socket; refuse to start if another daemon answers."""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            send_request(self.socket_path, {'op': 'ping'}, timeout=1.0)
+        except (ConnectionRefusedError, FileNotFoundError, socket.timeout, ValueError):
+            os.unlink(self.socket_path)
+            return
+        raise RuntimeError(f"A planner daemon is already serving {self.socket_path}")
+
+    def _serve_connection(self, conn: socket.socket):
+        try:
+            with conn, conn.makefile('rwb') as stream:
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line.decode('utf-8'))
+                    except ValueError as e:
+                        response = {'ok': False, 'exit_code': 2, 'error': f"Invalid JSON: {e}"}
+                    else:
+                        if isinstance(request, dict):
+                            response = self.handle(request)
+                        else:
+                            response = {'ok': False, 'exit_code': 2, 'error': "Request must be a JSON object"}
+                    stream.write(json.dumps(response).encode('utf-8') + b'\n')
+                    stream.flush()
+                    if not self._running:
+                        break
+        except OSError as e:
+            # Client went away mid-request (closed early, reset, timed out)
+            print(f"⚠️  Dropped client connection: {e}")
+            sys.stdout.flush()
+
+    def _listen(self) -> socket.socket:
+        """Bind the listening socket (owner-only Unix socket)."""
+        Path(self.socket_path).parent.mkdir(parents=True, exist_ok=True)
+        self._claim_socket()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server.listen(16)
+        return server
+
+    def _unlisten(self, server: socket.socket):
+        server.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    @property
+    def address(self) -> str:
+        return self.socket_path
+
+    def serve_forever(self):
+        self._ensure_plan()
+        server = self._listen()
+        self._running = True
+
+        def _stop(signum, frame):
+            self._running = False
+            server.close()
+
+        signal.signal(signal.SIGTERM, _stop)
+        print(f"✅ {self.banner} serving {self.plan_path.resolve().parent.name} on {self.address}")
+        sys.stdout.flush()
+
+        next_reap = time.monotonic() + REAP_INTERVAL_SECONDS
+        try:
+            # Requests are handled one at a time, so state updates never interleave
+            while self._running:
+                until_reap = max(0.0, next_reap - time.monotonic())
+                until_write = self.planner.state_writer.time_until_due()
+                timeout = until_reap if until_write is None else min(until_reap, until_write)
+                try:
+                    readable, _, _ = select.select([server], [], [], timeout)
+                except (OSError, ValueError):
+                    break
+                if not readable:
+                    if time.monotonic() >= next_reap:
+                        sys.stdout.write(self.handle({'op': 'reap'}).get('output', ''))
+                        sys.stdout.flush()
+                        next_reap = time.monotonic() + REAP_INTERVAL_SECONDS
+                    self._flush_state(due_only=True)
+                    continue
+                try:
+                    conn, _ = server.accept()
+                except OSError:
+                    break
+                self._serve_connection(conn)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                self._flush_state()
+            finally:
+                self._unlisten(server)
+
+    def _flush_state(self, due_only: bool = False):
+        """Write a pending iosm_state.md; a render error is logged, not fatal (the checkpoint is already saved)."""
+        writer = self.planner.state_writer
+        try:
+            writer.flush_if_due() if due_only else writer.flush()
+        except Exception as e:
+            print(f"⚠️  iosm_state.md not written: {type(e).__name__}: {e}")
+            sys.stdout.flush()
+
+
+def serve(plan_path: str, socket_path: str = None, debounce: float = 0.25):
+    """Run the daemon in the foreground until shutdown/SIGTERM/Ctrl-C."""
+    try:
+        PlannerDaemon(plan_path, socket_path, debounce).serve_forever()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python planner_daemon.py <path/to/plan.md> [--socket PATH] [--debounce SECONDS]")
+        sys.exit(1)
+
+    sock = sys.argv[sys.argv.index('--socket') + 1] if '--socket' in sys.argv else None
+    debounce = float(sys.argv[sys.argv.index('--debounce') + 1]) if '--debounce' in sys.argv else 0.25
+    serve(sys.argv[1], sock, debounce)
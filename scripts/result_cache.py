@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Result Cache for read-only tasks (v2.2).
+
+A read-only task's report depends only on what it was asked to do and what it
+read. Each run is keyed by a content hash of its input manifest:
+
+- task: hash of the task definition (title, role, acceptance, touches, model...)
+- files: content hash of every touched file (directories hashed recursively)
+- upstream: content hash of each dependency's report
+
+Reports of completed read-only tasks are stored under
+swarm/tracks/<id>/scratch/result_cache/ by that key. When a ready read-only
+task's key is already stored (a retry, a re-plan, an unchanged re-run), the
+planner copies the stored report into reports/ and marks the task DONE without
+dispatching a model.
+
+Read-only tasks without concrete Touches are never cached: nothing declares
+what they read, so no key can prove their inputs are unchanged.
+
+The same manifests, recorded for every completed task, drive --rebuild: a task
+whose recorded manifest no longer matches (see manifest_changes) is dirty.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .orchestration_planner import Task, checkpoint_lock, select_model, write_if_changed
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from orchestration_planner import Task, checkpoint_lock, select_model, write_if_changed
+
+CACHE_DIR = Path('scratch') / 'result_cache'
+INDEX_VERSION = 1
+
+# Eviction (least recently used first) once either limit is exceeded
+RESULT_CACHE_MAX_ENTRIES = 200
+RESULT_CACHE_MAX_BYTES = 20 * 1024 * 1024
+
+# Task fields that define what the task does; runtime fields (status, critical-path flag,
+# severity) only affect scheduling
+DEFINITION_FIELDS = ('id', 'title', 'owner_role', 'depends_on', 'touches', 'needs_user_input', 'effort',
+                     'iosm_checks', 'acceptance', 'artifacts', 'concurrency_class', 'discoveries_expected',
+                     'auto_spawn_allowed')
+
+MISSING = 'missing'
+_SKIP_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+
+def project_root(track_path: Path) -> Path:
+    """
+    Directory task Touches are relative to: $SWARM_PROJECT_ROOT, else the
+    directory holding swarm/tracks/<id>/, else the nearest git checkout
+    containing the track, else the track directory. Never the current
+    directory: the same track must hash the same files from any cwd.
+    """
+    if os.environ.get('SWARM_PROJECT_ROOT'):
+        return Path(os.environ['SWARM_PROJECT_ROOT']).resolve()
+    track_path = Path(track_path).resolve()
+    if track_path.parent.name == 'tracks' and track_path.parents[1].name == 'swarm':
+        return track_path.parents[2]
+    for parent in track_path.parents:
+        if (parent / '.git').exists():
+            return parent
+    return track_path
+
+
+def file_digest(path: Path, stat_cache: Optional[Dict[str, list]] = None) -> str:
+    """sha256 of a file, reused from stat_cache while (mtime_ns, size) is unchanged."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return MISSING
+    key = str(path)
+    cached = stat_cache.get(key) if stat_cache is not None else None
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    value = digest.hexdigest()
+    if stat_cache is not None:
+        stat_cache[key] = [stat.st_mtime_ns, stat.st_size, value]
+    return value
+
+
+def touch_digest(root: Path, touch: str, stat_cache: Optional[Dict[str, list]] = None) -> str:
+    """Content hash of one Touches entry: a file, a directory (recursive) or a glob."""
+    touch = touch.strip().strip('`')
+    if any(ch in touch for ch in '*?['):
+        paths = sorted(p for p in root.glob(touch) if p.is_file())
+    else:
+        path = root / touch
+        if path.is_file():
+            return file_digest(path, stat_cache)
+        if not path.is_dir():
+            return MISSING
+        paths = sorted(p for p in path.rglob('*')
+                       if p.is_file() and not _SKIP_DIRS & set(p.relative_to(path).parts))
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(f"{path.relative_to(root).as_posix()}\0{file_digest(path, stat_cache)}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def definition_hash(task: Task) -> str:
+    """Hash of the fields that define the task, plus the model it would run on."""
+    definition = {name: getattr(task, name) for name in DEFINITION_FIELDS}
+    definition['model'] = select_model(task)
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def input_manifest(task: Task, track_path: Path, root: Optional[Path] = None,
+                   stat_cache: Optional[Dict[str, list]] = None) -> Dict[str, any]:
+    """
+    Inputs a task sees at this moment: {'key', 'task', 'files': {touch: hash},
+    'upstream': {dep: report hash}}. 'key' is the hash of the other three.
+    """
+    track_path = Path(track_path)
+    root = root or project_root(track_path)
+    manifest = {
+        'task': definition_hash(task),
+        'files': {touch: touch_digest(root, touch, stat_cache) for touch in task.touches},
+        'upstream': {dep: file_digest(track_path / 'reports' / f"{dep}.md", stat_cache)
+                     for dep in task.depends_on},
+    }
+    manifest['key'] = manifest_key(manifest)
+    return manifest
+
+
+def manifest_key(manifest: Dict[str, any]) -> str:
+    parts = {name: manifest[name] for name in ('task', 'files', 'upstream')}
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def manifest_changes(recorded: Dict[str, any], current: Dict[str, any]) -> List[str]:
+    """What differs between a recorded and a current manifest, e.g. ['files: backend/api/']."""
+    changes = []
+    if recorded.get('task') != current['task']:
+        changes.append('task definition')
+    for part in ('files', 'upstream'):
+        old, new = recorded.get(part, {}), current[part]
+        changed = sorted(name for name in set(old) | set(new) if old.get(name) != new.get(name))
+        if changed:
+            changes.append(f"{part}: {', '.join(changed)}")
+    return changes
+
+
+def paths_overlap(a: str, b: str) -> bool:
+    """Same path, or one inside the other (globs compare by their literal prefix)."""
+    a, b = (re.split(r'[*?\[]', p.strip().strip('`'), maxsplit=1)[0].strip('/') for p in (a, b))
+    return not a or not b or a == b or a.startswith(b + '/') or b.startswith(a + '/')
+
+
+def cacheable(task: Task) -> bool:
+    """Read-only tasks that declare what they read."""
+    return task.concurrency_class == 'read-only' and bool(task.touches)
+
+
+class ResultCache:
+    """
+    Content-addressed report store in <track>/scratch/result_cache/.
+
+    objects/<key>.md holds a stored report; index.json holds per-entry metadata
+    (task, size, last use), hit/miss/eviction counters and the file-hash stat
+    cache. Every read-modify-write of the index runs under its file lock.
+    """
+
+    def __init__(self, track_path: Path, max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        self.track_path = Path(track_path)
+        self.path = self.track_path / CACHE_DIR
+        self.index_path = self.path / 'index.json'
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def _object_path(self, key: str) -> Path:
+        return self.path / 'objects' / f"{key}.md"
+
+    def load(self) -> Dict[str, any]:
+        try:
+            data = json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        if data.get('version') != INDEX_VERSION:
+            data = {'version': INDEX_VERSION, 'entries': {}, 'stats': {}, 'files': {}}
+        for name in ('entries', 'stats', 'files'):
+            data.setdefault(name, {})
+        return data
+
+    def _save(self, data: Dict[str, any]):
+        write_if_changed(self.index_path, json.dumps(data, indent=2, sort_keys=True) + '\n')
+
+    def manifests(self, tasks: Iterable[Task]) -> Dict[str, Dict[str, any]]:
+        """Input manifests for several tasks, sharing (and persisting) the stat cache."""
+        tasks = list(tasks)
+        if not tasks:
+            return {}
+        root = project_root(self.track_path)
+        with checkpoint_lock(self.index_path):
+            data = self.load()
+            stat_cache = data['files']
+            manifests = {task.id: input_manifest(task, self.track_path, root, stat_cache) for task in tasks}
+            self._save(data)
+        return manifests
+
+    def touch_digests(self, touches: Iterable[str]) -> Dict[str, str]:
+        """Current content hash of each Touches entry."""
+        touches = set(touches)
+        if not touches:
+            return {}
+        root = project_root(self.track_path)
+        with checkpoint_lock(self.index_path):
+            data = self.load()
+            digests = {touch: touch_digest(root, touch, data['files']) for touch in touches}
+            self._save(data)
+        return digests
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Stored report for key (counted as a hit), or None."""
+        with checkpoint_lock(self.index_path):
+            data = self.load()
+            entry = data['entries'].get(key)
+            if entry is None:
+                return None
+            try:
+                report = self._object_path(key).read_text(encoding='utf-8')
+            except FileNotFoundError:
+                del data['entries'][key]
+                self._save(data)
+                return None
+            entry['last_used'] = time.time()
+            entry['hits'] = entry.get('hits', 0) + 1
+            data['stats']['hits'] = data['stats'].get('hits', 0) + 1
+            self._save(data)
+        return report
+
+    def store(self, key: str, task_id: str, report: str) -> List[str]:
+        """
+        Store a report that was produced by running the task (counted as a miss).
+        Returns the keys evicted to stay within the entry and size limits.
+        """
+        with checkpoint_lock(self.index_path):
+            data = self.load()
+            if key in data['entries'] and self._object_path(key).exists():
+                # Same inputs already stored (e.g. the completion was recorded twice)
+                data['entries'][key]['last_used'] = time.time()
+                self._save(data)
+                return []
+            object_path = self._object_path(key)
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(object_path, report)
+            now = time.time()
+            data['entries'][key] = {'task': task_id, 'size': len(report.encode('utf-8')),
+                                    'created': now, 'last_used': now, 'hits': 0}
+            data['stats']['misses'] = data['stats'].get('misses', 0) + 1
+            evicted = self._evict(data, keep=key)
+            self._save(data)
+        return evicted
+
+    def _evict(self, data: Dict[str, any], keep: str) -> List[str]:
+        entries = data['entries']
+        total = sum(entry['size'] for entry in entries.values())
+        evicted = []
+        for key in sorted(entries, key=lambda k: entries[k]['last_used']):
+            if len(entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entries.pop(key)['size']
+            self._object_path(key).unlink(missing_ok=True)
+            evicted.append(key)
+        data['stats']['evictions'] = data['stats'].get('evictions', 0) + len(evicted)
+        # Drop stat-cache rows for files that no longer exist
+        data['files'] = {path: row for path, row in data['files'].items() if os.path.exists(path)}
+        return evicted
+
+    def stats(self) -> Dict[str, any]:
+        data = self.load()
+        stats = data['stats']
+        hits, misses = stats.get('hits', 0), stats.get('misses', 0)
+        return {
+            'entries': len(data['entries']),
+            'bytes': sum(entry['size'] for entry in data['entries'].values()),
+            'hits': hits,
+            'misses': misses,
+            'evictions': stats.get('evictions', 0),
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python result_cache.py <swarm/tracks/<id>> [--clear]")
+        sys.exit(1)
+
+    cache = ResultCache(Path(sys.argv[1]))
+    if '--clear' in sys.argv:
+        import shutil
+        shutil.rmtree(cache.path, ignore_errors=True)
+        print(f"🗑️  Cleared {cache.path}")
+        sys.exit(0)
+
+    stats = cache.stats()
+    print(f"Result cache: {stats['entries']} entries, {stats['bytes'] / 1024:.1f} KiB")
+    print(f"  hits: {stats['hits']}  misses: {stats['misses']}  evictions: {stats['evictions']}  "
+          f"hit rate: {stats['hit_rate']:.0%}")
+    for key, entry in sorted(cache.load()['entries'].items(), key=lambda item: -item[1]['last_used']):
+        print(f"  {key[:12]}  {entry['task']:<6} {entry['size']:>7} B  hits {entry['hits']}")
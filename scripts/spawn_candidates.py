@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+SpawnCandidates parsing for Swarm-IOSM (v2.2)
+
+Reads the `## SpawnCandidates` table from subagent reports and turns each row
+into a SpawnCandidate with a normalized dedup key and the IOSM gate it serves.
+Budget, severity and dedup decisions are made by the planner
+(OrchestrationPlanner.ingest_spawn_candidates), which owns the checkpoint.
+
+Near-duplicates (same work, different key or wording) are found with MinHash
+signatures over title, acceptance criteria and touches, indexed by LSH bands.
+"""
+
+import hashlib
+import random
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# Spawn Protection (SKILL.md, v1.1.1)
+SPAWN_BUDGET_TOTAL = 20
+SPAWN_BUDGET_PER_GATE = {'Gate-I': 5, 'Gate-O': 8, 'Gate-M': 4, 'Gate-S': 3}
+SEVERITIES = ('low', 'medium', 'high', 'critical')
+
+# Intent keyword prefixes -> (intent category, gate); first match wins
+INTENT_RULES = [
+    (('test', 'flaky', 'coverage'), 'tests', 'Gate-O'),
+    (('doc', 'readme', 'comment', 'contract', 'spec'), 'docs', 'Gate-I'),
+    (('optimi', 'perf', 'latency', 'cach', 'n+1', 'query', 'slow'), 'perf', 'Gate-O'),
+    (('circular', 'boundar', 'module', 'decouple', 'interface', 'import'), 'boundaries', 'Gate-M'),
+    (('remove', 'delete', 'dead code', 'simplif', 'shrink', 'unused'), 'shrink', 'Gate-S'),
+    (('type', 'annotat', 'mypy'), 'type-annot', 'Gate-I'),
+    (('rename', 'naming', 'clarity', 'duplicat', 'refactor', 'cleanup'), 'clarity', 'Gate-I'),
+    (('fix', 'bug', 'error', 'crash'), 'fix', 'Gate-O'),
+]
+
+# Near-duplicate detection: 32 MinHash values in 8 LSH bands of 4. Two candidates
+# share a band (and get compared) with probability 1-(1-J^4)^8: ~0.9 at J=0.6.
+MINHASH_PERMUTATIONS = 32
+LSH_BANDS = 8
+NEAR_DUPLICATE_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_PERMUTATIONS = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(_MERSENNE_PRIME))
+                 for rng in [random.Random(1511)] for _ in range(MINHASH_PERMUTATIONS)]
+_STOPWORDS = {'a', 'an', 'and', 'the', 'of', 'in', 'on', 'for', 'to', 'with', 'by', 'is', 'are', 'be', 'all', 'from'}
+
+_SECTION_RE = re.compile(r'^##\s+SpawnCandidates\b.*?$(.*?)(?=^##(?!#)|\Z)', re.MULTILINE | re.DOTALL)
+_NONE_VALUES = {'', '-', 'n/a', 'none', 'none identified', 'none identified.'}
+
+
+@dataclass
+class SpawnCandidate:
+    """One row of a report's SpawnCandidates table."""
+    candidate_id: str
+    subtask: str
+    touches: List[str]
+    effort: str
+    needs_user_input: bool
+    severity: str
+    dedup_key: str
+    gate: str
+    accept_criteria: str
+    source_task: str
+
+
+def normalize_dedup_key(key: str) -> str:
+    """Case/backtick/whitespace-insensitive key: '`Backend/Auth.py | Type-Annot`' -> 'backend/auth.py|type-annot'."""
+    parts = [re.sub(r'\s+', '-', part.strip().strip('`').strip().lower()) for part in key.split('|')]
+    return '|'.join(part for part in parts if part)
+
+
+def classify_intent(subtask: str) -> Tuple[str, str]:
+    """(intent category, gate) for a candidate description."""
+    text = subtask.lower()
+    for keywords, intent, gate in INTENT_RULES:
+        # Keywords match at word starts: 'spec' hits "spec"/"specify", not "aspects"
+        if any(re.search(r'(?<![a-z0-9])' + re.escape(keyword), text) for keyword in keywords):
+            return intent, gate
+    slug = '-'.join(re.findall(r'[a-z0-9]+', text)[:2]) or 'misc'
+    return slug, 'Gate-I'
+
+
+def _split_row(line: str) -> List[str]:
+    # Split on pipes that are not inside backticks (dedup keys contain '|')
+    cells, current, in_code = [], [], False
+    for ch in line.strip().strip('|'):
+        if ch == '`':
+            in_code = not in_code
+        if ch == '|' and not in_code:
+            cells.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    cells.append(''.join(current).strip())
+    return cells
+
+
+def parse_spawn_candidates(report_text: str, source_task: str) -> List[SpawnCandidate]:
+    """Parse the SpawnCandidates table(s) of one report (any column order, optional columns)."""
+    candidates: List[SpawnCandidate] = []
+    for match in _SECTION_RE.finditer(report_text):
+        candidates.extend(_parse_table(match.group(1), source_task, len(candidates)))
+    return candidates
+
+
+def _parse_table(section: str, source_task: str, offset: int) -> List[SpawnCandidate]:
+    rows = [line for line in section.splitlines() if line.strip().startswith('|')]
+    if len(rows) < 2:
+        return []
+    header = [cell.lower() for cell in _split_row(rows[0])]
+    column = {name: i for i, name in enumerate(header)}
+
+    def cell(cells: List[str], *names: str) -> str:
+        for name in names:
+            if name in column and column[name] < len(cells):
+                return cells[column[name]]
+        return ''
+
+    candidates = []
+    for row in rows[1:]:
+        cells = _split_row(row)
+        if all(set(c) <= set('-: ') for c in cells):
+            continue  # separator row
+        extra = len(cells) - len(header)
+        key_column = column.get('dedup key', column.get('dedup_key'))
+        if extra > 0 and key_column is not None:
+            # Unquoted dedup key (auth.py|type-annot) split into extra cells
+            cells[key_column:key_column + extra + 1] = ['|'.join(cells[key_column:key_column + extra + 1])]
+        subtask = cell(cells, 'subtask', 'title', 'description')
+        if subtask.strip().lower() in _NONE_VALUES or subtask.startswith('['):
+            continue  # "None identified" or template placeholder
+
+        touches_text = cell(cells, 'touches')
+        touches = [t.strip().strip('`').strip() for t in touches_text.split(',')]
+        touches = [t for t in touches if t and t.lower() not in _NONE_VALUES and 'read-only' not in t.lower()]
+        severity = cell(cells, 'severity').lower().strip('`')
+        severity = severity if severity in SEVERITIES else 'medium'
+        intent, gate = classify_intent(subtask)
+        explicit_gate = cell(cells, 'gate')
+        if explicit_gate:
+            gate = explicit_gate if explicit_gate.startswith('Gate-') else f"Gate-{explicit_gate.upper()}"
+
+        key = cell(cells, 'dedup key', 'dedup_key')
+        if not key or key.strip('`').lower() in _NONE_VALUES:
+            primary = Path(touches[0]).name if touches else 'read-only'
+            key = f"{primary}|{intent}"
+
+        candidates.append(SpawnCandidate(
+            candidate_id=cell(cells, 'id') or f"SC-{offset + len(candidates) + 1:02d}",
+            subtask=subtask,
+            touches=touches,
+            effort=cell(cells, 'effort').strip('`') or 'M',
+            needs_user_input=cell(cells, 'user input', 'needs user input').lower().strip('`') in ('true', 'yes', '1'),
+            severity=severity,
+            dedup_key=normalize_dedup_key(key),
+            gate=gate,
+            accept_criteria=cell(cells, 'accept criteria', 'acceptance'),
+            source_task=source_task,
+        ))
+    return candidates
+
+
+def _stem(word: str) -> str:
+    # Crude suffix stripping so 'caching'/'cache', 'errors'/'error' match
+    for suffix in ('ing', 'ed', 'es', 's', 'e'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def candidate_features(candidate: SpawnCandidate) -> Set[str]:
+    """Word and word-pair shingles of subtask + acceptance criteria, plus touched file names."""
+    words = [_stem(w) for w in re.findall(r'[a-z0-9_]+', f"{candidate.subtask} {candidate.accept_criteria}".lower())
+             if w not in _STOPWORDS]
+    features = set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+    features |= {f"file:{Path(touch).name.lower()}" for touch in candidate.touches}
+    return features
+
+
+def minhash_signature(features: Set[str]) -> str:
+    """MinHash signature as a hex string (8 hex digits per permutation)."""
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'big')
+              for f in features] or [0]
+    return ''.join(f"{min((a * h + b) % _MERSENNE_PRIME for h in hashes) & 0xFFFFFFFF:08x}"
+                   for a, b in _PERMUTATIONS)
+
+
+def signature_similarity(a: str, b: str) -> float:
+    """Estimated Jaccard similarity: share of matching MinHash values."""
+    values = len(a) // 8
+    return sum(a[i:i + 8] == b[i:i + 8] for i in range(0, len(a), 8)) / values if values else 0.0
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures.
+
+    A query only compares against signatures sharing at least one band, so its
+    cost follows the number of similar candidates rather than the seen-set size.
+    """
+
+    def __init__(self, bands: int = LSH_BANDS, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.band_width = MINHASH_PERMUTATIONS // bands * 8
+        self.threshold = threshold
+        self.signatures: Dict[str, str] = {}
+        self._buckets: Dict[Tuple[int, str], List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.signatures
+
+    def _bands(self, signature: str):
+        width = self.band_width
+        return ((i, signature[i:i + width]) for i in range(0, len(signature), width))
+
+    def add(self, key: str, signature: str):
+        if key in self.signatures:
+            return
+        self.signatures[key] = signature
+        for band in self._bands(signature):
+            self._buckets.setdefault(band, []).append(key)
+
+    def query(self, signature: str) -> Optional[Tuple[str, float]]:
+        """Most similar indexed key at or above the threshold, with its similarity."""
+        candidates = {key for band in self._bands(signature) for key in self._buckets.get(band, ())}
+        best = max(((key, signature_similarity(signature, self.signatures[key])) for key in candidates),
+                   key=lambda match: match[1], default=None)
+        return best if best and best[1] >= self.threshold else None
+
+
+def parse_report_candidates(report_path: Path, source_task: Optional[str] = None) -> List[SpawnCandidate]:
+    """Candidates from a report file ([] if the report does not exist)."""
+    report_path = Path(report_path)
+    try:
+        text = report_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return []
+    return parse_spawn_candidates(text, source_task or report_path.stem)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python spawn_candidates.py <reports/T##.md> [...]")
+        sys.exit(1)
+
+    index = NearDuplicateIndex()
+    for path in sys.argv[1:]:
+        for c in parse_report_candidates(Path(path)):
+            flags = ', '.join(f for f in (c.severity, c.gate, 'user input' if c.needs_user_input else '') if f)
+            print(f"{c.source_task}/{c.candidate_id}: {c.subtask} [{c.dedup_key}] ({flags})")
+            signature = minhash_signature(candidate_features(c))
+            match = index.query(signature)
+            if match and match[0] != c.dedup_key:
+                print(f"    ≈ near-duplicate of [{match[0]}] (similarity {match[1]:.2f})")
+            index.add(c.dedup_key, signature)
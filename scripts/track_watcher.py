@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Live Track Watcher for Swarm-IOSM (v2.2)
+
+Keeps a track dashboard up to date while subagents run:
+- Subscribes to reports/, checkpoints/ and plan.md (inotify, polling fallback)
+- Re-reads only the files that changed
+- Redraws only the rows that changed, at a bounded frame rate
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+try:
+    from .orchestration_planner import (
+        Checkpoint, OrchestrationPlanner, calculate_metrics,
+        render_progress_bar, report_is_complete,
+    )
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from orchestration_planner import (
+        Checkpoint, OrchestrationPlanner, calculate_metrics,
+        render_progress_bar, report_is_complete,
+    )
+
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+WATCHED_SUBDIRS = ('reports', 'checkpoints')
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Blocks on inotify events for a track directory (Linux only)."""
+
+    def __init__(self, track_dir: Path):
+        self.track_dir = Path(track_dir)
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        self._add_watch(self.track_dir)
+        for name in WATCHED_SUBDIRS:
+            if (self.track_dir / name).is_dir():
+                self._add_watch(self.track_dir / name)
+
+    def _add_watch(self, path: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Block until something changes (or timeout). Returns changed paths."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            path = parent / name
+
+            # Subdirectories created after startup (first report, first checkpoint)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and parent == self.track_dir and name in WATCHED_SUBDIRS:
+                    self._add_watch(path)
+                    changed.add(path)
+                continue
+            changed.add(path)
+
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback: compares mtimes of watched files every `interval` seconds."""
+
+    def __init__(self, track_dir: Path, interval: float = 1.0):
+        self.track_dir = Path(track_dir)
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        candidates = [self.track_dir / 'plan.md']
+        for name in WATCHED_SUBDIRS:
+            subdir = self.track_dir / name
+            if subdir.is_dir():
+                candidates.extend(entry for entry in subdir.iterdir() if entry.is_file())
+        for path in candidates:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout: Optional[float]) -> Set[Path]:
+        """Poll until something changes (or timeout). Returns changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = self._scan()
+            changed = {
+                path for path in set(current) | set(self._snapshot)
+                if current.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = current
+            if changed:
+                return changed
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def open_watcher(track_dir: Path, poll_interval: float = 1.0):
+    """Return an inotify watcher when available, otherwise a polling watcher."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(track_dir)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(track_dir, poll_interval)
+
+
+class LiveDashboard:
+    """Incrementally maintained dashboard state for a single track."""
+
+    def __init__(self, planner: OrchestrationPlanner, stream: TextIO = None, max_fps: float = 4.0):
+        self.planner = planner
+        self.track_dir = planner.plan_path.parent
+        self.stream = stream or sys.stdout
+        self.min_frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+        self.report_done: Dict[str, bool] = {}  # task id -> report says Complete
+        self.checkpoint: Optional[Checkpoint] = None
+        self.start_time = datetime.now().isoformat()
+        self.serial_min = 0
+
+        self._rows: Dict[str, str] = {}
+        self._frame: List[str] = []
+        self._last_draw = 0.0
+        self._interactive = hasattr(self.stream, 'isatty') and self.stream.isatty()
+
+    # --- State maintenance -------------------------------------------------
+
+    def load(self):
+        """Initial full load."""
+        self._reload_plan()
+        reports_dir = self.track_dir / 'reports'
+        if reports_dir.exists():
+            for report in reports_dir.glob('T*.md'):
+                self._reload_report(report)
+        self._reload_checkpoint()
+        self._rebuild_rows()
+
+    def apply_changes(self, changed: Set[Path]) -> bool:
+        """Re-read only the changed inputs. Returns True if anything visible changed."""
+        plan_changed = False
+        dirty_tasks: Set[str] = set()
+
+        for path in changed:
+            if path.name == self.planner.plan_path.name and path.parent.name not in WATCHED_SUBDIRS:
+                plan_changed = True
+            elif path.parent.name == 'reports' and path.name.startswith('T') and path.suffix == '.md':
+                dirty_tasks.update(self._reload_report(path))
+            elif path.name == 'reports':
+                for report in path.glob('T*.md'):
+                    dirty_tasks.update(self._reload_report(report))
+            elif path.name in ('latest.json', 'checkpoints'):
+                dirty_tasks.update(self._reload_checkpoint())
+
+        if plan_changed:
+            self._reload_plan()
+            self._rebuild_rows()
+            return True
+
+        completed = self.completed()
+        for tid in dirty_tasks:
+            if tid in self.planner.tasks:
+                self._rows[tid] = self._render_row(tid, completed)
+        return bool(dirty_tasks)
+
+    def _reload_plan(self):
+        self.planner.tasks = {}
+        self.planner.graph = {}
+        self.planner.parse_plan()
+        self.serial_min, _ = self.planner.estimate_times()
+
+    def _reload_report(self, path: Path) -> Set[str]:
+        tid = path.stem.upper()
+        try:
+            done = report_is_complete(path.read_text(encoding='utf-8'))
+        except (OSError, UnicodeDecodeError):
+            done = False  # Deleted or mid-write; next event will correct it
+        if self.report_done.get(tid) == done:
+            return set()
+        self.report_done[tid] = done
+        return {tid}
+
+    def _reload_checkpoint(self) -> Set[str]:
+        old_running = set(self.checkpoint.running_tasks) if self.checkpoint else set()
+        old_done = set(self.checkpoint.completed_tasks) if self.checkpoint else set()
+        try:
+            self.checkpoint = self.planner.load_latest_checkpoint()
+        except (OSError, ValueError, TypeError):
+            return set()  # Partially written checkpoint; wait for the next event
+        if self.checkpoint:
+            self.start_time = self.checkpoint.timestamp
+            new_running = set(self.checkpoint.running_tasks)
+            new_done = set(self.checkpoint.completed_tasks)
+        else:
+            new_running, new_done = set(), set()
+        return (old_running ^ new_running) | (old_done ^ new_done)
+
+    # --- Rendering ---------------------------------------------------------
+
+    def completed(self) -> Set[str]:
+        done = {tid for tid, is_done in self.report_done.items() if is_done}
+        if self.checkpoint:
+            done.update(self.checkpoint.completed_tasks)
+        for tid, task in self.planner.tasks.items():
+            if task.status.upper() in ['DONE', 'COMPLETE']:
+                done.add(tid)
+        return done & set(self.planner.tasks)
+
+    def _render_row(self, tid: str, completed: Set[str]) -> str:
+        running = self.checkpoint.running_tasks if self.checkpoint else {}
+        if tid in completed:
+            status = "✅"
+        elif tid in running:
+            status = "🔄"
+        else:
+            status = "⏳"
+        return f"{status} {tid}: {self.planner.tasks[tid].title[:40]}"
+
+    def _rebuild_rows(self):
+        completed = self.completed()
+        self._rows = {tid: self._render_row(tid, completed) for tid in self.planner.tasks}
+
+    def render_lines(self) -> List[str]:
+        """Compose the full frame from cached rows and fresh metrics."""
+        metrics = calculate_metrics(self.planner.tasks, sorted(self.completed()), self.start_time)
+        elapsed_min = (datetime.now() - datetime.fromisoformat(self.start_time)).total_seconds() / 60
+        efficiency = (self.serial_min / elapsed_min) if elapsed_min > 1 else 1.0
+
+        lines = [
+            f"📊 Swarm-IOSM Live Dashboard — {self.track_dir.name}",
+            '=' * 60,
+            f"Progress: {render_progress_bar(metrics['percent'])} {metrics['percent']}%",
+            f"Tasks:    {metrics['done']} / {metrics['total']} complete",
+            f"Velocity: {metrics['velocity']} tasks/hour",
+            f"Efficiency: {efficiency:.1f}x (parallel speedup)",
+            (f"ETA:      {metrics['eta_min']//60}h {metrics['eta_min']%60}m remaining"
+             if metrics['eta_min'] > 0 else "ETA:      calculating..."),
+            '-' * 60,
+        ]
+        lines.extend(self._rows[tid] for tid in sorted(self._rows))
+        lines.append('=' * 60)
+        return lines
+
+    def draw(self, force: bool = False):
+        """Redraw changed lines only (full frame on non-interactive streams)."""
+        frame = self.render_lines()
+        if frame == self._frame and not force:
+            return
+
+        if not self._interactive:
+            self.stream.write('\n' + '\n'.join(frame) + '\n')
+        elif force or len(frame) != len(self._frame):
+            self.stream.write('\x1b[H\x1b[2J' + '\n'.join(frame) + '\n')
+        else:
+            out = []
+            for row, (old, new) in enumerate(zip(self._frame, frame), 1):
+                if old != new:
+                    out.append(f"\x1b[{row};1H{new}\x1b[K")
+            out.append(f"\x1b[{len(frame) + 1};1H")
+            self.stream.write(''.join(out))
+
+        self.stream.flush()
+        self._frame = frame
+        self._last_draw = time.monotonic()
+
+    def run(self, watcher, tick: float = 30.0):
+        """Event loop: block on the watcher, coalesce bursts, redraw at most max_fps."""
+        self.load()
+        self.draw(force=True)
+        pending = False
+        last_tick = time.monotonic()
+
+        while True:
+            now = time.monotonic()
+            if pending:
+                # Changes are waiting for the next frame slot
+                timeout = max(0.0, self._last_draw + self.min_frame_interval - now)
+            else:
+                # Idle: sleep until the next metrics tick (velocity/ETA drift with time)
+                timeout = max(0.0, last_tick + tick - now)
+
+            changed = watcher.wait(timeout)
+            if changed and self.apply_changes(changed):
+                pending = True
+
+            now = time.monotonic()
+            if now - last_tick >= tick:
+                pending = True
+                last_tick = now
+            if pending and now - self._last_draw >= self.min_frame_interval:
+                self.draw()
+                pending = False
+
+
+def watch_track(plan_path: str, max_fps: float = 4.0, poll_interval: float = 1.0):
+    """Run the live dashboard until interrupted."""
+    planner = OrchestrationPlanner(plan_path)
+    dashboard = LiveDashboard(planner, max_fps=max_fps)
+    watcher = open_watcher(planner.plan_path.parent, poll_interval)
+    try:
+        dashboard.run(watcher)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python track_watcher.py <path/to/plan.md> [--fps N]")
+        sys.exit(1)
+
+    fps = float(sys.argv[sys.argv.index('--fps') + 1]) if '--fps' in sys.argv else 4.0
+    watch_track(sys.argv[1], max_fps=fps)
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Work-Queue Mode for Swarm-IOSM (v2.2)
+
+The planner daemon hands out ready background tasks to stateless worker
+processes, on this machine (Unix socket) or across hosts (TCP):
+
+    python work_queue.py serve <plan.md> [--tcp HOST:PORT] [--token SECRET] [--isolate]
+    python work_queue.py worker <ADDRESS> --command "CMD" [--id NAME] [--max-tasks N] [--exit-when-done]
+    python work_queue.py status <ADDRESS>
+
+Workers claim a task (which marks it RUNNING and grants a lease), run the
+command, stream its output back (each batch renews the lease and is appended
+to reports/logs/<TID>.log) and push the result and report. A worker whose
+lease was reaped is told so on its next progress call and abandons the task.
+
+The command gets SWARM_TASK_ID, SWARM_TASK_TITLE, SWARM_TASK_MODEL,
+SWARM_TASK_ATTEMPT and SWARM_REPORT_PATH (write the report there) in its
+environment. Exit code 0 means DONE, anything else FAILED.
+
+With `serve --isolate`, write-local tasks whose touches overlap run at the same
+time, each in its own git worktree (worktree_isolation.py); the command runs
+there (SWARM_WORKDIR) and its changes are merged back when it completes. The
+worktrees are local to the server, so isolation needs workers on the same host.
+"""
+
+import hmac
+import json
+import os
+import secrets
+import select
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from .orchestration_planner import DONE_STATUSES, FAILED_STATUSES, get_task_mode, lease_ttl, select_batch, select_model
+    from .parse_errors import LogErrorStream
+    from .planner_client import socket_path_for
+    from .planner_daemon import PlannerDaemon
+    from .worktree_isolation import WorktreeError, WorktreeManager
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from orchestration_planner import DONE_STATUSES, FAILED_STATUSES, get_task_mode, lease_ttl, select_batch, select_model
+    from parse_errors import LogErrorStream
+    from planner_client import socket_path_for
+    from planner_daemon import PlannerDaemon
+    from worktree_isolation import WorktreeError, WorktreeManager
+
+
+QUEUE_SOCKET_NAME = 'queue.sock'
+LOGS_DIR = 'logs'  # under reports/
+HEARTBEAT_INTERVAL = 30.0  # seconds between progress calls when the task is quiet
+PROGRESS_FLUSH_INTERVAL = 2.0  # seconds between progress calls while it prints
+MAX_PROGRESS_LINES = 500
+CONNECTION_TIMEOUT = 30.0
+OUTPUT_TAIL_LINES = 50
+
+
+def queue_socket_path(plan_path: str) -> str:
+    """Default work-queue socket: next to the planner daemon's socket."""
+    return str(Path(socket_path_for(plan_path)).with_name(QUEUE_SOCKET_NAME))
+
+
+def send_to(address: str, request: Dict, timeout: float = CONNECTION_TIMEOUT) -> Dict:
+    """One JSON request/response over a Unix socket path or HOST:PORT."""
+    host, sep, port = address.rpartition(':')
+    if sep and '/' not in address and port.isdigit():
+        sock = socket.create_connection((host or '127.0.0.1', int(port)), timeout=timeout)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+    with sock:
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        buf = b''
+        while not buf.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            buf += chunk
+    return json.loads(buf.decode('utf-8'))
+
+
+class WorkQueueServer(PlannerDaemon):
+    """Planner daemon that also leases ready background tasks to workers."""
+
+    banner = "Work queue"
+
+    def __init__(self, plan_path: str, socket_path: str = None, tcp_address: str = None,
+                 token: str = None, debounce: float = 0.25, isolate: bool = False):
+        super().__init__(plan_path, socket_path or queue_socket_path(plan_path), debounce)
+        self.tcp_address = tcp_address
+        self.token = token
+        self.isolate = isolate
+        if isolate:
+            WorktreeManager(self.plan_path.parent)  # fail fast outside a git repository
+        # task_id -> {'worker', 'claim', 'claimed_at', 'attempt', 'model'}
+        self.claims: Dict[str, Dict] = {}
+        self._retry_overrides: Dict[str, Dict] = {}
+        self._log_streams: Dict[str, LogErrorStream] = {}
+        self._first_error: Dict[str, str] = {}
+        self.handlers.update({
+            'claim': self._op_claim,
+            'progress': self._op_progress,
+            'complete': self._op_complete,
+            'queue': self._op_queue,
+        })
+
+    # --- Transport ---------------------------------------------------------
+
+    @property
+    def address(self) -> str:
+        return self.tcp_address or self.socket_path
+
+    def _listen(self) -> socket.socket:
+        if not self.tcp_address:
+            return super()._listen()
+        host, _, port = self.tcp_address.rpartition(':')
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((host or '127.0.0.1', int(port)))
+        server.listen(64)
+        return server
+
+    def _unlisten(self, server: socket.socket):
+        if not self.tcp_address:
+            return super()._unlisten(server)
+        server.close()
+
+    def _serve_connection(self, conn: socket.socket):
+        # A stalled remote worker must not hold up everyone else (the timeout drops it)
+        conn.settimeout(CONNECTION_TIMEOUT)
+        super()._serve_connection(conn)
+
+    def handle(self, request: Dict) -> Dict:
+        if self.token and not hmac.compare_digest(str(request.get('token', '')).encode('utf-8'),
+                                                self.token.encode('utf-8')):
+            return {'ok': False, 'exit_code': 2, 'error': "Invalid or missing token"}
+        return super().handle(request)
+
+    # --- Operations --------------------------------------------------------
+
+    def _log_path(self, task_id: str) -> Path:
+        return self.plan_path.parent / 'reports' / LOGS_DIR / f"{task_id}.log"
+
+    def _owns(self, request: Dict) -> bool:
+        """The caller holds the current claim, and the task still holds its lease."""
+        task_id = request['task']
+        claim = self.claims.get(task_id)
+        if claim is None or claim['claim'] != request.get('claim'):
+            return False
+        cp = self.planner.load_latest_checkpoint()
+        if cp is None or task_id not in cp.running_tasks:
+            # Reaped (lease expired) or finished by someone else
+            self.claims.pop(task_id, None)
+            return False
+        return True
+
+    def _op_claim(self, request: Dict) -> Dict:
+        """
+        Lease the highest-priority ready background task to a worker.
+
+        Tasks blocked at their retry limit are never ready, so never claimed. The
+        attempt number comes from the checkpoint's retry count (survives restarts).
+        """
+        for entry in self.planner.due_retries():
+            self._retry_overrides[entry['task']] = entry
+        # Read-only tasks whose inputs match a stored result complete without a worker
+        for task_id in self.planner.complete_from_cache():
+            self._retry_overrides.pop(task_id, None)
+
+        cp = self.planner._load_or_init_checkpoint()
+        ready = self.planner.prioritized_ready(cp)
+        candidates = [
+            self.planner.tasks[tid] for tid, _ in ready
+            if self._retry_overrides.get(tid, {}).get('mode', get_task_mode(self.planner.tasks[tid])) == 'background'
+        ]
+        candidates = self.planner.dispatch_filter(cp, candidates, self.isolate)
+        batch = select_batch(candidates, self.planner.effective_constraints(cp),
+                             cp.running_tasks, cp.iteration, dict(ready))
+
+        if not batch:
+            done = len(set(cp.completed_tasks) & set(self.planner.tasks)) == len(self.planner.tasks)
+            return {'exit_code': 0, 'task': None, 'done': done,
+                    'running': len(cp.running_tasks), 'retries': len(cp.retry_queue)}
+
+        task = batch[0]
+        workdir = None
+        if self.isolate and self.planner.isolatable(task, cp):
+            workdir = self.planner.create_worktree(task.id)['path']
+        self.planner.update_task_state(task.id, 'RUNNING', 'background')
+        override = self._retry_overrides.pop(task.id, {})
+        claim = {
+            'worker': request.get('worker', 'anonymous'),
+            'claim': secrets.token_hex(8),
+            'claimed_at': time.time(),
+            'attempt': cp.retry_counts.get(task.id, 0) + 1,  # run number: retry #1 is attempt #2
+            'model': override.get('model', select_model(task)),
+        }
+        self.claims[task.id] = claim
+        self._log_streams[task.id] = LogErrorStream(task.id)
+        self._first_error.pop(task.id, None)
+        log_path = self._log_path(task.id)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_path.write_text('', encoding='utf-8')
+        print(f"📤 {task.id} → {claim['worker']} (attempt #{claim['attempt']}, {claim['model']}"
+              f"{', worktree' if workdir else ''})")
+        return {
+            'exit_code': 0,
+            'task': {'id': task.id, 'title': task.title, 'model': claim['model'],
+                     'attempt': claim['attempt'], 'touches': task.touches,
+                     'plan': str(self.planner.plan_path.resolve()), 'workdir': workdir},
+            'claim': claim['claim'],
+            'lease_ttl': lease_ttl('background'),
+            'heartbeat_interval': HEARTBEAT_INTERVAL,
+        }
+
+    def _op_progress(self, request: Dict) -> Dict:
+        """Append streamed output, diagnose errors on the fly, renew the lease."""
+        task_id = request['task']
+        if not self._owns(request) or not self.planner.heartbeat(task_id):
+            print(f"❌ {task_id}: lease lost; worker should abandon it")
+            return {'exit_code': 1, 'lease_lost': True}
+
+        text = ''.join(line.rstrip('\n') + '\n' for line in request.get('lines') or [])
+        if text:
+            with open(self._log_path(task_id), 'a', encoding='utf-8') as f:
+                f.write(text)
+            stream = self._log_streams.setdefault(task_id, LogErrorStream(task_id))
+            for _, diagnosis in stream.feed(text):
+                self._first_error.setdefault(task_id, diagnosis.error_type.value)
+        return {'exit_code': 0}
+
+    def _op_complete(self, request: Dict) -> Dict:
+        """Record a worker's result: report content, then DONE or FAILED (+ retry)."""
+        task_id = request['task']
+        status = request['status'].upper()
+        if status not in DONE_STATUSES + FAILED_STATUSES:
+            raise ValueError(f"Invalid status '{status}' (expected DONE or FAILED)")
+        if not self._owns(request):
+            print(f"❌ {task_id}: result discarded, the claim is no longer valid")
+            return {'exit_code': 1, 'lease_lost': True}
+
+        if request.get('report'):
+            report_path = self.plan_path.parent / 'reports' / f"{task_id}.md"
+            tmp_path = report_path.with_name(f".{report_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(request['report'], encoding='utf-8')
+            os.replace(tmp_path, report_path)
+
+        error_type = None
+        stream = self._log_streams.pop(task_id, None)
+        if stream is not None:
+            for _, diagnosis in stream.close():
+                self._first_error.setdefault(task_id, diagnosis.error_type.value)
+        if status in FAILED_STATUSES:
+            error_type = self._first_error.get(task_id)
+
+        self.claims.pop(task_id, None)
+        self._first_error.pop(task_id, None)
+        self.planner.update_task_state(task_id, status, 'background', error_type)
+        if status in FAILED_STATUSES:
+            self.planner.retry_task(task_id, error_type)
+        return {'exit_code': 0}
+
+    def _op_queue(self, request: Dict) -> Dict:
+        cp = self.planner.load_latest_checkpoint()
+        now = time.time()
+        return {
+            'exit_code': 0,
+            'claims': {tid: {'worker': c['worker'], 'attempt': c['attempt'], 'model': c['model'],
+                             'running_for': round(now - c['claimed_at'])}
+                       for tid, c in self.claims.items()},
+            'ready': self._ready_queue(),
+            'retry_queue': cp.retry_queue if cp else [],
+        }
+
+
+class Worker:
+    """Pulls tasks from a work queue and runs a command for each."""
+
+    def __init__(self, address: str, command: str, worker_id: str = None, token: str = None,
+                 poll_interval: float = 2.0):
+        self.address = address
+        self.command = shlex.split(command)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.token = token
+        self.poll_interval = poll_interval
+
+    def request(self, op: str, **fields) -> Dict:
+        request = {'op': op, 'worker': self.worker_id, **fields}
+        if self.token:
+            request['token'] = self.token
+        return send_to(self.address, request)
+
+    def run(self, max_tasks: int = None, exit_when_done: bool = False) -> int:
+        """Claim and run tasks until max_tasks, track completion, or Ctrl-C. Returns tasks run."""
+        ran = 0
+        while max_tasks is None or ran < max_tasks:
+            response = self.request('claim')
+            if not response.get('ok'):
+                raise RuntimeError(response.get('error') or response.get('output', 'claim failed'))
+            if response.get('task') is None:
+                if exit_when_done and response.get('done'):
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            self.run_task(response)
+            ran += 1
+        return ran
+
+    def run_task(self, claim: Dict) -> Optional[int]:
+        """Run one claimed task; returns its exit code (None if the lease was lost)."""
+        task = claim['task']
+        heartbeat_interval = claim.get('heartbeat_interval', HEARTBEAT_INTERVAL)
+        print(f"▶️  [{self.worker_id}] {task['id']}: {task['title']} (attempt #{task['attempt']})")
+
+        with tempfile.TemporaryDirectory(prefix=f"swarm-{task['id']}-") as workdir:
+            report_path = Path(workdir) / f"{task['id']}.md"
+            env = dict(os.environ,
+                       SWARM_TASK_ID=task['id'], SWARM_TASK_TITLE=task['title'],
+                       SWARM_TASK_MODEL=task['model'], SWARM_TASK_ATTEMPT=str(task['attempt']),
+                       SWARM_REPORT_PATH=str(report_path))
+            cwd = task.get('workdir')
+            if cwd:
+                env['SWARM_WORKDIR'] = cwd
+            proc = subprocess.Popen(self.command, env=env, cwd=cwd, stdout=subprocess.PIPE,
+                                    stderr=subprocess.STDOUT)
+            pending: List[str] = []
+            tail: List[str] = []
+            partial = b''
+            last_sent = time.monotonic()
+
+            def flush() -> bool:
+                nonlocal pending, last_sent
+                response = self.request('progress', task=task['id'], claim=claim['claim'],
+                                        lines=pending[:MAX_PROGRESS_LINES])
+                pending = pending[MAX_PROGRESS_LINES:]
+                last_sent = time.monotonic()
+                return not response.get('lease_lost')
+
+            fd = proc.stdout.fileno()
+            while True:
+                readable, _, _ = select.select([fd], [], [], PROGRESS_FLUSH_INTERVAL)
+                chunk = os.read(fd, 65536) if readable else b''
+                if chunk:
+                    *lines, partial = (partial + chunk).split(b'\n')
+                    decoded = [line.decode('utf-8', 'replace') for line in lines]
+                    pending.extend(decoded)
+                    tail = (tail + decoded)[-OUTPUT_TAIL_LINES:]
+                elif readable:
+                    break  # EOF
+                elapsed = time.monotonic() - last_sent
+                if (pending and elapsed >= PROGRESS_FLUSH_INTERVAL) or elapsed >= heartbeat_interval:
+                    if not flush():
+                        proc.kill()
+                        proc.wait()
+                        print(f"⚠️  [{self.worker_id}] {task['id']}: lease lost, abandoned")
+                        return None
+
+            if partial:
+                pending.append(partial.decode('utf-8', 'replace'))
+                tail = (tail + pending[-1:])[-OUTPUT_TAIL_LINES:]
+            exit_code = proc.wait()
+            while pending:
+                if not flush():
+                    print(f"⚠️  [{self.worker_id}] {task['id']}: lease lost, abandoned")
+                    return None
+
+            report = report_path.read_text(encoding='utf-8') if report_path.exists() else None
+            status = 'DONE' if exit_code == 0 else 'FAILED'
+            response = self.request('complete', task=task['id'], claim=claim['claim'],
+                                    status=status, report=report, exit_code=exit_code)
+            if response.get('lease_lost'):
+                print(f"⚠️  [{self.worker_id}] {task['id']}: result discarded (lease lost)")
+                return None
+            icon = '✅' if exit_code == 0 else '❌'
+            print(f"{icon} [{self.worker_id}] {task['id']}: exit {exit_code}")
+            return exit_code
+
+
+def _flag(name: str, default=None):
+    return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 3 or sys.argv[1] not in ('serve', 'worker', 'status'):
+        print("Usage:")
+        print("  python work_queue.py serve <plan.md> [--tcp HOST:PORT] [--socket PATH] [--token SECRET] [--isolate]")
+        print("  python work_queue.py worker <ADDRESS> --command \"CMD\" [--id NAME] [--max-tasks N] [--exit-when-done]")
+        print("  python work_queue.py status <ADDRESS>")
+        sys.exit(1)
+
+    token = _flag('--token', os.environ.get('SWARM_QUEUE_TOKEN'))
+
+    if sys.argv[1] == 'serve':
+        try:
+            server = WorkQueueServer(sys.argv[2], _flag('--socket'), _flag('--tcp'), token,
+                                     float(_flag('--debounce', 0.25)), isolate='--isolate' in sys.argv)
+            server.serve_forever()
+        except (RuntimeError, OSError, WorktreeError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    elif sys.argv[1] == 'worker':
+        if '--command' not in sys.argv:
+            print("❌ --command is required")
+            sys.exit(1)
+        worker = Worker(sys.argv[2], _flag('--command'), _flag('--id'), token,
+                        float(_flag('--poll', 2.0)))
+        max_tasks = int(_flag('--max-tasks')) if '--max-tasks' in sys.argv else None
+        try:
+            ran = worker.run(max_tasks, exit_when_done='--exit-when-done' in sys.argv)
+        except KeyboardInterrupt:
+            sys.exit(130)
+        except (RuntimeError, OSError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"[{worker.worker_id}] ran {ran} task(s)")
+
+    else:
+        response = send_to(sys.argv[2], {'op': 'queue', **({'token': token} if token else {})})
+        if not response.get('ok'):
+            print(f"❌ {response.get('error')}")
+            sys.exit(1)
+        for tid, claim in response['claims'].items():
+            print(f"▶️  {tid}: {claim['worker']} (attempt #{claim['attempt']}, {claim['model']}, "
+                  f"{claim['running_for']}s)")
+        print(f"Ready: {', '.join(response['ready']) or '(none)'}")
+        for entry in response['retry_queue']:
+            print(f"🔁 {entry['task']} attempt #{entry['attempt']} ({entry['error_type']})")
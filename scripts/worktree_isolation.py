@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Worktree Isolation for Swarm-IOSM (v2.2)
+
+Write tasks whose Touches overlap normally run one after another (the Lock
+Plan's "sequential only"). In isolation mode each write-local task runs in its
+own git worktree instead, so overlapping tasks run concurrently:
+
+1. The worktree is checked out from a snapshot commit of the main working tree
+   (uncommitted and untracked files included; HEAD, index and branches are not
+   touched), so a task sees everything its dependencies already merged.
+2. When the task finishes, each file it changed is 3-way merged into the main
+   working tree with `git merge-file` (base = the snapshot it started from).
+   Finished tasks are merged in dependency order.
+3. A task merges all-or-nothing. If any file conflicts, nothing is applied and
+   the planner re-runs the task serially in the main tree.
+
+Worktrees live under <git common dir>/swarm-worktrees/<track>/<T##>, outside
+the working tree, so they never show up in `git status` or in snapshots.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .result_cache import project_root
+except ImportError:
+    # For standalone usage
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from result_cache import project_root
+
+WORKTREES_DIR = 'swarm-worktrees'  # under the git common dir
+
+
+class WorktreeError(Exception):
+    """A git operation needed for isolation failed (not a repository, no git, ...)."""
+
+
+@dataclass
+class MergeResult:
+    """Outcome of merging one task's worktree into the main working tree."""
+    task_id: str
+    applied: List[str] = field(default_factory=list)
+    conflicts: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts
+
+
+def git(cwd: Path, *args: str, env: Dict[str, str] = None, binary: bool = False):
+    """Run git in cwd; stdout as stripped text (or raw bytes). Raises WorktreeError."""
+    try:
+        proc = subprocess.run(['git', *args], cwd=cwd, env=env, capture_output=True, check=True)
+    except FileNotFoundError:
+        raise WorktreeError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise WorktreeError(f"git {' '.join(args)}: {e.stderr.decode('utf-8', 'replace').strip()}")
+    return proc.stdout if binary else proc.stdout.decode('utf-8', 'replace').strip()
+
+
+def snapshot_commit(root: Path) -> str:
+    """
+    Commit object holding the working tree as it is now: tracked changes plus
+    untracked, non-ignored files. Built in a scratch index; HEAD, the real
+    index and all refs stay untouched.
+    """
+    with tempfile.TemporaryDirectory(prefix='swarm-index-') as tmp:
+        index = Path(tmp) / 'index'
+        real_index = Path(git(root, 'rev-parse', '--path-format=absolute', '--git-path', 'index'))
+        if real_index.exists():
+            shutil.copyfile(real_index, index)  # reuse its stat cache: only changed files get hashed
+        env = dict(os.environ, GIT_INDEX_FILE=str(index))
+        git(root, 'add', '-A', env=env)
+        tree = git(root, 'write-tree', env=env)
+    try:
+        parent = ['-p', git(root, 'rev-parse', '--verify', 'HEAD')]
+    except WorktreeError:
+        parent = []  # no commits yet
+    return git(root, 'commit-tree', tree, *parent, '-m', 'swarm: worktree base snapshot')
+
+
+def merge_file(ours: bytes, base: bytes, theirs: bytes) -> Tuple[Optional[bytes], bool]:
+    """3-way merge of one file's contents: (merged, clean). Binary files never merge cleanly."""
+    with tempfile.TemporaryDirectory(prefix='swarm-merge-') as tmp:
+        paths = []
+        for name, content in (('ours', ours), ('base', base), ('theirs', theirs)):
+            path = Path(tmp) / name
+            path.write_bytes(content)
+            paths.append(str(path))
+        proc = subprocess.run(['git', 'merge-file', '-p', '--quiet', *paths], capture_output=True)
+    # Exit status: 0 clean, >0 number of conflicts, 255 error (e.g. binary)
+    return (proc.stdout, True) if proc.returncode == 0 else (None, False)
+
+
+class WorktreeManager:
+    """Creates, merges and removes per-task worktrees for one track."""
+
+    def __init__(self, track_path: Path, root: Optional[Path] = None):
+        self.track_path = Path(track_path).resolve()
+        start = root or project_root(self.track_path)
+        self.root = Path(git(start, 'rev-parse', '--show-toplevel'))
+        common = Path(git(self.root, 'rev-parse', '--path-format=absolute', '--git-common-dir'))
+        self.base_dir = common / WORKTREES_DIR / self.track_path.name
+
+    def create(self, task_id: str) -> Dict[str, str]:
+        """Check out a fresh worktree for the task. Returns {'path', 'base'}."""
+        path = self.base_dir / task_id
+        if path.exists():
+            self.remove({'path': str(path)})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        base = snapshot_commit(self.root)
+        git(self.root, 'worktree', 'add', '--detach', str(path), base)
+        return {'path': str(path), 'base': base}
+
+    def changes(self, info: Dict[str, str]) -> List[Tuple[str, str]]:
+        """(status, path) of everything the task changed: A added, M modified, D deleted."""
+        path = Path(info['path'])
+        git(path, 'add', '-A')
+        out = git(path, 'diff', '--cached', '--name-status', '--no-renames', info['base'])
+        return [tuple(line.split('\t', 1)) for line in out.splitlines() if line]
+
+    def _base_blob(self, base: str, rel: str) -> Optional[bytes]:
+        try:
+            return git(self.root, 'cat-file', 'blob', f"{base}:{rel}", binary=True)
+        except WorktreeError:
+            return None
+
+    def merge(self, task_id: str, info: Dict[str, str]) -> MergeResult:
+        """
+        3-way merge the task's changes into the main working tree, all or nothing:
+        on any conflict no file is written.
+        """
+        result = MergeResult(task_id)
+        worktree = Path(info['path'])
+        planned: List[Tuple[str, Optional[bytes]]] = []  # (path, new content or None to delete)
+        for status, rel in self.changes(info):
+            target = self.root / rel
+            ours = target.read_bytes() if target.is_file() else None
+            theirs = (worktree / rel).read_bytes() if status != 'D' else None
+            base = self._base_blob(info['base'], rel) if status != 'A' else None
+            if ours == theirs:
+                continue  # same result on both sides
+            if ours == base:
+                planned.append((rel, theirs))  # main tree unchanged since the snapshot
+            elif ours is None or theirs is None:
+                result.conflicts.append(rel)  # modified on one side, deleted on the other
+            else:
+                merged, clean = merge_file(ours, base or b'', theirs)
+                if clean:
+                    planned.append((rel, merged))
+                else:
+                    result.conflicts.append(rel)
+
+        if result.conflicts:
+            return result
+        for rel, content in planned:
+            target = self.root / rel
+            if content is None:
+                target.unlink(missing_ok=True)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(content)
+                shutil.copymode(worktree / rel, tmp_path)
+                os.replace(tmp_path, target)
+            result.applied.append(rel)
+        return result
+
+    def remove(self, info: Dict[str, str]):
+        """Delete the worktree (its snapshot commit is left for git gc)."""
+        try:
+            git(self.root, 'worktree', 'remove', '--force', info['path'])
+        except WorktreeError:
+            shutil.rmtree(info['path'], ignore_errors=True)
+            git(self.root, 'worktree', 'prune')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python worktree_isolation.py <swarm/tracks/<id>> [--prune]")
+        sys.exit(1)
+
+    try:
+        manager = WorktreeManager(Path(sys.argv[1]))
+    except WorktreeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    worktrees = sorted(manager.base_dir.iterdir()) if manager.base_dir.exists() else []
+    if '--prune' in sys.argv:
+        for path in worktrees:
+            manager.remove({'path': str(path)})
+        print(f"🗑️  Removed {len(worktrees)} worktree(s)")
+        sys.exit(0)
+    if not worktrees:
+        print("No task worktrees.")
+    for path in worktrees:
+        changed = git(path, 'status', '--porcelain').splitlines()
+        print(f"🌿 {path.name}: {path} ({len(changed)} changed path(s))")
@@ -0,0 +1,57 @@
+"""Shared fixtures: a throwaway track with a small plan.md."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+DEFAULT_TASKS = [
+    # (id, depends_on, touches, concurrency_class, effort)
+    ('T01', 'None', '`src/`', 'read-only', 'M (2 hours)'),
+    ('T02', 'T01', '`src/a.py`', 'write-local', 'M (2 hours)'),
+    ('T03', 'T01', '`src/b.py`', 'write-local', 'M (2 hours)'),
+    ('T04', 'T02, T03', '`src/main.py`', 'write-local', 'M (2 hours)'),
+]
+
+
+def write_plan(track: Path, tasks=DEFAULT_TASKS) -> Path:
+    """Write plan.md for the given task rows and return its path."""
+    lines = [f"# Implementation Plan — {track.name}", "", "## Phases", ""]
+    for tid, deps, touches, concurrency, effort in tasks:
+        lines += [
+            f"- [ ] **{tid}**: Task {tid}",
+            "  - **Owner role:** Implementer",
+            f"  - **Depends on:** {deps}",
+            f"  - **Touches:** {touches}",
+            f"  - **Concurrency class:** {concurrency}",
+            "  - **Needs user input:** false",
+            f"  - **Effort:** {effort}",
+            f"  - **Acceptance:** {tid} done",
+            f"  - **Artifacts:** `reports/{tid}.md`",
+            "  - **IOSM checks:** N/A",
+            "  - **Status:** TODO",
+        ]
+    plan = track / 'plan.md'
+    plan.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return plan
+
+
+@pytest.fixture
+def plan_path(tmp_path, monkeypatch) -> Path:
+    """plan.md of a fresh track at <tmp>/swarm/tracks/t1 (project root = tmp)."""
+    track = tmp_path / 'swarm' / 'tracks' / 't1'
+    track.mkdir(parents=True)
+    monkeypatch.setenv('SWARM_PROJECT_ROOT', str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    return write_plan(track)
+
+
+@pytest.fixture
+def planner(plan_path):
+    from orchestration_planner import OrchestrationPlanner
+    planner = OrchestrationPlanner(str(plan_path))
+    planner.parse_plan()
+    planner.build_dependency_graph()
+    return planner
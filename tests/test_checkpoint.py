@@ -0,0 +1,64 @@
+"""Checkpoint writes keep the state other features put in latest.json."""
+
+from orchestration_planner import OrchestrationPlanner
+
+
+def test_save_checkpoint_keeps_other_fields(planner, plan_path):
+    def mutate(cp):
+        cp.spawn = {'tasks': {}, 'used': {'gate-I': 2}}
+        cp.retry_queue = [{'task': 'T03', 'due': 0}]
+        cp.rebuild = {'T02': 'touch changed'}
+        return True
+    planner.update_task_state('T01', 'DONE')
+    planner.update_task_state('T03', 'RUNNING')
+    planner.transact_checkpoint(mutate)
+    reports = plan_path.parent / 'reports'
+    reports.mkdir()
+    (reports / 'T02.md').write_text('**Status:** Complete\n', encoding='utf-8')
+
+    OrchestrationPlanner(str(plan_path)).save_checkpoint(3)
+
+    cp = OrchestrationPlanner(str(plan_path)).load_latest_checkpoint()
+    assert cp.iteration == 3
+    assert cp.spawn['used'] == {'gate-I': 2}
+    assert cp.retry_queue == [{'task': 'T03', 'due': 0}]
+    assert cp.completed_tasks == ['T01']  # T02 is invalidated by --rebuild
+    assert cp.running_tasks == {'T03': 'background'}
+    assert (plan_path.parent / 'checkpoints' / 'iter_003.json').exists()
+
+
+def _bump(plan, worker, rounds):
+    planner = OrchestrationPlanner(plan)
+    planner.parse_plan()
+
+    def mutate(cp):
+        cp.retry_counts[worker] = cp.retry_counts.get(worker, 0) + 1
+        return True
+    for _ in range(rounds):
+        planner.transact_checkpoint(mutate)
+
+
+def test_concurrent_transactions_lose_nothing(planner, plan_path):
+    import multiprocessing
+    ctx = multiprocessing.get_context('fork')
+    workers = [ctx.Process(target=_bump, args=(str(plan_path), f"w{i}", 10)) for i in range(30)]
+    for proc in workers:
+        proc.start()
+    for proc in workers:
+        proc.join(60)
+    assert [proc.exitcode for proc in workers] == [0] * 30
+
+    cp = OrchestrationPlanner(str(plan_path)).load_latest_checkpoint()
+    assert cp.retry_counts == {f"w{i}": 10 for i in range(30)}
+    assert cp.version == 300
+
+
+def test_stale_in_memory_checkpoint_is_reloaded(planner, plan_path):
+    other = OrchestrationPlanner(str(plan_path))
+    other.parse_plan()
+    planner.update_task_state('T01', 'DONE')
+    other.load_latest_checkpoint()  # warm cache
+    planner.update_task_state('T02', 'RUNNING')
+    other.update_task_state('T03', 'RUNNING')
+    cp = OrchestrationPlanner(str(plan_path)).load_latest_checkpoint()
+    assert set(cp.running_tasks) == {'T02', 'T03'}
@@ -0,0 +1,35 @@
+"""Coalesced units: the combined report stays out of reports/T*.md and every part gets its status."""
+
+from orchestration_planner import UNIT_REPORTS_DIR
+
+
+def write_unit_report(plan_path, unit, body):
+    units_dir = plan_path.parent / 'reports' / UNIT_REPORTS_DIR
+    units_dir.mkdir(parents=True, exist_ok=True)
+    (units_dir / f"{unit}.md").write_text(body, encoding='utf-8')
+
+
+def test_unit_report_is_not_read_as_a_task_report(planner, plan_path):
+    write_unit_report(plan_path, 'T02+T03', "# Subagent Report: Task T02\n**Status:** Complete\n")
+    assert planner.reconcile_state()['completed'] == []
+
+
+def test_complete_unit_fails_parts_that_never_started(planner, plan_path, monkeypatch):
+    planner.update_task_state('T01', 'DONE')
+    observed = []
+    observe = planner._observe_outcome
+    monkeypatch.setattr(planner, '_observe_outcome',
+                        lambda cp, tid, failed, *args: observed.append((tid, failed)) or observe(cp, tid, failed, *args))
+    write_unit_report(plan_path, 'T02+T03',
+                      "# Subagent Report: Task T02\n**Status:** Complete\n\n"
+                      "# Subagent Report: Task T03\n**Status:** Blocked\n")
+
+    result = planner.complete_unit('T02+T03')
+
+    assert result == {'done': ['T02'], 'failed': ['T03'], 'missing': []}
+    cp = planner.load_latest_checkpoint()
+    assert 'T02' in cp.completed_tasks
+    assert 'T03' not in cp.completed_tasks
+    assert ('T03', True) in observed
+    assert not cp.running_tasks
+    assert (plan_path.parent / 'reports' / 'T02.md').exists()
@@ -0,0 +1,37 @@
+"""Dependency cycles surface as a validation error, not a traceback."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from conftest import write_plan
+from orchestration_planner import CriticalPathIndex, DependencyCycleError
+
+SCRIPTS = Path(__file__).resolve().parent.parent / 'scripts'
+CYCLIC_TASKS = [
+    ('T01', 'T03', '`a.py`', 'write-local', 'S'),
+    ('T02', 'T01', '`b.py`', 'write-local', 'S'),
+    ('T03', 'T02', '`c.py`', 'write-local', 'S'),
+    ('T04', 'None', '`d.py`', 'write-local', 'S'),
+]
+
+
+def test_index_names_the_cycle():
+    index = CriticalPathIndex()
+    index.add_task('T01', 30)
+    index.add_task('T02', 30, ['T01'])
+    with pytest.raises(DependencyCycleError) as info:
+        index.add_edge('T02', 'T01')
+    assert info.value.cycle == ['T01', 'T02', 'T01']
+
+
+@pytest.mark.parametrize('flag', ['--graph', '--simulate', '--validate'])
+def test_cli_reports_cycle_as_validation_failure(plan_path, flag):
+    write_plan(plan_path.parent, CYCLIC_TASKS)
+    result = subprocess.run([sys.executable, str(SCRIPTS / 'orchestration_planner.py'), str(plan_path), flag],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 1
+    assert 'Traceback' not in result.stderr
+    assert 'Dependency cycle: T01 -> T02 -> T03 -> T01' in result.stdout
@@ -0,0 +1,45 @@
+"""Running-task leases: heartbeats renew them, expired ones are reaped and retried."""
+
+import os
+import time
+
+from orchestration_planner import LEASE_TTL_SECONDS, get_retry_policy
+
+
+def test_heartbeat_renews_lease_and_fails_when_not_running(planner):
+    assert not planner.heartbeat('T01')
+    planner.update_task_state('T01', 'RUNNING', 'background')
+    now = time.time() + 100
+    assert planner.heartbeat('T01', now=now)
+    assert planner.load_latest_checkpoint().leases['T01'] == now + LEASE_TTL_SECONDS['background']
+
+
+def test_expired_lease_is_requeued_then_blocked_at_the_limit(planner):
+    limit = get_retry_policy('timeout').max_attempts
+    now = time.time()
+    for attempt in range(1, limit + 2):
+        planner.update_task_state('T01', 'RUNNING', 'background')
+        now += LEASE_TTL_SECONDS['background'] + 3600  # past the lease and any backoff
+        reaped = planner.reap_expired_leases(now=now)
+        assert [item['task'] for item in reaped] == ['T01']
+        cp = planner.load_latest_checkpoint()
+        assert 'T01' not in cp.running_tasks
+        if attempt <= limit:
+            assert reaped[0]['retry']['attempt'] == attempt
+            assert [e['task'] for e in planner.due_retries(now=now + 3600)] == ['T01']
+        else:
+            assert reaped[0]['retry'] is None
+            assert cp.blocked == {'T01': 'timeout'}
+            assert 'T01' not in planner.ready_from_checkpoint(cp)
+
+
+def test_recent_report_write_counts_as_heartbeat(planner, plan_path):
+    planner.update_task_state('T01', 'RUNNING', 'background')
+    expires = planner.load_latest_checkpoint().leases['T01']
+    reports = plan_path.parent / 'reports'
+    reports.mkdir()
+    report = reports / 'T01.md'
+    report.write_text('progress', encoding='utf-8')
+    os.utime(report, (expires - 60, expires - 60))  # written shortly before the lease ran out
+    assert planner.reap_expired_leases(now=expires + 1) == []
+    assert 'T01' in planner.load_latest_checkpoint().running_tasks
@@ -0,0 +1,33 @@
+"""planner_client maps CLI flags onto daemon ops."""
+
+import json
+
+import pytest
+
+from planner_client import build_request
+
+
+@pytest.mark.parametrize('argv, request_', [
+    (['plan.md', '--due-retries'], {'op': 'due_retries', 'json': False}),
+    (['plan.md', '--due-retries', '--json'], {'op': 'due_retries', 'json': True}),
+    (['plan.md', '--reap'], {'op': 'reap', 'verbose': True}),
+    (['plan.md', '--ready', '--json'], {'op': 'ready', 'json': True}),
+])
+def test_queue_flags_map_to_daemon_ops(argv, request_):
+    assert build_request(argv) == request_
+
+
+def test_update_tasks_reads_planner_record_formats(tmp_path):
+    source = tmp_path / 'updates.jsonl'
+    source.write_text('{"task": "T01", "status": "DONE"}\n{"task": "T02", "status": "RUNNING"}\n',
+                      encoding='utf-8')
+    request = build_request(['plan.md', '--update-tasks', str(source)])
+    assert request == {'op': 'update_tasks', 'updates': [json.loads(line) for line in
+                                                         source.read_text(encoding='utf-8').splitlines()]}
+
+
+def test_ready_prints_dispatch_order(planner, capsys):
+    planner.update_task_state('T01', 'DONE')
+    capsys.readouterr()
+    planner.print_ready(as_json=True)
+    assert json.loads(capsys.readouterr().out)['ready'] == ['T02', 'T03']
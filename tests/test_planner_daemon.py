@@ -0,0 +1,103 @@
+"""The daemon survives malformed requests and clients that hang up."""
+
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from planner_client import send_request
+
+SCRIPTS = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+@pytest.fixture
+def daemon(plan_path, tmp_path):
+    sock = str(tmp_path / 'd.sock')
+    proc = subprocess.Popen([sys.executable, str(SCRIPTS / 'planner_daemon.py'), str(plan_path),
+                             '--socket', sock, '--debounce', '0'],
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 10
+    while not Path(sock).exists():
+        assert proc.poll() is None, proc.stdout.read().decode()
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.05)
+    yield sock
+    if proc.poll() is None:
+        proc.terminate()
+    proc.wait(10)
+
+
+def raw_request(sock: str, line: bytes) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(10)
+        conn.connect(sock)
+        conn.sendall(line + b'\n')
+        return conn.makefile('rb').readline()
+
+
+@pytest.mark.parametrize('line', [
+    b'[1]',
+    b'"ping"',
+    b'{"op": ["ping"]}',
+    b'{"op": "update_tasks", "updates": [5]}',
+    b'{"op": "update_task", "task": "T01"}',
+    b'not json',
+])
+def test_malformed_request_gets_error_response(daemon, line):
+    response = raw_request(daemon, line)
+    assert b'"ok": false' in response
+    assert send_request(daemon, {'op': 'ping'})['ok']
+
+
+def test_client_closing_early_does_not_kill_daemon(daemon):
+    for _ in range(5):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.connect(daemon)
+            conn.sendall(b'{"op": "resume"}\n' * 50)  # hang up without reading the replies
+    assert send_request(daemon, {'op': 'ping'})['ok']
+
+
+def test_render_error_is_logged_and_socket_removed(plan_path, tmp_path, monkeypatch, capsys):
+    import threading
+    from orchestration_planner import OrchestrationPlanner
+    from planner_daemon import PlannerDaemon
+
+    def broken_render(self):
+        raise KeyError('T99')
+    monkeypatch.setattr(OrchestrationPlanner, '_render_latest_state', broken_render)
+    sock = str(tmp_path / 'd.sock')
+    responses = []
+
+    def client():
+        deadline = time.monotonic() + 10
+        while True:  # the socket file appears at bind(), slightly before listen()
+            try:
+                send_request(sock, {'op': 'ping'})
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+        responses.append(send_request(sock, {'op': 'update_task', 'task': 'T01', 'status': 'DONE'}))
+        time.sleep(0.2)  # past the debounce window: the deferred render fails in the event loop
+        responses.append(send_request(sock, {'op': 'update_task', 'task': 'T02', 'status': 'RUNNING'}))
+        responses.append(send_request(sock, {'op': 'shutdown'}))
+
+    thread = threading.Thread(target=client)
+    thread.start()
+    PlannerDaemon(str(plan_path), sock, debounce=0.05).serve_forever()
+    thread.join(10)
+
+    assert [r['ok'] for r in responses] == [True, True, True]
+    assert 'iosm_state.md not written' in capsys.readouterr().out
+    assert not Path(sock).exists()
+
+
+def test_queue_ops_print_like_the_planner_cli(daemon):
+    assert send_request(daemon, {'op': 'due_retries'})['output'] == "No retries due.\n"
+    assert send_request(daemon, {'op': 'reap', 'verbose': True})['output'] == "No expired leases.\n"
+    assert send_request(daemon, {'op': 'reap'})['output'] == ""
+    response = send_request(daemon, {'op': 'ready'})
+    assert response['ready'] == ['T01'] and response['output'].startswith("▶️  T01")
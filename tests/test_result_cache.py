@@ -0,0 +1,25 @@
+"""The result cache's project root does not depend on the caller's working directory."""
+
+from result_cache import project_root
+
+
+def test_project_root_ignores_cwd(tmp_path, monkeypatch):
+    monkeypatch.delenv('SWARM_PROJECT_ROOT', raising=False)
+    repo = tmp_path / 'repo'
+    track = repo / 'plans' / 'auth'
+    track.mkdir(parents=True)
+    (repo / '.git').mkdir()
+    elsewhere = tmp_path / 'elsewhere'
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    assert project_root(track) == repo.resolve()
+    (repo / '.git').rmdir()
+    assert project_root(track) == track.resolve()
+
+
+def test_project_root_of_swarm_layout(tmp_path, monkeypatch):
+    monkeypatch.delenv('SWARM_PROJECT_ROOT', raising=False)
+    track = tmp_path / 'swarm' / 'tracks' / 't1'
+    track.mkdir(parents=True)
+    assert project_root(track) == tmp_path.resolve()
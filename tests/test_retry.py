@@ -0,0 +1,34 @@
+"""Retry scheduling: per-ErrorType policies and the retry limit."""
+
+import time
+
+from orchestration_planner import RETRY_POLICIES, get_retry_policy
+
+
+def fail(planner, task_id='T01', error_type='import_error'):
+    planner.update_task_state(task_id, 'RUNNING')
+    planner.update_task_state(task_id, 'FAILED', error_type=error_type)
+
+
+def test_undiagnosed_failure_uses_unknown_policy():
+    assert get_retry_policy(None) is RETRY_POLICIES['unknown']
+    assert get_retry_policy('') is RETRY_POLICIES['unknown']
+
+
+def test_retry_limit_blocks_task(planner):
+    limit = get_retry_policy('import_error').max_attempts
+    for _ in range(limit):
+        fail(planner)
+        assert planner.retry_task('T01', 'import_error')
+        assert [e['task'] for e in planner.due_retries(now=time.time() + 1)] == ['T01']
+
+    fail(planner)
+    assert not planner.retry_task('T01', 'import_error')
+    cp = planner.load_latest_checkpoint()
+    assert cp.blocked == {'T01': 'import_error'}
+    assert 'T01' not in planner.ready_from_checkpoint(cp)
+    assert not planner.retry_task('T01', 'import_error')  # still blocked, not re-queued
+
+    assert planner.retry_task('T01', 'import_error', reset=True)
+    cp = planner.load_latest_checkpoint()
+    assert cp.blocked == {} and cp.retry_counts == {'T01': 1}
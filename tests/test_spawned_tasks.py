@@ -0,0 +1,35 @@
+"""Spawned tasks (T-AUTO-NN) in plan outputs and --resume."""
+
+from dataclasses import asdict, replace
+
+from orchestration_planner import OrchestrationPlanner, task_sort_key
+
+
+def spawn(planner, task_id='T-AUTO-01', depends_on=('T01',)):
+    task = replace(planner.tasks['T02'], id=task_id, title='Spawned', depends_on=list(depends_on),
+                   touches=['src/c.py'])
+
+    def mutate(cp):
+        cp.spawn.setdefault('tasks', {})[task_id] = asdict(task)
+        return True
+    planner.transact_checkpoint(mutate)
+
+
+def test_task_sort_key_is_natural_and_accepts_spawned_ids():
+    ids = ['T10', 'T-AUTO-02', 'T2', 'T-AUTO-10', 'T01']
+    assert sorted(ids, key=task_sort_key) == ['T01', 'T2', 'T10', 'T-AUTO-02', 'T-AUTO-10']
+
+
+def test_continuous_plan_with_spawned_task(planner, plan_path):
+    spawn(planner)
+    out = plan_path.parent / 'continuous_dispatch_plan.md'
+    OrchestrationPlanner(str(plan_path)).generate_continuous_dispatch_plan(str(out))
+    assert '| T-AUTO-01 |' in out.read_text(encoding='utf-8')
+
+
+def test_resume_lists_spawned_ready_task(planner, plan_path, capsys):
+    planner.update_task_state('T01', 'DONE')
+    spawn(planner)
+    OrchestrationPlanner(str(plan_path)).print_resume_status()
+    ready = [line for line in capsys.readouterr().out.splitlines() if line.startswith('Ready to dispatch')]
+    assert ready and 'T-AUTO-01' in ready[0]
@@ -0,0 +1,32 @@
+"""Status updates are validated, and rendering tolerates IDs the plan no longer has."""
+
+import pytest
+
+from orchestration_planner import OrchestrationPlanner
+
+
+@pytest.mark.parametrize('task_id, status', [('T99', 'DONE'), ('T01', 'FINISHED'), ('', 'DONE')])
+def test_update_task_state_rejects_bad_updates(planner, task_id, status):
+    with pytest.raises(ValueError):
+        planner.update_task_state(task_id, status)
+    assert planner.load_latest_checkpoint() is None
+
+
+def test_update_task_state_accepts_lowercase_status(planner):
+    planner.update_task_state('T01', 'done')
+    assert planner.load_latest_checkpoint().completed_tasks == ['T01']
+
+
+def test_render_ignores_unknown_ids_in_checkpoint(planner, plan_path):
+    def mutate(cp):
+        cp.completed_tasks += ['T01', 'T99']
+        cp.running_tasks['T98'] = 'background'
+        return True
+    planner.transact_checkpoint(mutate)
+
+    fresh = OrchestrationPlanner(str(plan_path))
+    fresh.parse_plan()
+    fresh.build_dependency_graph()
+    state = fresh.render_iosm_state(fresh.load_latest_checkpoint())
+    assert '(1/4)' in state
+    assert 'T98' not in state.split('**Running:**')[1].split('**Next Ready:**')[0]
@@ -0,0 +1,66 @@
+"""Work queue: token authentication, and the claim / progress / complete cycle."""
+
+import pytest
+
+from work_queue import WorkQueueServer
+
+
+@pytest.mark.parametrize('token', ['wrong', 'sécret', '🔑', 5, None])
+def test_bad_token_is_rejected_not_raised(plan_path, token):
+    server = WorkQueueServer(str(plan_path), token='secret')
+    response = server.handle({'op': 'ping', 'token': token})
+    assert response['ok'] is False and 'token' in response['error']
+
+
+def test_good_token_is_accepted(plan_path):
+    server = WorkQueueServer(str(plan_path), token='sécret')
+    assert server.handle({'op': 'ping', 'token': 'sécret'})['ok']
+
+
+def claim(server):
+    response = server.handle({'op': 'claim', 'worker': 'w1'})
+    assert response['ok'], response
+    return response
+
+
+def fail_claim(server, response):
+    task_id = response['task']['id']
+    server.handle({'op': 'progress', 'task': task_id, 'claim': response['claim'],
+                   'lines': ["ModuleNotFoundError: No module named 'foo'"]})
+    result = server.handle({'op': 'complete', 'task': task_id, 'claim': response['claim'],
+                            'status': 'FAILED'})
+    assert result['ok'], result
+
+
+def test_claim_fail_claim_counts_attempts_and_stops_at_the_limit(plan_path):
+    from orchestration_planner import get_retry_policy
+    server = WorkQueueServer(str(plan_path))
+    limit = get_retry_policy('import_error').max_attempts
+
+    for attempt in range(1, limit + 2):
+        if attempt == 3:
+            server = WorkQueueServer(str(plan_path))  # restart: the attempt comes from the checkpoint
+        response = claim(server)
+        assert (response['task']['id'], response['task']['attempt']) == ('T01', attempt)
+        fail_claim(server, response)
+
+    assert claim(server)['task'] is None
+    assert server.planner.load_latest_checkpoint().blocked == {'T01': 'import_error'}
+
+
+def test_claim_then_complete_unblocks_dependents(plan_path):
+    server = WorkQueueServer(str(plan_path))
+    response = claim(server)
+    assert server.planner.load_latest_checkpoint().running_tasks == {'T01': 'background'}
+    result = server.handle({'op': 'complete', 'task': 'T01', 'claim': response['claim'], 'status': 'DONE'})
+    assert result['ok']
+    assert {claim(server)['task']['id'], claim(server)['task']['id']} == {'T02', 'T03'}
+
+
+def test_stale_claim_is_rejected(plan_path):
+    server = WorkQueueServer(str(plan_path))
+    response = claim(server)
+    result = server.handle({'op': 'complete', 'task': 'T01', 'claim': 'not-mine', 'status': 'DONE'})
+    assert result['lease_lost'] and not result['ok']
+    assert 'T01' in server.planner.load_latest_checkpoint().running_tasks
+    assert server.handle({'op': 'progress', 'task': 'T01', 'claim': response['claim'], 'lines': []})['ok']